@@ -3,6 +3,8 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.metrics import REDIS_CLIENTS_IN_USE
+from app.core.query_budget import query_budget
 from app.schemas.auth import NonceRequest, NonceResponse, TokenResponse, VerifyRequest
 from app.services import auth_service
 
@@ -13,19 +15,26 @@ async def get_redis() -> Redis:
     from app.core.config import settings
 
     r = Redis.from_url(settings.redis_url, decode_responses=False)
+    REDIS_CLIENTS_IN_USE.inc()
     try:
         yield r
     finally:
+        REDIS_CLIENTS_IN_USE.dec()
         await r.aclose()
 
 
 @router.post("/nonce", response_model=NonceResponse)
+@query_budget(statements=0)
 async def request_nonce(body: NonceRequest, redis: Redis = Depends(get_redis)):
-    nonce, message = await auth_service.generate_nonce(body.wallet_address, redis)
+    try:
+        nonce, message = await auth_service.generate_nonce(body.wallet_address, redis)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
     return NonceResponse(nonce=nonce, message=message)
 
 
 @router.post("/verify", response_model=TokenResponse)
+@query_budget(statements=2)
 async def verify_signature(
     body: VerifyRequest,
     redis: Redis = Depends(get_redis),
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.query_budget import query_budget
 from app.models.user import UserProfile
 from app.schemas.dispute import EvidenceResponse, EvidenceSubmit, ResolveRequest
 from app.schemas.order import OrderResponse
@@ -14,6 +15,7 @@ router = APIRouter()
 
 
 @router.post("/{order_id}/evidence", response_model=EvidenceResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(statements=3)
 async def submit_evidence(
     order_id: uuid.UUID,
     body: EvidenceSubmit,
@@ -35,6 +37,7 @@ async def submit_evidence(
 
 
 @router.post("/{order_id}/resolve", response_model=OrderResponse)
+@query_budget(statements=3)
 async def resolve_dispute(
     order_id: uuid.UUID,
     body: ResolveRequest,
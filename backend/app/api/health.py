@@ -1,42 +1,31 @@
-from fastapi import APIRouter
-from redis.asyncio import Redis
-from sqlalchemy import text
+from fastapi import APIRouter, Response, status
 
-from app.core.config import settings
-from app.core.database import async_session_factory
-from app.workers import celery_app
+from app.core.query_budget import query_budget
+from app.services.health_service import health_monitor, is_ready
 
 router = APIRouter()
 
 
+@router.get("/livez")
+@query_budget(statements=0)
+async def liveness():
+    """The process is up and its event loop is serving requests. No I/O."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+@query_budget(statements=1)
+async def readiness(response: Response):
+    checks = await health_monitor.current()
+    if not is_ready(checks):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "unavailable", "checks": checks}
+    return {"status": "ok", "checks": checks}
+
+
 @router.get("/health")
+@query_budget(statements=1)
 async def health_check():
-    checks = {"api": "ok", "database": "unknown", "redis": "unknown", "celery": "unknown"}
-
-    # Database check
-    try:
-        async with async_session_factory() as session:
-            await session.execute(text("SELECT 1"))
-        checks["database"] = "ok"
-    except Exception:
-        checks["database"] = "error"
-
-    # Redis check
-    try:
-        redis = Redis.from_url(settings.redis_url, decode_responses=True)
-        await redis.ping()
-        await redis.aclose()
-        checks["redis"] = "ok"
-    except Exception:
-        checks["redis"] = "error"
-
-    # Celery check
-    try:
-        inspect = celery_app.control.inspect()
-        active = inspect.active_queues()
-        checks["celery"] = "ok" if active else "error"
-    except Exception:
-        checks["celery"] = "error"
-
+    checks = await health_monitor.current()
     health_status = "ok" if all(v == "ok" for v in checks.values()) else "degraded"
     return {"status": health_status, "checks": checks}
@@ -1,11 +1,15 @@
-import math
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db, get_read_session_factory
+from app.core.query_budget import query_budget
+from app.core.responses import paginated_response
+from app.core.streaming import streaming_json
 from app.models.user import UserProfile
 from app.schemas.common import PaginatedResponse
 from app.schemas.message import MessageCreate, MessageResponse
@@ -15,12 +19,13 @@ router = APIRouter()
 
 
 @router.get("/orders/{order_id}/messages", response_model=PaginatedResponse[MessageResponse])
+@query_budget(statements=4)
 async def get_messages(
     order_id: uuid.UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     user: UserProfile = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     try:
         messages, total = await message_service.get_messages(
@@ -31,12 +36,33 @@ async def get_messages(
         if code == "NOT_FOUND":
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=code)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=code)
-    return PaginatedResponse(
-        items=[MessageResponse.model_validate(m) for m in messages],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=math.ceil(total / page_size) if total > 0 else 0,
+    return paginated_response(MessageResponse, messages, total, page, page_size)
+
+
+@router.get("/orders/{order_id}/messages/export", response_class=StreamingResponse)
+@query_budget(statements=4)
+async def export_messages(
+    order_id: uuid.UUID,
+    fmt: str = Query("json", alias="format", pattern=r"^(ndjson|json)$"),
+    user: UserProfile = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+):
+    """Stream an order's whole chat, oldest first, without the ``page_size`` cap."""
+    try:
+        await message_service.check_party(order_id, user.wallet, db)
+    except ValueError as e:
+        code = str(e)
+        if code == "NOT_FOUND":
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=code)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=code)
+    return streaming_json(
+        session_factory,
+        lambda db: message_service.stream_messages(
+            order_id, db, batch_size=settings.export_batch_size
+        ),
+        MessageResponse,
+        fmt,
     )
 
 
@@ -45,6 +71,7 @@ async def get_messages(
     response_model=MessageResponse,
     status_code=status.HTTP_201_CREATED,
 )
+@query_budget(statements=3)
 async def send_message(
     order_id: uuid.UUID,
     body: MessageCreate,
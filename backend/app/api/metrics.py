@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from redis.asyncio import Redis
+
+from app.api.auth import get_redis
+from app.core.metrics import api_exposition, worker_metrics_exposition
+from app.core.query_budget import query_budget
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+@query_budget(statements=0)
+async def metrics(redis: Redis = Depends(get_redis)):
+    """Prometheus exposition: this API's workers plus what Celery workers recorded in Redis."""
+    body = api_exposition() + await worker_metrics_exposition(redis)
+    return Response(content=body, media_type=CONTENT_TYPE_LATEST)
@@ -1,11 +1,17 @@
-import math
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.api.auth import get_redis
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db, get_read_session_factory
+from app.core.query_budget import query_budget
+from app.core.responses import paginated_response
+from app.core.streaming import streaming_json
 from app.models.base import OrderStatus
 from app.models.user import UserProfile
 from app.schemas.common import PaginatedResponse
@@ -23,13 +29,15 @@ router = APIRouter()
 
 
 @router.post("", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(statements=4)
 async def create_order(
     body: OrderCreate,
     user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     try:
-        order = await order_service.create_order(user.wallet, body, db)
+        order = await order_service.create_order(user.wallet, body, db, redis)
     except ValueError as e:
         code = str(e)
         if code == "NOT_FOUND":
@@ -39,30 +47,57 @@ async def create_order(
 
 
 @router.get("", response_model=PaginatedResponse[OrderResponse])
+@query_budget(statements=3)
 async def list_orders(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status_filter: OrderStatus | None = Query(None, alias="status"),
     role: str | None = Query(None, pattern=r"^(buyer|seller)$"),
+    include_key: bool = Query(False),
     user: UserProfile = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    params = OrderListParams(page=page, page_size=page_size, status=status_filter, role=role)
+    params = OrderListParams(
+        page=page, page_size=page_size, status=status_filter, role=role, include_key=include_key
+    )
     orders, total = await order_service.list_orders(user.wallet, params, db)
-    return PaginatedResponse(
-        items=[OrderResponse.model_validate(o) for o in orders],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=math.ceil(total / page_size) if total > 0 else 0,
+    return paginated_response(OrderResponse, orders, total, page, page_size)
+
+
+@router.get("/export", response_class=StreamingResponse)
+@query_budget(statements=3)
+async def export_orders(
+    status_filter: OrderStatus | None = Query(None, alias="status"),
+    role: str | None = Query(None, pattern=r"^(buyer|seller)$"),
+    fmt: str = Query("ndjson", alias="format", pattern=r"^(ndjson|json)$"),
+    include_key: bool = Query(False),
+    user: UserProfile = Depends(get_current_user),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+):
+    """Stream every order of the caller, unpaginated, as NDJSON or a JSON array."""
+    wallet = user.wallet
+    return streaming_json(
+        session_factory,
+        lambda db: order_service.export_orders(
+            wallet,
+            db,
+            role,
+            status_filter,
+            batch_size=settings.export_batch_size,
+            include_key=include_key,
+        ),
+        OrderResponse,
+        fmt,
+        filename="orders",
     )
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
+@query_budget(statements=2)
 async def get_order(
     order_id: uuid.UUID,
     user: UserProfile = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     order = await order_service.get_order(order_id, db)
     if order is None:
@@ -72,43 +107,48 @@ async def get_order(
     return OrderResponse.model_validate(order)
 
 
+def _transition_error(e: ValueError) -> HTTPException:
+    code = str(e)
+    if code == "NOT_FOUND":
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=code)
+    if code in ("NOT_SELLER", "NOT_BUYER", "FORBIDDEN"):
+        return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=code)
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=code)
+
+
 @router.post("/{order_id}/deliver", response_model=OrderResponse)
+@query_budget(statements=3)
 async def deliver_order(
     order_id: uuid.UUID,
     body: DeliverRequest,
     user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    order = await order_service.get_order(order_id, db)
-    if order is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NOT_FOUND")
-    if order.seller_wallet != user.wallet:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="NOT_SELLER")
-
     try:
-        order = await order_service.seller_confirm_delivery(order_id, body.product_key_encrypted, db)
+        order = await order_service.seller_confirm_delivery(
+            order_id, body.product_key_encrypted, db, seller_wallet=user.wallet
+        )
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        raise _transition_error(e)
     return OrderResponse.model_validate(order)
 
 
 @router.post("/{order_id}/confirm", response_model=OrderResponse)
+@query_budget(statements=10)
 async def confirm_order(
     order_id: uuid.UUID,
     body: ConfirmRequest,
     user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    order = await order_service.get_order(order_id, db)
-    if order is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NOT_FOUND")
-    if order.buyer_wallet != user.wallet:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="NOT_BUYER")
+    try:
+        order = await order_service.buyer_confirm_received(order_id, db, buyer_wallet=user.wallet)
+    except ValueError as e:
+        raise _transition_error(e)
 
     try:
-        order = await order_service.buyer_confirm_received(order_id, db)
         # Create review and update trade counts atomically within the same transaction
-        await review_service.create_review(order_id, user.wallet, body.rating, db)
+        await review_service.create_review(order_id, user.wallet, body.rating, db, order=order)
         await reputation_service.update_trade_counts(order.buyer_wallet, order.seller_wallet, db)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -117,39 +157,32 @@ async def confirm_order(
 
 
 @router.post("/{order_id}/cancel", response_model=OrderResponse)
+@query_budget(statements=3)
 async def cancel_order(
     order_id: uuid.UUID,
     user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
-    order = await order_service.get_order(order_id, db)
-    if order is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NOT_FOUND")
-    if order.buyer_wallet != user.wallet:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="NOT_BUYER")
-
     try:
-        order = await order_service.cancel_order(order_id, db)
+        order = await order_service.cancel_order(
+            order_id, db, buyer_wallet=user.wallet, redis=redis
+        )
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        raise _transition_error(e)
     return OrderResponse.model_validate(order)
 
 
 @router.post("/{order_id}/dispute", response_model=OrderResponse)
+@query_budget(statements=3)
 async def open_dispute(
     order_id: uuid.UUID,
     body: DisputeRequest,
     user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    order = await order_service.get_order(order_id, db)
-    if order is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NOT_FOUND")
-    if user.wallet not in (order.buyer_wallet, order.seller_wallet):
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="FORBIDDEN")
-
     try:
-        order = await order_service.open_dispute(order_id, db)
+        order = await order_service.open_dispute(order_id, db, wallet=user.wallet)
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        raise _transition_error(e)
     return OrderResponse.model_validate(order)
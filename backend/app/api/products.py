@@ -1,21 +1,38 @@
-import math
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.auth import get_redis
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_read_db
+from app.core.query_budget import query_budget
+from app.core.responses import paginated_response
 from app.models.base import ProductCategory, ProductStatus
 from app.models.user import UserProfile
 from app.schemas.common import PaginatedResponse
-from app.schemas.product import ProductCreate, ProductListParams, ProductResponse, ProductUpdate
-from app.services import product_service
+from app.schemas.product import (
+    BulkImportResult,
+    ProductCreate,
+    ProductListParams,
+    ProductResponse,
+    ProductUpdate,
+)
+from app.services import product_service, stock_service
 
 router = APIRouter()
 
+BULK_PARSERS = {
+    "application/x-ndjson": product_service.parse_ndjson,
+    "application/jsonl": product_service.parse_ndjson,
+    "text/csv": product_service.parse_csv,
+}
+
 
 @router.get("", response_model=PaginatedResponse[ProductResponse])
+@query_budget(statements=2)
 async def list_products(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -25,7 +42,7 @@ async def list_products(
     search: str | None = None,
     sort_by: str = Query("created_at", pattern=r"^(created_at|price_usdt|total_sold)$"),
     sort_order: str = Query("desc", pattern=r"^(asc|desc)$"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     params = ProductListParams(
         page=page,
@@ -38,17 +55,12 @@ async def list_products(
         sort_order=sort_order,
     )
     products, total = await product_service.list_products(params, db)
-    return PaginatedResponse(
-        items=[ProductResponse.model_validate(p) for p in products],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=math.ceil(total / page_size) if total > 0 else 0,
-    )
+    return paginated_response(ProductResponse, products, total, page, page_size)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
-async def get_product(product_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+@query_budget(statements=1)
+async def get_product(product_id: uuid.UUID, db: AsyncSession = Depends(get_read_db)):
     product = await product_service.get_product(product_id, db)
     if product is None or product.status == ProductStatus.DELETED:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NOT_FOUND")
@@ -56,6 +68,7 @@ async def get_product(product_id: uuid.UUID, db: AsyncSession = Depends(get_db))
 
 
 @router.post("", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(statements=2)
 async def create_product(
     body: ProductCreate,
     user: UserProfile = Depends(get_current_user),
@@ -65,12 +78,46 @@ async def create_product(
     return ProductResponse.model_validate(product)
 
 
+@router.post("/bulk", response_model=BulkImportResult, status_code=status.HTTP_201_CREATED)
+@query_budget(statements=3)
+async def bulk_create_products(
+    request: Request,
+    user: UserProfile = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Create listings from an NDJSON or CSV body, validated and written as it streams in.
+
+    On PostgreSQL rows are written with COPY, which does not count towards the budget.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    parse = BULK_PARSERS.get(media_type)
+    if parse is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="UNSUPPORTED_MEDIA_TYPE"
+        )
+
+    try:
+        created, errors = await product_service.bulk_create_products(
+            user.wallet, parse(request.stream()), db, settings.product_bulk_max_rows
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="INVALID_ENCODING")
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    if errors:
+        # Raising rolls back the batches already written
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors)
+    return BulkImportResult(created=created)
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
+@query_budget(statements=3)
 async def update_product(
     product_id: uuid.UUID,
     body: ProductUpdate,
     user: UserProfile = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     product = await product_service.get_product(product_id, db)
     if product is None:
@@ -79,10 +126,14 @@ async def update_product(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="NOT_SELLER")
 
     product = await product_service.update_product(product, body, db)
+    if body.stock is not None:
+        # An explicit stock edit replaces any Redis-counted reservations
+        stock_service.reset_hot_stock(product.id, db, redis)
     return ProductResponse.model_validate(product)
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(statements=3)
 async def delete_product(
     product_id: uuid.UUID,
     user: UserProfile = Depends(get_current_user),
@@ -5,13 +5,17 @@ import uuid
 from collections import defaultdict
 
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
 from redis.asyncio import Redis
 from sqlalchemy import select
 
 from app.core.config import settings
 from app.core.database import async_session_factory
-from app.core.security import decode_access_token
+from app.core.query_budget import query_budget
+from app.core.security import authenticate_access_token
 from app.models.order import Order
+from app.schemas.message import MessageCreate
+from app.services.message_buffer import message_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -58,12 +62,9 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
-async def authenticate_ws(token: str) -> str | None:
-    """Validate JWT token and return wallet address."""
-    wallet = decode_access_token(token)
-    if wallet is None:
-        return None
-    return wallet
+async def authenticate_ws(token: str, redis: Redis) -> str | None:
+    """Validate JWT token (and that it is not revoked) and return wallet address."""
+    return await authenticate_access_token(token, redis)
 
 
 async def authorize_order(wallet: str, order_id: str) -> bool:
@@ -86,19 +87,24 @@ async def authorize_order(wallet: str, order_id: str) -> bool:
 
 
 @router.websocket("/ws/orders/{order_id}")
+@query_budget(statements=1)
 async def order_websocket(
     websocket: WebSocket,
     order_id: str,
     token: str = Query(...),
 ):
+    redis = Redis.from_url(settings.redis_url, decode_responses=True)
+
     # Authenticate
-    wallet = await authenticate_ws(token)
+    wallet = await authenticate_ws(token, redis)
     if wallet is None:
+        await redis.aclose()
         await websocket.close(code=4001, reason="UNAUTHORIZED")
         return
 
     # Authorize — user must be party to the order
     if not await authorize_order(wallet, order_id):
+        await redis.aclose()
         await websocket.close(code=4003, reason="FORBIDDEN")
         return
 
@@ -108,7 +114,6 @@ async def order_websocket(
 
     try:
         # Subscribe to Redis pub/sub for this order
-        redis = Redis.from_url(settings.redis_url, decode_responses=True)
         pubsub = redis.pubsub()
         channel = f"order:{order_id}"
         await pubsub.subscribe(channel)
@@ -125,6 +130,34 @@ async def order_websocket(
             except Exception:
                 pass
 
+        pending_writes: set[asyncio.Task] = set()
+
+        async def persist_and_ack(body: MessageCreate, client_id):
+            """Persist a chat message via the write-behind buffer, then ack and broadcast."""
+            try:
+                row = await message_buffer.enqueue(
+                    uuid.UUID(order_id), wallet, body.ciphertext, body.nonce
+                )
+            except Exception:
+                await websocket.send_text(
+                    json.dumps({"error": "PERSIST_FAILED", "client_id": client_id})
+                )
+                return
+
+            await websocket.send_text(
+                json.dumps({"type": "ack", "client_id": client_id, "id": str(row["id"])})
+            )
+            event = {
+                "type": "message",
+                "id": str(row["id"]),
+                "sender": wallet,
+                "ciphertext": row["ciphertext"],
+                "nonce": row["nonce"],
+                "created_at": row["created_at"].isoformat(),
+            }
+            await manager.broadcast(order_id, event)
+            await redis.publish(channel, json.dumps(event))
+
         async def listen_ws():
             """Receive client messages and broadcast (with rate limiting)."""
             msg_timestamps: list[float] = []
@@ -145,6 +178,23 @@ async def order_websocket(
                     # Parse and broadcast to other connections
                     try:
                         payload = json.loads(data)
+
+                        # Chat messages are persisted before being broadcast
+                        if "ciphertext" in payload or "nonce" in payload:
+                            try:
+                                body = MessageCreate.model_validate(payload)
+                            except ValidationError:
+                                await websocket.send_text(
+                                    json.dumps({"error": "INVALID_MESSAGE"})
+                                )
+                                continue
+                            task = asyncio.create_task(
+                                persist_and_ack(body, payload.get("client_id"))
+                            )
+                            pending_writes.add(task)
+                            task.add_done_callback(pending_writes.discard)
+                            continue
+
                         payload["sender"] = wallet
                         await manager.broadcast(order_id, payload)
                         # Also publish to Redis for other server instances
@@ -162,6 +212,9 @@ async def order_websocket(
             await listen_ws()
         finally:
             redis_task.cancel()
+            # Let in-flight writes become durable; acks to a closed socket are dropped
+            if pending_writes:
+                await asyncio.gather(*pending_writes, return_exceptions=True)
 
     except WebSocketDisconnect:
         pass
@@ -1,14 +1,59 @@
+import uuid
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import NullPool, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.core.config import settings
 
-engine = create_async_engine(
-    settings.database_url,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    echo=settings.app_debug,
+
+def _statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(url: str, pool_size: int, max_overflow: int) -> dict[str, Any]:
+    """``create_async_engine`` options for the configured engine profile.
+
+    PgBouncer in transaction mode hands each transaction whichever server
+    connection is free, so a statement prepared in one transaction may not exist
+    (or may exist under the same name) in the next. ``DATABASE_PGBOUNCER`` turns
+    off both prepared statement caches (asyncpg's and SQLAlchemy's) and gives
+    every statement a unique name.
+    """
+    options: dict[str, Any] = {
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "echo": settings.app_debug,
+    }
+    if settings.database_null_pool:
+        options["poolclass"] = NullPool
+    else:
+        options.update(pool_size=pool_size, max_overflow=max_overflow)
+
+    if make_url(url).get_driver_name() == "asyncpg":
+        cache_size = 0 if settings.database_pgbouncer else settings.database_statement_cache_size
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": cache_size,
+            "prepared_statement_cache_size": cache_size,
+        }
+        if settings.database_pgbouncer:
+            connect_args["prepared_statement_name_func"] = _statement_name
+        options["connect_args"] = connect_args
+    return options
+
+
+def create_engine(url: str, pool_size: int, max_overflow: int, **overrides: Any) -> AsyncEngine:
+    return create_async_engine(url, **(engine_options(url, pool_size, max_overflow) | overrides))
+
+
+engine = create_engine(
+    settings.database_url, settings.database_pool_size, settings.database_max_overflow
 )
 
 async_session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -22,3 +67,12 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for streaming responses.
+
+    FastAPI closes ``get_db`` before a ``StreamingResponse`` body is sent, so
+    streaming endpoints open their own session inside the body iterator.
+    """
+    return async_session_factory
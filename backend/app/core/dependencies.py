@@ -1,28 +1,83 @@
-from fastapi import Depends, HTTPException, status
+from collections.abc import AsyncGenerator
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from redis.asyncio import Redis
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.core.database import get_db
-from app.core.security import decode_access_token
+from app.api.auth import get_redis
+from app.core.database import get_db, get_session_factory
+from app.core.replicas import replica_set
+from app.core.security import authenticate_access_token, decode_access_token
 from app.models.user import UserProfile
+from app.services import blacklist_service
 
 bearer_scheme = HTTPBearer()
 
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _request_wallet(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return decode_access_token(token)
+
+
+async def _replica_factory(
+    request: Request, redis: Redis
+) -> async_sessionmaker[AsyncSession] | None:
+    if not replica_set.enabled:
+        return None
+    return await replica_set.pick(_request_wallet(request), redis)
+
+
+async def get_read_db(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only handlers: a healthy replica, else the ``get_db`` primary session."""
+    factory = await _replica_factory(request, redis)
+    if factory is None:
+        yield db
+        return
+    async with factory() as session:
+        yield session
+
+
+async def get_read_session_factory(
+    request: Request,
+    primary: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    redis: Redis = Depends(get_redis),
+) -> async_sessionmaker[AsyncSession]:
+    """``get_session_factory`` counterpart of ``get_read_db`` for streaming exports."""
+    return await _replica_factory(request, redis) or primary
+
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    primary: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ) -> UserProfile:
-    wallet = decode_access_token(credentials.credentials)
+    wallet = await authenticate_access_token(credentials.credentials, redis)
     if wallet is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="UNAUTHORIZED")
+    if request.method not in READ_METHODS:
+        await replica_set.mark_write(wallet, redis)
 
-    result = await db.execute(select(UserProfile).where(UserProfile.wallet == wallet))
-    user = result.scalar_one_or_none()
+    query = select(UserProfile).where(UserProfile.wallet == wallet)
+    user = (await db.execute(query)).scalar_one_or_none()
+    if user is None and db is not primary:
+        # Just signed up: the profile may not have replicated yet
+        user = (await primary.execute(query)).scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="UNAUTHORIZED")
-    if user.is_blacklisted:
+    # The snapshot reload stays on the primary so a fresh ban is never cached as absent
+    if user.is_blacklisted or await blacklist_service.is_blacklisted(wallet, primary, redis):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="FORBIDDEN")
 
     return user
@@ -0,0 +1,119 @@
+"""Logging setup: records are queued on the calling thread and written by a listener thread.
+
+Handlers that write to stdout block when the pipe is slow (container log drivers,
+a busy terminal), and under ``logging.basicConfig`` that happens on the event
+loop. Here the root logger only has a ``QueueHandler``; JSON formatting and the
+actual write happen in a ``QueueListener`` thread.
+
+Per-request database time is accumulated through SQLAlchemy cursor events into
+a ``RequestStats`` object held in a context variable, so the access log can
+report it without touching the session.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+TEXT_FORMAT = "%(asctime)s %(name)s %(levelname)s %(message)s"
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+_listener: QueueListener | None = None
+
+
+def configure_logging() -> None:
+    """Route all logging through a queue drained by a background thread. Idempotent."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(logging.DEBUG if settings.app_debug else settings.log_level.upper())
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# -- Per-request database time ---------------------------------------------------
+
+
+@dataclass
+class RequestStats:
+    db_statements: int = 0
+    db_time: float = 0.0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if request_stats.get() is not None:
+        conn.info.setdefault("request_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = request_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("request_stats_start")
+    if starts:
+        stats.db_time += time.perf_counter() - starts.pop()
+        stats.db_statements += 1
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("request_stats_start"):
+        conn.info["request_stats_start"].pop()
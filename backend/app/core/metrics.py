@@ -0,0 +1,226 @@
+"""Prometheus metrics.
+
+API-process metrics use ``prometheus_client``. Each uvicorn worker serves its
+requests on one thread, so the per-metric value locks are never contended. Under
+multiple uvicorn workers, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory
+shared by them. Every worker then writes its samples to its own mmap file, and
+``/metrics`` aggregates the files whichever worker answers the scrape.
+
+Celery workers run in other containers, so they cannot share that directory.
+They record into Redis instead, using single-command HSET/HINCRBY updates, and
+``/metrics`` reads those hashes at scrape time (``worker_metrics_exposition``).
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections.abc import Iterable
+
+from prometheus_client import (
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily, HistogramMetricFamily
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+# -- API process -------------------------------------------------------------
+
+REQUEST_LATENCY = Histogram(
+    "p2p_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "p2p_db_pool_checked_out",
+    "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "p2p_db_pool_overflow",
+    "Database connections open beyond pool_size",
+    multiprocess_mode="livesum",
+)
+REDIS_CLIENTS_IN_USE = Gauge(
+    "p2p_redis_clients_in_use",
+    "Request-scoped Redis clients currently open",
+    multiprocess_mode="livesum",
+)
+WS_CONNECTIONS = Gauge(
+    "p2p_websocket_connections",
+    "Open chat WebSocket connections",
+    multiprocess_mode="livesum",
+)
+WS_ROOMS = Gauge(
+    "p2p_websocket_rooms",
+    "Orders with at least one open chat WebSocket",
+    multiprocess_mode="livesum",
+)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(seconds)
+
+
+def sample_runtime() -> None:
+    """Copy point-in-time pool and connection counts into gauges."""
+    from app.api.websocket import manager
+    from app.core.database import engine
+
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+    rooms = list(manager.active.values())
+    WS_CONNECTIONS.set(sum(len(sockets) for sockets in rooms))
+    WS_ROOMS.set(len(rooms))
+
+
+class RuntimeSampler:
+    """Refreshes the runtime gauges every ``interval`` seconds.
+
+    In multiprocess mode a scrape is answered by one worker, so every worker must
+    keep its own gauge files current rather than sampling only when scraped.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                sample_runtime()
+            except Exception:
+                logger.exception("Runtime metrics sampling failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+def api_exposition() -> bytes:
+    sample_runtime()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    from prometheus_client import REGISTRY
+
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead() -> None:
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# -- Celery workers (via Redis) ------------------------------------------------
+
+WORKER_METRICS_PREFIX = "metrics:"
+
+# name -> (label name, help)
+WORKER_GAUGES = {
+    "event_listener_block_lag": ("chain", "Blocks between the chain head and the event sync cursor"),
+    "event_listener_last_sync_timestamp": ("chain", "Unix time of the last successful event sync"),
+}
+# name -> (label name, help, buckets)
+WORKER_HISTOGRAMS = {
+    "event_listener_sync_seconds": (
+        "chain",
+        "Duration of one event sync pass (RPC fetches and database writes)",
+        (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    ),
+    "event_listener_reorg_depth": (
+        "chain",
+        "Blocks rolled back when a reorg was detected under the sync cursor",
+        (1, 2, 3, 5, 10, 20, 50, 100),
+    ),
+    "timeout_checker_batch_size": (
+        "kind",
+        "Orders transitioned per timeout-checker run",
+        (0, 1, 5, 10, 50, 100, 500, 1000),
+    ),
+}
+
+
+async def set_worker_gauge(redis: Redis, name: str, label: str, value: float) -> None:
+    try:
+        await redis.hset(f"{WORKER_METRICS_PREFIX}{name}", label, value)
+    except RedisError:
+        logger.debug(f"Could not record worker metric {name}")
+
+
+async def observe_worker_histogram(redis: Redis, name: str, label: str, value: float) -> None:
+    _, _, buckets = WORKER_HISTOGRAMS[name]
+    key = f"{WORKER_METRICS_PREFIX}{name}"
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for bound in buckets:
+                if value <= bound:
+                    pipe.hincrby(key, f"{label}:{bound}", 1)
+            pipe.hincrby(key, f"{label}:+Inf", 1)
+            pipe.hincrbyfloat(key, f"{label}:sum", value)
+            await pipe.execute()
+    except RedisError:
+        logger.debug(f"Could not record worker metric {name}")
+
+
+def _worker_families(raw: dict[str, dict[bytes, bytes]]) -> Iterable:
+    for name, (label, help_text) in WORKER_GAUGES.items():
+        family = GaugeMetricFamily(f"p2p_{name}", help_text, labels=[label])
+        for label_value, value in raw.get(name, {}).items():
+            family.add_metric([label_value.decode()], float(value))
+        yield family
+
+    for name, (label, help_text, buckets) in WORKER_HISTOGRAMS.items():
+        family = HistogramMetricFamily(f"p2p_{name}", help_text, labels=[label])
+        by_label: dict[str, dict[str, float]] = {}
+        for field, value in raw.get(name, {}).items():
+            label_value, _, suffix = field.decode().rpartition(":")
+            by_label.setdefault(label_value, {})[suffix] = float(value)
+        for label_value, fields in by_label.items():
+            bounds = [str(b) for b in buckets] + ["+Inf"]
+            family.add_metric(
+                [label_value],
+                buckets=[(b, fields.get(b, 0.0)) for b in bounds],
+                sum_value=fields.get("sum", 0.0),
+            )
+        yield family
+
+
+async def worker_metrics_exposition(redis: Redis) -> bytes:
+    names = list(WORKER_GAUGES) + list(WORKER_HISTOGRAMS)
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.hgetall(f"{WORKER_METRICS_PREFIX}{name}")
+            values = await pipe.execute()
+    except RedisError:
+        logger.warning("Worker metrics unavailable: Redis error")
+        return b""
+
+    class _Collector:
+        def collect(self):
+            return _worker_families(dict(zip(names, values)))
+
+    registry = CollectorRegistry()
+    registry.register(_Collector())
+    return generate_latest(registry)
@@ -1,5 +1,7 @@
 """Security middleware: rate limiting, security headers, request logging, request ID."""
 
+import logging
+import random
 import time
 import uuid
 from collections import defaultdict
@@ -7,7 +9,14 @@ from collections import defaultdict
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.core import metrics
 from app.core.config import settings
+from app.core.logging_config import RequestStats, request_stats
+
+access_logger = logging.getLogger("p2p.access")
+
+# Health probes and metrics scrapes: never rate limited, access-logged or timed
+PROBE_PATHS = frozenset({"/health", "/livez", "/readyz", "/metrics"})
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -73,7 +82,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         # Skip rate limiting for health checks
-        if request.url.path == "/health":
+        if request.url.path in PROBE_PATHS:
             return await call_next(request)
 
         client_ip = self._get_client_ip(request)
@@ -121,26 +130,57 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Log request method, path, status, and duration. Never log secrets."""
+    """Access log and latency metrics. Never log secrets (no query strings or bodies).
+
+    Emits one structured record per request with request_id, route template,
+    status, duration and database time. Successful fast requests are sampled at
+    ``settings.access_log_sample_rate``; errors and requests slower than
+    ``settings.access_log_slow_ms`` are always logged. The same timing feeds the
+    per-route latency histogram, labelled with the route template
+    (``/orders/{order_id}``) so label cardinality stays bounded.
+    """
 
     async def dispatch(self, request: Request, call_next) -> Response:
-        start = time.time()
-        response = await call_next(request)
-        duration_ms = (time.time() - start) * 1000
-
-        # Only log non-health requests to reduce noise
-        if request.url.path != "/health":
-            import logging
-
-            logger = logging.getLogger("p2p.access")
-            request_id = getattr(request.state, "request_id", "-")
-            logger.info(
-                "[%s] %s %s %d %.1fms",
-                request_id,
-                request.method,
-                request.url.path,
-                response.status_code,
-                duration_ms,
-            )
+        # Health probes and scrapes are neither logged nor timed, to reduce noise
+        if request.url.path in PROBE_PATHS:
+            return await call_next(request)
 
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            request_stats.reset(token)
+        duration = time.perf_counter() - start
+        duration_ms = duration * 1000
+
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        metrics.observe_request(request.method, route_path, response.status_code, duration)
+
+        if (
+            response.status_code < 400
+            and duration_ms < settings.access_log_slow_ms
+            and random.random() >= settings.access_log_sample_rate
+        ):
+            return response
+
+        access_logger.info(
+            "%s %s %d %.1fms",
+            request.method,
+            request.url.path,
+            response.status_code,
+            duration_ms,
+            extra={
+                "request_id": getattr(request.state, "request_id", "-"),
+                "method": request.method,
+                "path": request.url.path,
+                "route": route_path,
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 2),
+                "db_ms": round(stats.db_time * 1000, 2),
+                "db_statements": stats.db_statements,
+            },
+        )
         return response
@@ -0,0 +1,29 @@
+"""Per-route database budgets, enforced by the test suite (see tests/query_budget.py)."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+BUDGET_ATTR = "__query_budget__"
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    statements: int
+    db_time_ms: float = 100.0
+
+
+def query_budget(statements: int, db_time_ms: float = 100.0) -> Callable[[F], F]:
+    """Declare the maximum SQL statements and DB time a single request to a route may use."""
+
+    def decorator(func: F) -> F:
+        setattr(func, BUDGET_ATTR, QueryBudget(statements, db_time_ms))
+        return func
+
+    return decorator
+
+
+def get_query_budget(endpoint: Callable | None) -> QueryBudget | None:
+    return getattr(endpoint, BUDGET_ATTR, None)
@@ -0,0 +1,46 @@
+"""Server-side Lua scripts invoked by SHA.
+
+Scripts are sent with ``EVALSHA`` so each call ships only the 40-byte digest; the
+first call on a server that has not seen the script (fresh start, failover,
+``SCRIPT FLUSH``) gets ``NOSCRIPT``, loads it with ``SCRIPT LOAD`` and retries.
+"""
+
+import hashlib
+from collections.abc import Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
+
+
+class LuaScript:
+    def __init__(self, source: str):
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
+    async def load(self, redis: Redis) -> None:
+        await redis.script_load(self.source)
+
+    async def __call__(self, redis: Redis, keys: Sequence = (), args: Sequence = ()):
+        try:
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            await self.load(redis)
+            return await redis.evalsha(self.sha, len(keys), *keys, *args)
+
+    async def many(self, redis: Redis, calls: Sequence[tuple[Sequence, Sequence]]) -> list:
+        """Run the script once per (keys, args) pair in a single pipelined round trip.
+
+        Every call in the pipeline is this one script, so on NOSCRIPT none of them
+        ran and the whole pipeline can be replayed after loading it.
+        """
+        try:
+            return await self._pipeline(redis, calls)
+        except NoScriptError:
+            await self.load(redis)
+            return await self._pipeline(redis, calls)
+
+    async def _pipeline(self, redis: Redis, calls: Sequence[tuple[Sequence, Sequence]]) -> list:
+        async with redis.pipeline(transaction=False) as pipe:
+            for keys, args in calls:
+                pipe.evalsha(self.sha, len(keys), *keys, *args)
+            return await pipe.execute()
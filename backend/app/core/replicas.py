@@ -0,0 +1,138 @@
+"""Read-replica routing for read-only requests.
+
+With ``DATABASE_REPLICA_URLS`` set, GET handlers and the ``get_current_user``
+lookup read through ``get_read_db``. That dependency picks a replica round-robin
+from the ones that passed the last background check, which drops replicas that
+are unreachable or more than ``DATABASE_REPLICA_MAX_LAG_SECONDS`` behind. If none
+qualifies, reads go to the primary.
+
+Read-your-writes: any non-GET request by a wallet marks it in Redis for
+``DATABASE_READ_YOUR_WRITES_SECONDS``, and that wallet's reads stay on the primary
+until the mark expires. The mark lives in Redis, so it holds across API workers.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import logging
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import create_engine
+
+logger = logging.getLogger(__name__)
+
+STICKY_KEY_PREFIX = "db:rw:"
+
+# Zero when the replica has replayed everything it received; otherwise the age of the
+# last replayed transaction (an idle primary would otherwise look like growing lag)
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        max_lag_seconds: float = 5.0,
+        sticky_seconds: float = 10.0,
+    ):
+        self.engines = engines
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = sticky_seconds
+        self.healthy: list[AsyncEngine] = []
+        self.lag: dict[str, float | None] = {}
+        self._round_robin = itertools.count()
+        self._factories = {
+            engine: async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in engines
+        }
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_settings(cls) -> "ReplicaSet":
+        engines = [
+            create_engine(url, settings.database_pool_size, settings.database_max_overflow)
+            for url in settings.database_replica_urls
+        ]
+        return cls(
+            engines,
+            max_lag_seconds=settings.database_replica_max_lag_seconds,
+            sticky_seconds=settings.database_read_your_writes_seconds,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    async def _lag(self, engine: AsyncEngine) -> float:
+        async with engine.connect() as conn:
+            return float((await conn.execute(LAG_QUERY)).scalar_one())
+
+    async def _probe(self, engine: AsyncEngine) -> float | None:
+        try:
+            return await asyncio.wait_for(
+                self._lag(engine), timeout=settings.health_check_timeout_seconds
+            )
+        except Exception:
+            return None
+
+    async def check(self) -> list[AsyncEngine]:
+        """Re-check every replica and return the ones reads may use."""
+        lags = await asyncio.gather(*(self._probe(engine) for engine in self.engines))
+        healthy = []
+        for engine, lag in zip(self.engines, lags):
+            name = engine.url.render_as_string(hide_password=True)
+            if lag is None:
+                logger.warning(f"Read replica {name} is unreachable")
+            elif lag > self.max_lag_seconds:
+                logger.warning(f"Read replica {name} is {lag:.1f}s behind; reading from primary")
+            else:
+                healthy.append(engine)
+            self.lag[name] = lag
+        self.healthy = healthy
+        return healthy
+
+    async def mark_write(self, wallet: str, redis: Redis) -> None:
+        if self.enabled:
+            await redis.set(f"{STICKY_KEY_PREFIX}{wallet}", 1, px=int(self.sticky_seconds * 1000))
+
+    async def pick(
+        self, wallet: str | None, redis: Redis
+    ) -> async_sessionmaker[AsyncSession] | None:
+        """Session factory of the next healthy replica, or ``None`` to read from the primary."""
+        healthy = self.healthy
+        if not healthy:
+            return None
+        if wallet is not None and await redis.exists(f"{STICKY_KEY_PREFIX}{wallet}"):
+            return None
+        return self._factories[healthy[next(self._round_robin) % len(healthy)]]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Read replica check failed")
+            await asyncio.sleep(settings.database_replica_check_interval_seconds)
+
+    def start(self) -> None:
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for engine in self.engines:
+            await engine.dispose()
+
+
+replica_set = ReplicaSet.from_settings()
@@ -0,0 +1,49 @@
+"""Pre-encoded JSON responses for hot list endpoints.
+
+When a route returns a pydantic model, FastAPI dumps it to a dict, validates that
+against ``response_model`` a second time, runs ``jsonable_encoder`` over the
+result and only then calls ``json.dumps``. ``json_response`` validates the ORM
+objects once, straight from their attributes, and has pydantic-core write JSON
+bytes directly. FastAPI sends a returned ``Response`` untouched, so routes keep
+``response_model`` for the OpenAPI schema only.
+"""
+
+import math
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.schemas.common import PaginatedResponse
+
+
+@cache
+def type_adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def encode(tp: Any, value: Any) -> bytes:
+    """Validate ``value`` (ORM objects allowed) as ``tp`` and serialize it to JSON bytes."""
+    adapter = type_adapter(tp)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+
+def json_response(tp: Any, value: Any, status_code: int = 200) -> Response:
+    return Response(encode(tp, value), status_code=status_code, media_type="application/json")
+
+
+def paginated_response(
+    schema: type[BaseModel], items: Sequence, total: int, page: int, page_size: int
+) -> Response:
+    return json_response(
+        PaginatedResponse[schema],
+        {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": math.ceil(total / page_size) if total > 0 else 0,
+        },
+    )
@@ -1,9 +1,33 @@
+"""JWT issuance and verification.
+
+Every authenticated request and WebSocket handshake decodes the bearer token, so
+verified tokens are kept in a per-worker LRU keyed by the token's SHA-256 and
+served from there until the token's own ``exp``. ``settings.jwt_backend`` selects
+the signature library (python-jose by default, or PyJWT); the decoder is resolved
+once at import.
+
+``revoke_access_token`` stores the token's hash in Redis until its ``exp``, and
+``authenticate_access_token`` rejects it on every worker, whether or not the
+token is in that worker's cache.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 
+import jwt as pyjwt
 from jose import JWTError, jwt
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = "jwt:revoked:"
+
 
 def create_access_token(wallet_address: str) -> tuple[str, datetime]:
     expires_at = datetime.now(UTC) + timedelta(hours=settings.jwt_expiry_hours)
@@ -16,10 +40,106 @@ def create_access_token(wallet_address: str) -> tuple[str, datetime]:
     return token, expires_at
 
 
-def decode_access_token(token: str) -> str | None:
-    try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        wallet: str | None = payload.get("sub")
+class TokenCache:
+    """Bounded LRU of verified tokens: sha256(token) -> (wallet, exp). Entries die at exp."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes, now: float) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        wallet, exp = entry
+        if exp <= now:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
         return wallet
+
+    def put(self, key: bytes, wallet: str, exp: float) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (wallet, exp)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: bytes) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(settings.jwt_cache_size)
+
+
+def _decode_jose(token: str) -> dict | None:
+    try:
+        return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
     except JWTError:
         return None
+
+
+def _decode_pyjwt(token: str) -> dict | None:
+    try:
+        return pyjwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    except pyjwt.PyJWTError:
+        return None
+
+
+_DECODERS = {"jose": _decode_jose, "pyjwt": _decode_pyjwt}
+
+# Settings only accepts the keys above, so a bad JWT_BACKEND fails at startup
+_verify = _DECODERS[settings.jwt_backend]
+
+
+def decode_access_token(token: str) -> str | None:
+    key = TokenCache.key(token)
+    wallet = token_cache.get(key, time.time())
+    if wallet is not None:
+        return wallet
+
+    payload = _verify(token)
+    if payload is None:
+        return None
+    wallet = payload.get("sub")
+    exp = payload.get("exp")
+    if wallet is not None and exp is not None:
+        token_cache.put(key, wallet, float(exp))
+    return wallet
+
+
+
+async def authenticate_access_token(token: str, redis: Redis) -> str | None:
+    """``decode_access_token``, plus the cross-worker revocation check."""
+    wallet = decode_access_token(token)
+    if wallet is None:
+        return None
+    try:
+        revoked = await redis.exists(f"{REVOKED_KEY_PREFIX}{TokenCache.key(token).hex()}")
+    except RedisError:
+        logger.warning("Token revocation check failed, accepting verified token")
+        return wallet
+    return None if revoked else wallet
+
+
+async def revoke_access_token(token: str, redis: Redis) -> bool:
+    """Reject ``token`` on every worker until it expires. Returns False for an invalid token."""
+    payload = _verify(token)
+    if payload is None or payload.get("exp") is None:
+        return False
+    key = TokenCache.key(token)
+    # The marker outlives the token by at most a second, then Redis drops it
+    await redis.set(f"{REVOKED_KEY_PREFIX}{key.hex()}", 1, exat=int(payload["exp"]) + 1)
+    token_cache.discard(key)
+    return True
@@ -0,0 +1,72 @@
+"""Constant-memory JSON responses for result sets of any size.
+
+Rows are read through a server-side cursor (``AsyncSession.stream`` with
+``yield_per``) and each batch is serialized and sent before the next one is
+fetched, so neither the ORM objects nor the response body are ever held in full.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.responses import encode
+
+MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+
+async def stream_partitions(
+    db: AsyncSession, query: Select, batch_size: int
+) -> AsyncIterator[Sequence]:
+    """Yield the query's rows ``batch_size`` at a time from a server-side cursor."""
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
+
+
+async def json_lines(
+    batches: AsyncIterable[Sequence], schema: type[BaseModel]
+) -> AsyncIterator[str]:
+    async for rows in batches:
+        yield "".join(schema.model_validate(row).model_dump_json() + "\n" for row in rows)
+
+
+async def json_array(
+    batches: AsyncIterable[Sequence], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = b""
+    async for rows in batches:
+        if rows:
+            # One validate + dump per batch; strip the list's brackets to splice batches
+            yield separator + encode(list[schema], rows)[1:-1]
+            separator = b","
+    yield b"]"
+
+
+def streaming_json(
+    session_factory: async_sessionmaker[AsyncSession],
+    batches: Callable[[AsyncSession], AsyncIterable[Sequence]],
+    schema: type[BaseModel],
+    fmt: str = "json",
+    filename: str | None = None,
+) -> StreamingResponse:
+    """Stream ``batches(db)`` as a JSON array (``fmt="json"``) or as NDJSON.
+
+    The body opens its own session: FastAPI closes ``get_db`` before a
+    ``StreamingResponse`` body is sent, so access checks belong in the route and
+    only the read itself runs here.
+    """
+    encode = json_lines if fmt == "ndjson" else json_array
+
+    async def body() -> AsyncIterator[str | bytes]:
+        async with session_factory() as db:
+            async for chunk in encode(batches(db), schema):
+                yield chunk
+
+    headers = None
+    if filename:
+        headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -1,10 +1,10 @@
-import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.logging_config import configure_logging
 from app.core.middleware import (
     RateLimitMiddleware,
     RequestIDMiddleware,
@@ -12,20 +12,33 @@ from app.core.middleware import (
     SecurityHeadersMiddleware,
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG if settings.app_debug else logging.INFO,
-    format="%(asctime)s %(name)s %(levelname)s %(message)s",
-)
+# Queue-based logging: formatting and stdout writes happen off the event loop
+configure_logging()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    from app.core.metrics import RuntimeSampler, mark_process_dead
+    from app.core.replicas import replica_set
+    from app.services.health_service import health_monitor
+
+    sampler = RuntimeSampler(settings.metrics_sample_interval_seconds)
+    health_monitor.start()
+    replica_set.start()
+    sampler.start()
     yield
     # Shutdown
     from app.core.database import engine
+    from app.services import signature_service
+    from app.services.message_buffer import message_buffer
 
+    await health_monitor.stop()
+    await replica_set.stop()
+    await sampler.stop()
+    mark_process_dead()
+    await message_buffer.stop()
+    signature_service.shutdown()
     await engine.dispose()
 
 
@@ -53,9 +66,19 @@ app.add_middleware(
 )
 
 # Register routers
-from app.api import auth, disputes, health, messages, orders, products, websocket  # noqa: E402
+from app.api import (  # noqa: E402
+    auth,
+    disputes,
+    health,
+    messages,
+    metrics,
+    orders,
+    products,
+    websocket,
+)
 
 app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(products.router, prefix="/products", tags=["products"])
 app.include_router(orders.router, prefix="/orders", tags=["orders"])
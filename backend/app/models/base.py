@@ -6,7 +6,9 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class Base(DeclarativeBase):
-    pass
+    # Fetch server-generated values (created_at, updated_at, ...) with RETURNING as part
+    # of the INSERT/UPDATE itself instead of a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class TimestampMixin:
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, Enum, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, ChainType
+
+
+class ChainEvent(Base):
+    """Append-only journal of escrow logs, one row per (chain, tx_hash, log_index)."""
+
+    __tablename__ = "chain_events"
+
+    chain: Mapped[ChainType] = mapped_column(
+        Enum(ChainType, name="chain_type", create_type=False), primary_key=True
+    )
+    tx_hash: Mapped[str] = mapped_column(String(66), primary_key=True)
+    log_index: Mapped[int] = mapped_column(Integer, primary_key=True)
+    block_number: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    block_hash: Mapped[str] = mapped_column(String(66), nullable=False)
+    event: Mapped[str] = mapped_column(String(32), nullable=False)
+    args: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (Index("ix_chain_events_chain_block", "chain", "block_number", "log_index"),)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, Enum, String, func
+from sqlalchemy import JSON, BigInteger, DateTime, Enum, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base, ChainType
@@ -14,6 +14,8 @@ class EventSyncCursor(Base):
     )
     contract: Mapped[str] = mapped_column(String(42), nullable=False)
     last_block: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    # Recent [block_number, block_hash] pairs, oldest first; used to detect reorgs
+    checkpoints: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
@@ -24,8 +24,8 @@ class Message(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    # Relationships
-    order = relationship("Order", back_populates="messages")
+    # Relationships (never loaded implicitly; use joinedload() per query when needed)
+    order = relationship("Order", back_populates="messages", lazy="raise")
 
     __table_args__ = (
         Index("ix_messages_order_created", "order_id", "created_at"),
@@ -43,8 +43,8 @@ class Order(Base, TimestampMixin):
     dispute_deadline: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
-    # Relationships
-    messages = relationship("Message", back_populates="order", lazy="selectin")
+    # Relationships (never loaded implicitly; use selectinload() per query when needed)
+    messages = relationship("Message", back_populates="order", lazy="raise")
 
     __table_args__ = (
         UniqueConstraint("chain", "onchain_order_id", name="uq_orders_chain_onchain"),
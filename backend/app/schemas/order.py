@@ -27,7 +27,8 @@ class OrderResponse(BaseModel):
     amount: Decimal
     platform_fee: Decimal
     status: OrderStatus
-    product_key_encrypted: str | None
+    # Left out of lists and exports unless requested with include_key
+    product_key_encrypted: str | None = None
     tx_hash_create: str
     tx_hash_complete: str | None
     seller_confirmed_at: datetime | None
@@ -45,6 +46,7 @@ class OrderListParams(BaseModel):
     page_size: int = Field(20, ge=1, le=100)
     status: OrderStatus | None = None
     role: str | None = Field(None, pattern=r"^(buyer|seller)$")
+    include_key: bool = False
 
 
 class DeliverRequest(BaseModel):
@@ -41,6 +41,10 @@ class ProductResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class BulkImportResult(BaseModel):
+    created: int
+
+
 class ProductListParams(BaseModel):
     page: int = Field(1, ge=1)
     page_size: int = Field(20, ge=1, le=100)
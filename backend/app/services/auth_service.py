@@ -1,30 +1,90 @@
 import secrets
 from datetime import datetime
 
-from eth_account.messages import encode_defunct
 from redis.asyncio import Redis
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from web3 import Web3
 
 from app.core.config import settings
+from app.core.redis_scripts import LuaScript
 from app.core.security import create_access_token
 from app.models.user import UserProfile
+from app.services import signature_service
 
 NONCE_TTL = 300  # 5 minutes
 NONCE_PREFIX = "auth:nonce:"
+NONCE_ISSUED_PREFIX = "auth:nonce_issued:"
+
+# KEYS[1] = nonce, KEYS[2] = per-wallet issuance counter
+# ARGV[1] = nonce value, ARGV[2] = TTL, ARGV[3] = issuance limit, ARGV[4] = limit window
+# Returns the (server) issue timestamp, or -1 when the wallet is over its limit.
+_ISSUE_NONCE = LuaScript("""
+local issued = redis.call('INCR', KEYS[2])
+if issued == 1 then redis.call('EXPIRE', KEYS[2], ARGV[4]) end
+if issued > tonumber(ARGV[3]) then return -1 end
+local now = redis.call('TIME')[1]
+redis.call('SET', KEYS[1], ARGV[1] .. ':' .. now, 'EX', ARGV[2])
+return tonumber(now)
+""")
+
+# KEYS[1] = nonce, ARGV[1] = max age. Deletes the nonce whatever its age.
+# Returns "nonce:timestamp", 0 when there is no nonce, -1 when it is too old.
+_CONSUME_NONCE = LuaScript("""
+local stored = redis.call('GET', KEYS[1])
+if not stored then return 0 end
+redis.call('DEL', KEYS[1])
+local issued = tonumber(string.match(stored, ':(%d+)$'))
+if tonumber(redis.call('TIME')[1]) - issued > tonumber(ARGV[1]) then return -1 end
+return stored
+""")
 
 
 async def generate_nonce(wallet_address: str, redis: Redis) -> tuple[str, str]:
     nonce = secrets.token_hex(16)
     wallet = wallet_address.lower()
-    timestamp = int(datetime.now().timestamp())
-    message = f"P2P-Auth-{timestamp}-{nonce}"
 
-    await redis.set(f"{NONCE_PREFIX}{wallet}", f"{nonce}:{timestamp}", ex=NONCE_TTL)
+    timestamp = await _ISSUE_NONCE(
+        redis,
+        keys=[f"{NONCE_PREFIX}{wallet}", f"{NONCE_ISSUED_PREFIX}{wallet}"],
+        args=[
+            nonce,
+            NONCE_TTL,
+            settings.auth_nonce_issue_limit,
+            settings.auth_nonce_issue_window_seconds,
+        ],
+    )
+    if timestamp < 0:
+        raise ValueError("NONCE_RATE_LIMITED")
+
+    message = f"P2P-Auth-{timestamp}-{nonce}"
     return nonce, message
 
 
+def _nonce_message(consumed: bytes | int) -> str:
+    """Map a _CONSUME_NONCE reply to the message the wallet had to sign."""
+    if consumed == 0:
+        raise ValueError("NONCE_NOT_FOUND")
+    if consumed == -1:
+        raise ValueError("NONCE_EXPIRED")
+
+    nonce, timestamp = consumed.decode().split(":")
+    return f"P2P-Auth-{timestamp}-{nonce}"
+
+
+async def _upsert_users(public_keys: dict[str, str], db: AsyncSession) -> None:
+    result = await db.execute(select(UserProfile).where(UserProfile.wallet.in_(public_keys)))
+    existing = {user.wallet: user for user in result.scalars()}
+
+    for wallet, public_key in public_keys.items():
+        user = existing.get(wallet)
+        if user is None:
+            db.add(UserProfile(wallet=wallet, public_key=public_key))
+        else:
+            user.public_key = public_key
+
+    await db.flush()
+
+
 async def verify_signature(
     wallet_address: str,
     signature: str,
@@ -34,40 +94,64 @@ async def verify_signature(
 ) -> tuple[str, datetime]:
     wallet = wallet_address.lower()
 
-    # Retrieve and delete nonce
-    stored = await redis.getdel(f"{NONCE_PREFIX}{wallet}")
-    if stored is None:
-        raise ValueError("NONCE_NOT_FOUND")
+    # Retrieve, delete and age-check the nonce in one round trip
+    message = _nonce_message(
+        await _CONSUME_NONCE(redis, keys=[f"{NONCE_PREFIX}{wallet}"], args=[NONCE_TTL])
+    )
 
-    nonce, timestamp = stored.decode().split(":")
-
-    # Validate nonce age (max 5 minutes)
-    nonce_age = int(datetime.now().timestamp()) - int(timestamp)
-    if nonce_age > NONCE_TTL:
-        raise ValueError("NONCE_EXPIRED")
-
-    message = f"P2P-Auth-{timestamp}-{nonce}"
-
-    # Verify signature recovers to wallet
-    w3 = Web3()
-    msg = encode_defunct(text=message)
-    recovered = w3.eth.account.recover_message(msg, signature=signature)
-
-    if recovered.lower() != wallet:
+    # Verify signature recovers to wallet (off the event loop)
+    recovered = await signature_service.recover(message, signature)
+    if recovered != wallet:
         raise ValueError("INVALID_SIGNATURE")
 
-    # Upsert user profile
-    result = await db.execute(select(UserProfile).where(UserProfile.wallet == wallet))
-    user = result.scalar_one_or_none()
-
-    if user is None:
-        user = UserProfile(wallet=wallet, public_key=public_key)
-        db.add(user)
-    else:
-        user.public_key = public_key
-
-    await db.flush()
+    await _upsert_users({wallet: public_key}, db)
 
     # Issue JWT
     token, expires_at = create_access_token(wallet)
     return token, expires_at
+
+
+async def verify_signatures(
+    logins: list[tuple[str, str, str]],
+    redis: Redis,
+    db: AsyncSession,
+) -> list[tuple[str, datetime] | ValueError]:
+    """Verify a batch of (wallet_address, signature, public_key) logins.
+
+    Nonces are consumed in one pipelined round trip, signatures are recovered as
+    one batch in the signature pool and users are upserted with a single SELECT.
+    Returns, in order, either the issued token and expiry or the ValueError
+    ``verify_signature`` would have raised for that login.
+    """
+    wallets = [wallet_address.lower() for wallet_address, _, _ in logins]
+
+    stored = await _CONSUME_NONCE.many(
+        redis, [([f"{NONCE_PREFIX}{wallet}"], [NONCE_TTL]) for wallet in wallets]
+    )
+
+    results: list[tuple[str, datetime] | ValueError | None] = [None] * len(logins)
+    messages: dict[int, str] = {}
+    for i, raw in enumerate(stored):
+        try:
+            messages[i] = _nonce_message(raw)
+        except ValueError as e:
+            results[i] = e
+
+    recovered = await signature_service.recover_many(
+        [(message, logins[i][1]) for i, message in messages.items()]
+    )
+
+    valid: dict[str, str] = {}
+    for i, address in zip(messages, recovered):
+        if address == wallets[i]:
+            valid[wallets[i]] = logins[i][2]
+        else:
+            results[i] = ValueError("INVALID_SIGNATURE")
+
+    if valid:
+        await _upsert_users(valid, db)
+
+    for i, wallet in enumerate(wallets):
+        if results[i] is None:
+            results[i] = create_access_token(wallet)
+    return results
@@ -0,0 +1,151 @@
+"""Process-local snapshot of the wallet blacklist.
+
+The blacklist is tiny and rarely changes, so each worker keeps it in memory and
+answers membership checks without touching the database. Every change writes a new
+version token to Redis; workers compare their token at most every
+``settings.blacklist_refresh_interval_seconds`` and reload the list on mismatch.
+Above ``settings.blacklist_bloom_threshold`` entries only a Bloom filter is kept and
+positive hits are confirmed against the database.
+"""
+
+import hashlib
+import logging
+import math
+import time
+import uuid
+from collections.abc import Iterable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.blacklist import Blacklist
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_VERSION_KEY = "blacklist:version"
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class BlacklistSnapshot:
+    def __init__(self):
+        self.version: bytes | str | None = None
+        self.wallets: frozenset[str] = frozenset()
+        self.bloom: BloomFilter | None = None
+        self._checked_at = 0.0
+
+    def replace(self, wallets: Iterable[str], version: bytes | str | None) -> None:
+        wallets = list(wallets)
+        if len(wallets) > settings.blacklist_bloom_threshold:
+            self.bloom = BloomFilter(len(wallets))
+            for wallet in wallets:
+                self.bloom.add(wallet)
+            self.wallets = frozenset()
+        else:
+            self.bloom = None
+            self.wallets = frozenset(wallets)
+        self.version = version
+        self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        self.version = None
+        self._checked_at = 0.0
+
+    async def refresh(self, db: AsyncSession, redis: Redis) -> None:
+        now = time.monotonic()
+        if (
+            self.version is not None
+            and now - self._checked_at < settings.blacklist_refresh_interval_seconds
+        ):
+            return
+
+        version = await redis.get(BLACKLIST_VERSION_KEY)
+        if version is None:
+            # First worker to look publishes a token so the others agree on it
+            await redis.set(BLACKLIST_VERSION_KEY, uuid.uuid4().hex, nx=True)
+            version = await redis.get(BLACKLIST_VERSION_KEY)
+
+        if version != self.version:
+            result = await db.execute(select(Blacklist.wallet))
+            wallets = result.scalars().all()
+            self.replace(wallets, version)
+            logger.info(f"Blacklist snapshot reloaded ({len(wallets)} wallets)")
+        self._checked_at = now
+
+    async def contains(self, wallet: str, db: AsyncSession) -> bool:
+        if self.bloom is not None:
+            if wallet not in self.bloom:
+                return False
+            return await _in_db(wallet, db)
+        return wallet in self.wallets
+
+
+blacklist_snapshot = BlacklistSnapshot()
+
+
+async def _in_db(wallet: str, db: AsyncSession) -> bool:
+    result = await db.execute(select(Blacklist.wallet).where(Blacklist.wallet == wallet))
+    return result.scalar_one_or_none() is not None
+
+
+async def is_blacklisted(wallet: str, db: AsyncSession, redis: Redis | None = None) -> bool:
+    """O(1) membership check against the snapshot; falls back to the database without Redis."""
+    if redis is None:
+        return await _in_db(wallet, db)
+    try:
+        await blacklist_snapshot.refresh(db, redis)
+    except RedisError:
+        logger.warning("Blacklist version check failed, querying database")
+        return await _in_db(wallet, db)
+    return await blacklist_snapshot.contains(wallet, db)
+
+
+async def bump_version(redis: Redis) -> None:
+    """Signal a blacklist change: other workers reload within the refresh interval, this one now."""
+    await redis.set(BLACKLIST_VERSION_KEY, uuid.uuid4().hex)
+    blacklist_snapshot.invalidate()
+
+
+async def add_to_blacklist(
+    wallet: str,
+    reason: str,
+    source: str,
+    added_by: str,
+    db: AsyncSession,
+    redis: Redis,
+) -> Blacklist:
+    """Blacklist a wallet. Commits before bumping the version so workers reload committed data."""
+    entry = Blacklist(wallet=wallet, reason=reason, source=source, added_by=added_by)
+    db.add(entry)
+    await db.commit()
+    await bump_version(redis)
+    return entry
+
+
+async def remove_from_blacklist(wallet: str, db: AsyncSession, redis: Redis) -> bool:
+    result = await db.execute(delete(Blacklist).where(Blacklist.wallet == wallet))
+    await db.commit()
+    await bump_version(redis)
+    return result.rowcount > 0
@@ -1,11 +1,13 @@
 import json
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
 from web3 import AsyncWeb3
 from web3.middleware import ExtraDataToPOAMiddleware
 
 from app.core.config import settings
+from app.models.base import ChainType
 
 # Load ABIs from contracts build output (configurable via CONTRACT_ABI_DIR env var)
 ABI_DIR = Path(os.environ.get(
@@ -23,16 +25,62 @@ def _load_abi(contract_name: str) -> list:
     return []
 
 
-def get_web3() -> AsyncWeb3:
-    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(settings.bsc_rpc_url))
-    w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+@dataclass(frozen=True)
+class ChainConfig:
+    chain: ChainType
+    rpc_url: str
+    ws_url: str
+    chain_id: int
+    escrow_address: str
+    confirmations: int
+    max_block_range: int
+    poa: bool = False  # BSC headers carry oversized extraData
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rpc_url and self.escrow_address)
+
+
+def chain_config(chain: ChainType) -> ChainConfig:
+    if chain == ChainType.BSC:
+        return ChainConfig(
+            chain=chain,
+            rpc_url=settings.bsc_rpc_url,
+            ws_url=settings.bsc_ws_url,
+            chain_id=settings.bsc_chain_id,
+            escrow_address=settings.escrow_contract_address,
+            confirmations=settings.bsc_block_confirmations,
+            max_block_range=settings.bsc_max_block_range,
+            poa=True,
+        )
+    prefix = {ChainType.ETHEREUM: "eth", ChainType.ARBITRUM: "arb", ChainType.BASE: "base"}[chain]
+    return ChainConfig(
+        chain=chain,
+        rpc_url=getattr(settings, f"{prefix}_rpc_url"),
+        ws_url=getattr(settings, f"{prefix}_ws_url"),
+        chain_id=getattr(settings, f"{prefix}_chain_id"),
+        escrow_address=getattr(settings, f"{prefix}_escrow_contract"),
+        confirmations=getattr(settings, f"{prefix}_block_confirmations"),
+        max_block_range=getattr(settings, f"{prefix}_max_block_range"),
+    )
+
+
+def enabled_chains() -> list[ChainConfig]:
+    return [config for config in map(chain_config, ChainType) if config.enabled]
+
+
+def get_web3(chain: ChainType = ChainType.BSC) -> AsyncWeb3:
+    config = chain_config(chain)
+    w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(config.rpc_url))
+    if config.poa:
+        w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
     return w3
 
 
-def get_escrow_contract(w3: AsyncWeb3):
+def get_escrow_contract(w3: AsyncWeb3, chain: ChainType = ChainType.BSC):
     abi = _load_abi("P2PEscrow")
     return w3.eth.contract(
-        address=w3.to_checksum_address(settings.escrow_contract_address),
+        address=w3.to_checksum_address(chain_config(chain).escrow_address),
         abi=abi,
     )
 
@@ -0,0 +1,157 @@
+"""Escrow event journal and the projector that applies it to orders.
+
+Every decoded log is written to ``chain_events`` keyed by (chain, tx_hash,
+log_index) with ``ON CONFLICT DO NOTHING ... RETURNING``, and only the rows
+that were actually inserted are projected onto ``orders``. Replaying a block
+range (after a crash, a reorg rollback or a backfill) therefore touches no
+order twice, and ``replay_journal`` can rebuild projections from the local
+journal without going back to the RPC. A reorg rollback deletes the orphaned
+blocks' rows (``discard_events_after``), so a transaction re-mined at another
+log index is journaled, and projected, only under its canonical key.
+"""
+
+from collections.abc import Iterable, Sequence
+
+from eth_utils import to_hex
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.base import ChainType, OrderStatus
+from app.models.chain_event import ChainEvent
+from app.models.order import Order
+
+ESCROW_EVENTS = ("OrderCreated", "SellerConfirmed", "OrderCompleted", "DisputeOpened", "DisputeResolved")
+
+# Rows per INSERT; keeps each statement well under the bind-parameter limit
+INSERT_BATCH_SIZE = 1000
+
+# Statuses an order must be in for the event to move it, as in order_service's
+# transitions. Anything else means the order is already past it, so a replayed or
+# backfilled event never moves an order backwards.
+SOURCE_STATUSES = {
+    "SellerConfirmed": (OrderStatus.CREATED,),
+    "OrderCompleted": (OrderStatus.SELLER_CONFIRMED,),
+    "DisputeOpened": (OrderStatus.CREATED, OrderStatus.SELLER_CONFIRMED),
+    "DisputeResolved": (OrderStatus.DISPUTED,),
+}
+
+
+def _json_value(value):
+    return to_hex(value) if isinstance(value, bytes) else value
+
+
+def journal_rows(chain: ChainType, logs: Iterable) -> list[dict]:
+    """Turn decoded web3 logs into ``chain_events`` rows."""
+    return [
+        {
+            "chain": chain,
+            "tx_hash": to_hex(log["transactionHash"]),
+            "log_index": log["logIndex"],
+            "block_number": log["blockNumber"],
+            "block_hash": to_hex(log["blockHash"]),
+            "event": log["event"],
+            "args": {name: _json_value(value) for name, value in log["args"].items()},
+        }
+        for log in logs
+    ]
+
+
+def _insert(db: AsyncSession):
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(ChainEvent)
+
+
+async def record_events(db: AsyncSession, rows: Sequence[dict]) -> list[dict]:
+    """Insert journal rows, skipping ones already recorded. Returns the new rows."""
+    inserted: set[tuple[str, int]] = set()
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = rows[start : start + INSERT_BATCH_SIZE]
+        stmt = (
+            _insert(db)
+            .values(batch)
+            .on_conflict_do_nothing(index_elements=["chain", "tx_hash", "log_index"])
+            .returning(ChainEvent.tx_hash, ChainEvent.log_index)
+        )
+        result = await db.execute(stmt)
+        inserted.update((tx_hash, log_index) for tx_hash, log_index in result)
+    return [row for row in rows if (row["tx_hash"], row["log_index"]) in inserted]
+
+
+async def discard_events_after(db: AsyncSession, chain: ChainType, block_number: int) -> int:
+    """Delete journal rows above ``block_number``, orphaned by a reorg. Does not commit."""
+    result = await db.execute(
+        delete(ChainEvent).where(ChainEvent.chain == chain, ChainEvent.block_number > block_number)
+    )
+    return result.rowcount
+
+
+async def project_events(db: AsyncSession, chain: ChainType, events: Sequence[dict]) -> None:
+    """Apply journal rows to ``orders`` in chain order.
+
+    Orders are loaded with at most two queries per call: by creation tx hash,
+    then by on-chain ID for the rest. On-chain order IDs are per contract, so
+    every lookup is scoped to the chain.
+    """
+    events = sorted(events, key=lambda e: (e["block_number"], e["log_index"]))
+    created = {e["tx_hash"] for e in events if e["event"] == "OrderCreated"}
+    referenced = {e["args"]["orderId"] for e in events if e["event"] != "OrderCreated"}
+
+    by_tx: dict[str, Order] = {}
+    if created:
+        result = await db.execute(
+            select(Order).where(Order.chain == chain, Order.tx_hash_create.in_(created))
+        )
+        by_tx = {order.tx_hash_create: order for order in result.scalars()}
+
+    by_onchain_id: dict[int, Order] = {}
+    for event in events:
+        if event["event"] == "OrderCreated" and event["tx_hash"] in by_tx:
+            by_onchain_id[event["args"]["orderId"]] = by_tx[event["tx_hash"]]
+    missing = referenced - by_onchain_id.keys()
+    if missing:
+        result = await db.execute(
+            select(Order).where(Order.chain == chain, Order.onchain_order_id.in_(missing))
+        )
+        by_onchain_id.update((order.onchain_order_id, order) for order in result.scalars())
+
+    for event in events:
+        args = event["args"]
+        name = event["event"]
+        if name == "OrderCreated":
+            order = by_tx.get(event["tx_hash"])
+            if order:
+                order.onchain_order_id = args["orderId"]
+            continue
+
+        order = by_onchain_id.get(args["orderId"])
+        if order is None or order.status not in SOURCE_STATUSES[name]:
+            continue
+        if name == "SellerConfirmed":
+            order.status = OrderStatus.SELLER_CONFIRMED
+        elif name == "OrderCompleted":
+            order.status = OrderStatus.COMPLETED
+        elif name == "DisputeOpened":
+            order.status = OrderStatus.DISPUTED
+        elif name == "DisputeResolved":
+            order.status = (
+                OrderStatus.RESOLVED_BUYER if args["favorBuyer"] else OrderStatus.RESOLVED_SELLER
+            )
+
+
+async def replay_journal(
+    db: AsyncSession, chain: ChainType, from_block: int = 0, to_block: int | None = None
+) -> int:
+    """Re-project journaled events in a block range without touching the RPC.
+
+    Does not commit. Returns the number of events applied.
+    """
+    query = select(ChainEvent.__table__).where(
+        ChainEvent.chain == chain, ChainEvent.block_number >= from_block
+    )
+    if to_block is not None:
+        query = query.where(ChainEvent.block_number <= to_block)
+    result = await db.execute(query)
+    events = [dict(row) for row in result.mappings()]
+    await project_events(db, chain, events)
+    return len(events)
@@ -35,7 +35,6 @@ async def submit_evidence(
     )
     db.add(evidence)
     await db.flush()
-    await db.refresh(evidence)
     return evidence
 
 
@@ -56,5 +55,4 @@ async def resolve_dispute(
 
     order.status = OrderStatus.RESOLVED_BUYER if favor_buyer else OrderStatus.RESOLVED_SELLER
     await db.flush()
-    await db.refresh(order)
     return order
@@ -0,0 +1,109 @@
+"""Dependency health, checked in the background and served from memory.
+
+Probes (nginx, Docker, Prometheus) hit the health endpoints every few seconds
+from every replica, so the endpoints never do I/O themselves: a background task
+re-checks the database, Redis and Celery every
+``settings.health_check_interval_seconds`` and the endpoints read the last result.
+Celery is considered up while the heartbeat key written by the
+``maintenance.celery_heartbeat`` beat task exists, which proves beat, the broker
+and at least one worker are all running without a broadcast to the workers.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+
+from redis.asyncio import Redis
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+
+logger = logging.getLogger(__name__)
+
+CELERY_HEARTBEAT_KEY = "health:celery:heartbeat"
+
+
+class HealthMonitor:
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+        redis_url: str = settings.redis_url,
+    ):
+        self.session_factory = session_factory
+        self.redis_url = redis_url
+        self.checks: dict[str, str] = {}
+        self.checked_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def _check_database(self) -> None:
+        async with self.session_factory() as session:
+            await session.execute(text("SELECT 1"))
+
+    async def _check_redis(self, redis: Redis) -> None:
+        await redis.ping()
+
+    async def _check_celery(self, redis: Redis) -> None:
+        if not await redis.exists(CELERY_HEARTBEAT_KEY):
+            raise RuntimeError("no celery heartbeat")
+
+    async def _probe(self, check) -> str:
+        try:
+            await asyncio.wait_for(check, timeout=settings.health_check_timeout_seconds)
+            return "ok"
+        except Exception:
+            return "error"
+
+    async def refresh(self) -> dict[str, str]:
+        redis = Redis.from_url(self.redis_url)
+        try:
+            database, redis_status, celery = await asyncio.gather(
+                self._probe(self._check_database()),
+                self._probe(self._check_redis(redis)),
+                self._probe(self._check_celery(redis)),
+            )
+        finally:
+            await redis.aclose()
+
+        self.checks = {"api": "ok", "database": database, "redis": redis_status, "celery": celery}
+        self.checked_at = time.monotonic()
+        return self.checks
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Health check refresh failed")
+            await asyncio.sleep(settings.health_check_interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def current(self) -> dict[str, str]:
+        """Last cached result; checks inline only before the first refresh or when stale."""
+        stale_after = settings.health_check_interval_seconds * 3
+        if self.checked_at is None or time.monotonic() - self.checked_at > stale_after:
+            return await self.refresh()
+        return self.checks
+
+
+health_monitor = HealthMonitor()
+
+
+# Celery being down degrades background work but must not pull API replicas out of rotation
+READINESS_CHECKS = ("database", "redis")
+
+
+def is_ready(checks: dict[str, str]) -> bool:
+    return all(checks.get(name) == "ok" for name in READINESS_CHECKS)
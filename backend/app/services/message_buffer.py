@@ -0,0 +1,133 @@
+"""Write-behind buffer that batches chat messages into multi-row INSERTs."""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models.message import Message
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriteBuffer:
+    """Collects messages in memory and persists them with one INSERT ... VALUES per flush.
+
+    A flush happens when ``batch_size`` messages are queued or ``flush_interval``
+    seconds have passed since the first queued message, whichever comes first.
+    ``enqueue`` resolves once the batch containing the message is committed.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = async_session_factory,
+        batch_size: int = settings.ws_message_batch_size,
+        flush_interval: float = settings.ws_message_flush_interval_ms / 1000,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._flushing: asyncio.Task | None = None
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Events and futures are loop-bound; rebuild them if the loop changed
+            self._loop = loop
+            self._pending = []
+            self._has_pending = asyncio.Event()
+            self._batch_full = asyncio.Event()
+            self._task = None
+            self._flushing = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._flushing is not None:
+            # That batch is already off _pending; let it commit and resolve its senders
+            await self._flushing
+            self._flushing = None
+        try:
+            while self._pending:
+                await self.flush()
+        finally:
+            for _, future in self._pending:
+                if not future.done():
+                    future.set_exception(RuntimeError("MESSAGE_BUFFER_STOPPED"))
+            self._pending = []
+        self._loop = None
+
+    async def enqueue(
+        self, order_id: uuid.UUID, sender_wallet: str, ciphertext: str, nonce: str
+    ) -> dict:
+        """Queue a message and wait until it is durable. Returns the inserted row."""
+        self.start()
+        row = {
+            "id": uuid.uuid4(),
+            "order_id": order_id,
+            "sender_wallet": sender_wallet,
+            "ciphertext": ciphertext,
+            "nonce": nonce,
+            "created_at": datetime.now(UTC),
+        }
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        self._has_pending.set()
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+        return await future
+
+    async def flush(self) -> int:
+        batch = self._pending[: self.batch_size]
+        self._pending = self._pending[self.batch_size :]
+        if len(self._pending) < self.batch_size:
+            self._batch_full.clear()
+        if not self._pending:
+            self._has_pending.clear()
+        if not batch:
+            return 0
+
+        try:
+            async with self.session_factory() as db:
+                await db.execute(insert(Message).values([row for row, _ in batch]))
+                await db.commit()
+        except Exception as e:
+            logger.exception(f"Failed to persist batch of {len(batch)} messages")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return 0
+
+        for row, future in batch:
+            if not future.done():
+                future.set_result(row)
+        return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+            # Shielded so that stop() cancelling the loop never abandons a batch mid-flush
+            self._flushing = asyncio.ensure_future(self.flush())
+            await asyncio.shield(self._flushing)
+            self._flushing = None
+
+
+message_buffer = MessageWriteBuffer()
@@ -1,10 +1,29 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.streaming import stream_partitions
 from app.models.message import Message
 from app.models.order import Order
+from app.schemas.message import MessageResponse
+
+MESSAGE_COLUMNS = tuple(getattr(Message, name) for name in MessageResponse.model_fields)
+
+
+async def check_party(order_id: uuid.UUID, wallet: str, db: AsyncSession) -> None:
+    """Raise unless ``wallet`` is the order's buyer, seller or arbitrator."""
+    result = await db.execute(
+        select(Order.buyer_wallet, Order.seller_wallet, Order.arbitrator_wallet).where(
+            Order.id == order_id
+        )
+    )
+    parties = result.one_or_none()
+    if parties is None:
+        raise ValueError("NOT_FOUND")
+    if wallet not in parties:
+        raise ValueError("FORBIDDEN")
 
 
 async def get_messages(
@@ -13,16 +32,10 @@ async def get_messages(
     db: AsyncSession,
     page: int = 1,
     page_size: int = 50,
-) -> tuple[list[Message], int]:
-    # Verify user is party to the order
-    result = await db.execute(select(Order).where(Order.id == order_id))
-    order = result.scalar_one_or_none()
-    if order is None:
-        raise ValueError("NOT_FOUND")
-    if wallet not in (order.buyer_wallet, order.seller_wallet, order.arbitrator_wallet):
-        raise ValueError("FORBIDDEN")
+) -> tuple[list[Row], int]:
+    await check_party(order_id, wallet, db)
 
-    base_query = select(Message).where(Message.order_id == order_id)
+    base_query = select(*MESSAGE_COLUMNS).where(Message.order_id == order_id)
 
     # Count total
     count_query = select(func.count()).select_from(base_query.subquery())
@@ -35,7 +48,22 @@ async def get_messages(
         .offset(offset)
         .limit(page_size)
     )
-    return list(result.scalars().all()), total
+    return list(result.all()), total
+
+
+def stream_messages(
+    order_id: uuid.UUID, db: AsyncSession, batch_size: int = 1000
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield an order's whole chat oldest first, ``batch_size`` messages at a time.
+
+    Does not check access; call ``check_party`` first.
+    """
+    query = (
+        select(*MESSAGE_COLUMNS)
+        .where(Message.order_id == order_id)
+        .order_by(Message.created_at, Message.id)
+    )
+    return stream_partitions(db, query, batch_size)
 
 
 async def create_message(
@@ -45,13 +73,7 @@ async def create_message(
     nonce: str,
     db: AsyncSession,
 ) -> Message:
-    # Verify sender is party to the order
-    result = await db.execute(select(Order).where(Order.id == order_id))
-    order = result.scalar_one_or_none()
-    if order is None:
-        raise ValueError("NOT_FOUND")
-    if sender_wallet not in (order.buyer_wallet, order.seller_wallet, order.arbitrator_wallet):
-        raise ValueError("FORBIDDEN")
+    await check_party(order_id, sender_wallet, db)
 
     message = Message(
         order_id=order_id,
@@ -61,5 +83,4 @@ async def create_message(
     )
     db.add(message)
     await db.flush()
-    await db.refresh(message)
     return message
@@ -1,25 +1,35 @@
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from redis.asyncio import Redis
+from sqlalchemy import Row, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.streaming import stream_partitions
 from app.models.base import OrderStatus
-from app.models.blacklist import Blacklist
 from app.models.order import Order
 from app.models.product import Product
-from app.schemas.order import OrderCreate, OrderListParams
+from app.schemas.order import OrderCreate, OrderListParams, OrderResponse
+from app.services import blacklist_service, stock_service
 
 
 PLATFORM_FEE_BPS = 200
 BPS_DENOMINATOR = 10_000
 
+# List and export queries select these as plain rows. The delivered product key is
+# only read when a party asks for it.
+ORDER_LIST_COLUMNS = tuple(
+    getattr(Order, name) for name in OrderResponse.model_fields if name != "product_key_encrypted"
+)
 
-async def create_order(buyer_wallet: str, data: OrderCreate, db: AsyncSession) -> Order:
-    # Check if buyer or seller is blacklisted
-    blacklisted = await db.execute(select(Blacklist).where(Blacklist.wallet == buyer_wallet))
-    if blacklisted.scalar_one_or_none() is not None:
+
+async def create_order(
+    buyer_wallet: str, data: OrderCreate, db: AsyncSession, redis: Redis | None = None
+) -> Order:
+    # Check if buyer or seller is blacklisted (in-memory snapshot when Redis is available)
+    if await blacklist_service.is_blacklisted(buyer_wallet, db, redis):
         raise ValueError("WALLET_BLACKLISTED")
 
     # Fetch product
@@ -31,17 +41,11 @@ async def create_order(buyer_wallet: str, data: OrderCreate, db: AsyncSession) -
     if product.seller_wallet == buyer_wallet:
         raise ValueError("FORBIDDEN")
 
-    # Check if seller is blacklisted
-    seller_blacklisted = await db.execute(
-        select(Blacklist).where(Blacklist.wallet == product.seller_wallet)
-    )
-    if seller_blacklisted.scalar_one_or_none() is not None:
+    if await blacklist_service.is_blacklisted(product.seller_wallet, db, redis):
         raise ValueError("SELLER_BLACKLISTED")
 
-    # Decrement stock
-    if product.stock <= 0:
-        raise ValueError("OUT_OF_STOCK")
-    product.stock -= 1
+    # Reserve stock atomically (no read-check-write on the product row)
+    await stock_service.reserve_stock(product.id, db, redis)
 
     platform_fee = (data.amount * PLATFORM_FEE_BPS) / BPS_DENOMINATOR
 
@@ -57,7 +61,6 @@ async def create_order(buyer_wallet: str, data: OrderCreate, db: AsyncSession) -
     )
     db.add(order)
     await db.flush()
-    await db.refresh(order)
     return order
 
 
@@ -66,20 +69,30 @@ async def get_order(order_id: uuid.UUID, db: AsyncSession) -> Order | None:
     return result.scalar_one_or_none()
 
 
-async def list_orders(
-    wallet: str, params: OrderListParams, db: AsyncSession
-) -> tuple[list[Order], int]:
-    query = select(Order)
+def _orders_for(
+    wallet: str, role: str | None, status: OrderStatus | None, include_key: bool = False
+):
+    columns = ORDER_LIST_COLUMNS
+    if include_key:
+        columns = (*columns, Order.product_key_encrypted)
+    query = select(*columns)
 
-    if params.role == "buyer":
+    if role == "buyer":
         query = query.where(Order.buyer_wallet == wallet)
-    elif params.role == "seller":
+    elif role == "seller":
         query = query.where(Order.seller_wallet == wallet)
     else:
         query = query.where((Order.buyer_wallet == wallet) | (Order.seller_wallet == wallet))
 
-    if params.status:
-        query = query.where(Order.status == params.status)
+    if status:
+        query = query.where(Order.status == status)
+    return query
+
+
+async def list_orders(
+    wallet: str, params: OrderListParams, db: AsyncSession
+) -> tuple[list[Row], int]:
+    query = _orders_for(wallet, params.role, params.status, params.include_key)
 
     count_query = select(func.count()).select_from(query.subquery())
     total = (await db.execute(count_query)).scalar_one()
@@ -89,69 +102,127 @@ async def list_orders(
     query = query.offset(offset).limit(params.page_size)
 
     result = await db.execute(query)
-    return list(result.scalars().all()), total
-
-
-async def _lock_order(order_id: uuid.UUID, db: AsyncSession) -> Order:
-    """Fetch order with pessimistic lock (SELECT ... FOR UPDATE) to prevent race conditions."""
-    result = await db.execute(
-        select(Order).where(Order.id == order_id).with_for_update()
-    )
-    order = result.scalar_one_or_none()
-    if order is None:
+    return list(result.all()), total
+
+
+def export_orders(
+    wallet: str,
+    db: AsyncSession,
+    role: str | None = None,
+    status: OrderStatus | None = None,
+    batch_size: int = 1000,
+    include_key: bool = False,
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield a wallet's orders oldest first, ``batch_size`` rows at a time.
+
+    Rows come from a server-side cursor, so memory stays flat however many
+    orders the wallet has.
+    """
+    query = _orders_for(wallet, role, status, include_key).order_by(Order.created_at, Order.id)
+    return stream_partitions(db, query, batch_size)
+
+
+async def _transition(
+    order_id: uuid.UUID,
+    from_statuses: tuple[OrderStatus, ...],
+    values: dict,
+    db: AsyncSession,
+    wallet: str | None = None,
+    parties: tuple[str, ...] = (),
+    party_error: str = "FORBIDDEN",
+) -> Order:
+    """Apply a status transition with a single conditional UPDATE ... RETURNING.
+
+    The status check and (when ``wallet`` is given) the party check are part of the
+    WHERE clause, so the row lock is held only for the UPDATE itself. The order is
+    re-read only when nothing matched, to report why.
+    """
+    stmt = update(Order).where(Order.id == order_id, Order.status.in_(from_statuses))
+    if wallet is not None:
+        stmt = stmt.where(or_(*(getattr(Order, party) == wallet for party in parties)))
+    stmt = stmt.values(**values).returning(Order).execution_options(populate_existing=True)
+
+    order = (await db.execute(stmt)).scalar_one_or_none()
+    if order is not None:
+        return order
+
+    current = await get_order(order_id, db)
+    if current is None:
         raise ValueError("NOT_FOUND")
-    return order
+    if wallet is not None and wallet not in (getattr(current, party) for party in parties):
+        raise ValueError(party_error)
+    raise ValueError("INVALID_ORDER_STATUS")
 
 
 async def seller_confirm_delivery(
-    order_id: uuid.UUID, product_key_encrypted: str, db: AsyncSession
+    order_id: uuid.UUID,
+    product_key_encrypted: str,
+    db: AsyncSession,
+    seller_wallet: str | None = None,
 ) -> Order:
-    order = await _lock_order(order_id, db)
-    if order.status != OrderStatus.CREATED:
-        raise ValueError("INVALID_ORDER_STATUS")
-    order.status = OrderStatus.SELLER_CONFIRMED
-    order.seller_confirmed_at = datetime.now(UTC)
-    order.product_key_encrypted = product_key_encrypted
-    await db.flush()
-    await db.refresh(order)
-    return order
-
+    return await _transition(
+        order_id,
+        (OrderStatus.CREATED,),
+        {
+            "status": OrderStatus.SELLER_CONFIRMED,
+            "seller_confirmed_at": datetime.now(UTC),
+            "product_key_encrypted": product_key_encrypted,
+        },
+        db,
+        wallet=seller_wallet,
+        parties=("seller_wallet",),
+        party_error="NOT_SELLER",
+    )
 
-async def buyer_confirm_received(order_id: uuid.UUID, db: AsyncSession) -> Order:
-    order = await _lock_order(order_id, db)
-    if order.status != OrderStatus.SELLER_CONFIRMED:
-        raise ValueError("INVALID_ORDER_STATUS")
-    order.status = OrderStatus.COMPLETED
-    order.completed_at = datetime.now(UTC)
-    await db.flush()
-    await db.refresh(order)
-    return order
 
+async def buyer_confirm_received(
+    order_id: uuid.UUID, db: AsyncSession, buyer_wallet: str | None = None
+) -> Order:
+    return await _transition(
+        order_id,
+        (OrderStatus.SELLER_CONFIRMED,),
+        {"status": OrderStatus.COMPLETED, "completed_at": datetime.now(UTC)},
+        db,
+        wallet=buyer_wallet,
+        parties=("buyer_wallet",),
+        party_error="NOT_BUYER",
+    )
 
-async def cancel_order(order_id: uuid.UUID, db: AsyncSession) -> Order:
-    order = await _lock_order(order_id, db)
-    if order.status != OrderStatus.CREATED:
-        raise ValueError("INVALID_ORDER_STATUS")
-    order.status = OrderStatus.CANCELLED
 
-    # Restore product stock
-    result = await db.execute(select(Product).where(Product.id == order.product_id))
-    product = result.scalar_one_or_none()
-    if product is not None:
-        product.stock += 1
+async def cancel_order(
+    order_id: uuid.UUID,
+    db: AsyncSession,
+    buyer_wallet: str | None = None,
+    redis: Redis | None = None,
+) -> Order:
+    order = await _transition(
+        order_id,
+        (OrderStatus.CREATED,),
+        {"status": OrderStatus.CANCELLED},
+        db,
+        wallet=buyer_wallet,
+        parties=("buyer_wallet",),
+        party_error="NOT_BUYER",
+    )
 
-    await db.flush()
-    await db.refresh(order)
+    # Release the stock reservation
+    await stock_service.release_stock(order.product_id, db, redis)
     return order
 
 
-async def open_dispute(order_id: uuid.UUID, db: AsyncSession) -> Order:
-    order = await _lock_order(order_id, db)
-    if order.status not in (OrderStatus.CREATED, OrderStatus.SELLER_CONFIRMED):
-        raise ValueError("INVALID_ORDER_STATUS")
-    order.status = OrderStatus.DISPUTED
-    order.dispute_opened_at = datetime.now(UTC)
-    order.dispute_deadline = datetime.now(UTC) + timedelta(days=7)
-    await db.flush()
-    await db.refresh(order)
-    return order
+async def open_dispute(
+    order_id: uuid.UUID, db: AsyncSession, wallet: str | None = None
+) -> Order:
+    now = datetime.now(UTC)
+    return await _transition(
+        order_id,
+        (OrderStatus.CREATED, OrderStatus.SELLER_CONFIRMED),
+        {
+            "status": OrderStatus.DISPUTED,
+            "dispute_opened_at": now,
+            "dispute_deadline": now + timedelta(days=7),
+        },
+        db,
+        wallet=wallet,
+        parties=("buyer_wallet", "seller_wallet"),
+    )
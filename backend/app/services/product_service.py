@@ -1,12 +1,35 @@
+import csv
+import enum
 import uuid
+from collections.abc import AsyncIterable, AsyncIterator
 from datetime import UTC, datetime
 
-from sqlalchemy import func, select
+from pydantic import ValidationError
+from sqlalchemy import Row, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.base import ProductStatus
 from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductListParams, ProductUpdate
+from app.schemas.product import ProductCreate, ProductListParams, ProductResponse, ProductUpdate
+
+# List queries select these as plain rows: no identity map, no change tracking
+PRODUCT_LIST_COLUMNS = tuple(getattr(Product, name) for name in ProductResponse.model_fields)
+
+# Rows per COPY (or multi-row INSERT); bounds memory for arbitrarily large uploads
+BULK_BATCH_SIZE = 5000
+BULK_MAX_ERRORS = 20
+BULK_COLUMNS = (
+    "id",
+    "seller_wallet",
+    "title_preview",
+    "description_preview",
+    "category",
+    "price_usdt",
+    "stock",
+    "total_sold",
+    "product_hash",
+    "status",
+)
 
 
 async def create_product(seller_wallet: str, data: ProductCreate, db: AsyncSession) -> Product:
@@ -21,10 +44,137 @@ async def create_product(seller_wallet: str, data: ProductCreate, db: AsyncSessi
     )
     db.add(product)
     await db.flush()
-    await db.refresh(product)
     return product
 
 
+async def _lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Split a byte stream into numbered lines, holding at most one partial line."""
+    pending = b""
+    line_no = 0
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.decode().rstrip("\r")
+    if pending:
+        yield line_no + 1, pending.decode().rstrip("\r")
+
+
+async def parse_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Yield ``(line number, JSON document)`` for each non-blank line."""
+    async for line_no, line in _lines(chunks):
+        if line.strip():
+            yield line_no, line
+
+
+async def parse_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, dict]]:
+    """Yield ``(line number, row)`` for each CSV record after the header.
+
+    Empty cells are left out so optional fields fall back to their defaults. A
+    record continues onto the next line while it has an unterminated quote.
+    """
+    header: list[str] | None = None
+    record: list[str] = []
+    start = 0
+    async for line_no, line in _lines(chunks):
+        if not record:
+            if not line.strip():
+                continue
+            start = line_no
+        record.append(line)
+        text = "\n".join(record)
+        if text.count('"') % 2:
+            continue
+        record = []
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip().lstrip("\ufeff") for name in values]
+            continue
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+
+
+def _bulk_row(seller_wallet: str, data: ProductCreate) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "seller_wallet": seller_wallet,
+        "title_preview": data.title_preview,
+        "description_preview": data.description_preview,
+        "category": data.category,
+        "price_usdt": data.price_usdt,
+        "stock": data.stock,
+        "total_sold": 0,
+        "product_hash": data.product_hash,
+        "status": ProductStatus.ACTIVE,
+    }
+
+
+async def _write_products(db: AsyncSession, rows: list[dict]) -> None:
+    if db.get_bind().dialect.name != "postgresql":
+        await db.execute(insert(Product), rows)
+        return
+    # COPY skips per-row parsing and planning; timestamps take their server defaults.
+    # Enum columns are stored by member name, as SQLAlchemy's Enum type does.
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        Product.__tablename__,
+        columns=BULK_COLUMNS,
+        records=[
+            tuple(
+                row[column].name if isinstance(row[column], enum.Enum) else row[column]
+                for column in BULK_COLUMNS
+            )
+            for row in rows
+        ],
+    )
+
+
+async def bulk_create_products(
+    seller_wallet: str,
+    records: AsyncIterable[tuple[int, str | dict]],
+    db: AsyncSession,
+    max_rows: int,
+) -> tuple[int, list[dict]]:
+    """Validate and insert listings as they are parsed, ``BULK_BATCH_SIZE`` at a time.
+
+    Returns the number of rows written and the per-line validation errors. Once a
+    row fails, later rows are only validated (up to ``BULK_MAX_ERRORS`` errors);
+    the caller must roll back so a partly valid upload writes nothing.
+    """
+    created = 0
+    seen = 0
+    batch: list[dict] = []
+    errors: list[dict] = []
+    async for line_no, record in records:
+        seen += 1
+        if seen > max_rows:
+            raise ValueError("TOO_MANY_ROWS")
+        try:
+            if isinstance(record, str):
+                data = ProductCreate.model_validate_json(record)
+            else:
+                data = ProductCreate.model_validate(record)
+        except ValidationError as e:
+            details = e.errors(include_url=False, include_context=False, include_input=False)
+            errors.append({"line": line_no, "errors": details})
+            if len(errors) >= BULK_MAX_ERRORS:
+                break
+            continue
+        if errors:
+            continue
+        batch.append(_bulk_row(seller_wallet, data))
+        if len(batch) >= BULK_BATCH_SIZE:
+            await _write_products(db, batch)
+            created += len(batch)
+            batch = []
+
+    if batch and not errors:
+        await _write_products(db, batch)
+        created += len(batch)
+    return created, errors
+
+
 async def get_product(product_id: uuid.UUID, db: AsyncSession) -> Product | None:
     result = await db.execute(select(Product).where(Product.id == product_id))
     return result.scalar_one_or_none()
@@ -32,8 +182,8 @@ async def get_product(product_id: uuid.UUID, db: AsyncSession) -> Product | None
 
 async def list_products(
     params: ProductListParams, db: AsyncSession
-) -> tuple[list[Product], int]:
-    query = select(Product).where(
+) -> tuple[list[Row], int]:
+    query = select(*PRODUCT_LIST_COLUMNS).where(
         Product.status == ProductStatus.ACTIVE,
         Product.deleted_at.is_(None),
     )
@@ -69,7 +219,7 @@ async def list_products(
     query = query.offset(offset).limit(params.page_size)
 
     result = await db.execute(query)
-    return list(result.scalars().all()), total
+    return list(result.all()), total
 
 
 async def update_product(
@@ -78,7 +228,6 @@ async def update_product(
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(product, field, value)
     await db.flush()
-    await db.refresh(product)
     return product
 
 
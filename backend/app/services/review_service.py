@@ -14,9 +14,11 @@ async def create_review(
     reviewer_wallet: str,
     rating: int,
     db: AsyncSession,
+    order: Order | None = None,
 ) -> Review:
-    result = await db.execute(select(Order).where(Order.id == order_id))
-    order = result.scalar_one_or_none()
+    if order is None:
+        result = await db.execute(select(Order).where(Order.id == order_id))
+        order = result.scalar_one_or_none()
     if order is None:
         raise ValueError("NOT_FOUND")
 
@@ -57,5 +59,4 @@ async def create_review(
         target_user.rating = round(avg_rating, 2)
         await db.flush()
 
-    await db.refresh(review)
     return review
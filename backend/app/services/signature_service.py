@@ -0,0 +1,88 @@
+"""Ethereum ``personal_sign`` recovery, run off the event loop.
+
+ECDSA public-key recovery is CPU-bound, so it runs in an executor selected by
+``settings.signature_pool_kind`` (``thread`` or ``process``) with
+``settings.signature_pool_workers`` workers. Recovery uses ``eth_keys`` directly;
+no ``Web3`` object is built. Batches are split into one chunk per worker so a
+process pool pays the pickling cost once per chunk rather than per signature.
+"""
+
+import asyncio
+import multiprocessing
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from eth_keys import keys
+from eth_keys.exceptions import BadSignature, ValidationError
+from eth_utils import keccak
+
+from app.core.config import settings
+
+_EIP191_PREFIX = b"\x19Ethereum Signed Message:\n"
+
+_executor: Executor | None = None
+
+
+def recover_address(message: str, signature: str) -> str | None:
+    """Return the lowercase address that signed ``message``, or None for a malformed signature."""
+    try:
+        raw = bytes.fromhex(signature.removeprefix("0x"))
+    except ValueError:
+        return None
+    if len(raw) != 65:
+        return None
+
+    v = raw[64] - 27 if raw[64] >= 27 else raw[64]
+    r = int.from_bytes(raw[:32], "big")
+    s = int.from_bytes(raw[32:64], "big")
+    data = message.encode()
+    digest = keccak(_EIP191_PREFIX + str(len(data)).encode() + data)
+    try:
+        public_key = keys.Signature(vrs=(v, r, s)).recover_public_key_from_msg_hash(digest)
+    except (BadSignature, ValidationError):
+        return None
+    return public_key.to_address()
+
+
+def recover_batch(items: Sequence[tuple[str, str]]) -> list[str | None]:
+    return [recover_address(message, signature) for message, signature in items]
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        workers = settings.signature_pool_workers
+        if settings.signature_pool_kind == "process":
+            # spawn: forking a process that already runs an event loop and threads is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sigrecover")
+    return _executor
+
+
+async def recover(message: str, signature: str) -> str | None:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), recover_address, message, signature)
+
+
+async def recover_many(items: Sequence[tuple[str, str]]) -> list[str | None]:
+    """Recover a batch of (message, signature) pairs, preserving order."""
+    if not items:
+        return []
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    size = -(-len(items) // settings.signature_pool_workers)
+    chunks = [list(items[i : i + size]) for i in range(0, len(items), size)]
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, recover_batch, chunk) for chunk in chunks)
+    )
+    return [address for chunk in results for address in chunk]
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,193 @@
+"""Stock reservation without row-level read-modify-write.
+
+The baseline path is a single conditional UPDATE, so concurrent buyers can never
+oversell and nobody holds a lock across a round trip. Products listed in
+``settings.hot_product_ids`` instead reserve against a Redis counter (seeded from
+the database) and ``reconcile_hot_stock`` periodically writes the counters back.
+Redis changes are tied to the session's transaction: a reservation is put back
+if that transaction ends without committing (a failed flush or commit), while
+releases and counter resets only apply once it has committed.
+"""
+
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+from app.core.redis_scripts import LuaScript
+from app.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+STOCK_KEY_PREFIX = "stock:"
+
+# KEYS[1] = counter. Returns the remaining stock, -1 when sold out, -2 when not seeded.
+_RESERVE_SCRIPT = LuaScript("""
+local stock = redis.call('GET', KEYS[1])
+if not stock then return -2 end
+if tonumber(stock) <= 0 then return -1 end
+return redis.call('DECR', KEYS[1])
+""")
+
+# KEYS[1] = counter, ARGV[1] = quantity. Only releases into an already seeded counter.
+_RELEASE_SCRIPT = LuaScript("""
+if redis.call('EXISTS', KEYS[1]) == 0 then return -2 end
+return redis.call('INCRBY', KEYS[1], ARGV[1])
+""")
+
+
+def is_hot(product_id: uuid.UUID) -> bool:
+    return str(product_id) in settings.hot_product_ids
+
+
+def _key(product_id: uuid.UUID) -> str:
+    return f"{STOCK_KEY_PREFIX}{product_id}"
+
+
+async def reserve_stock(
+    product_id: uuid.UUID, db: AsyncSession, redis: Redis | None = None
+) -> int:
+    """Take one unit of stock. Returns the remaining stock or raises OUT_OF_STOCK."""
+    if redis is not None and is_hot(product_id):
+        remaining = await _RESERVE_SCRIPT(redis, keys=[_key(product_id)])
+        if remaining == -2:
+            await _seed_counter(product_id, db, redis)
+            remaining = await _RESERVE_SCRIPT(redis, keys=[_key(product_id)])
+        if remaining < 0:
+            raise ValueError("OUT_OF_STOCK")
+        _release_unless_committed(product_id, db, redis)
+        return remaining
+
+    result = await db.execute(
+        update(Product)
+        .where(Product.id == product_id, Product.stock > 0)
+        .values(stock=Product.stock - 1)
+        .returning(Product.stock)
+    )
+    remaining = result.scalar_one_or_none()
+    if remaining is None:
+        raise ValueError("OUT_OF_STOCK")
+    return remaining
+
+
+async def release_stock(
+    product_id: uuid.UUID,
+    db: AsyncSession,
+    redis: Redis | None = None,
+    quantity: int = 1,
+) -> None:
+    """Return reserved units, e.g. when an order is cancelled or expires.
+
+    A seeded hot counter gets the units back only once the transaction commits,
+    so a cancel that fails never frees stock in Redis.
+    """
+    if redis is not None and is_hot(product_id) and await redis.exists(_key(product_id)):
+        _after_transaction(
+            db,
+            committed=lambda: _RELEASE_SCRIPT(redis, keys=[_key(product_id)], args=[quantity]),
+            failure=f"Could not release hot stock for {product_id}; reconcile will fix it",
+        )
+        return
+
+    await db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(stock=Product.stock + quantity)
+    )
+
+
+def _release_unless_committed(product_id: uuid.UUID, db: AsyncSession, redis: Redis) -> None:
+    """Put a Redis-reserved unit back if the current transaction does not commit."""
+    _after_transaction(
+        db,
+        rolled_back=lambda: _RELEASE_SCRIPT(redis, keys=[_key(product_id)], args=[1]),
+        failure=f"Could not release hot stock for {product_id}; reconcile will fix it",
+    )
+
+
+def _after_transaction(
+    db: AsyncSession,
+    committed: Callable[[], Awaitable] | None = None,
+    rolled_back: Callable[[], Awaitable] | None = None,
+    failure: str = "",
+) -> None:
+    """Run a Redis call when the session's current transaction ends.
+
+    ``committed`` runs if the transaction commits, ``rolled_back`` if it ends any
+    other way. The listeners run inside the session's greenlet, so ``await_only``
+    finishes the call before the commit, rollback or close returns to the caller.
+    """
+    session = db.sync_session
+    transaction = session.get_transaction() or session.begin()
+    was_committed = False
+
+    def on_commit(_session) -> None:
+        nonlocal was_committed
+        was_committed = True  # only this transaction can commit before it ends
+
+    def on_end(_session, ended) -> None:
+        if ended is not transaction:
+            return
+        call = committed if was_committed else rolled_back
+        if call is None:
+            return
+        try:
+            await_only(call())
+        except RedisError:
+            logger.warning(failure)
+
+    event.listen(session, "after_commit", on_commit)
+    event.listen(session, "after_transaction_end", on_end)
+
+
+def reset_hot_stock(product_id: uuid.UUID, db: AsyncSession, redis: Redis) -> None:
+    """Drop the cached counter once the seller's stock edit commits.
+
+    The next reservation then re-seeds from the new stock. Dropping it before the
+    commit would let a reservation re-seed from the old stock in between.
+    """
+    if is_hot(product_id):
+        _after_transaction(
+            db,
+            committed=lambda: redis.delete(_key(product_id)),
+            failure=f"Could not reset hot stock for {product_id}",
+        )
+
+
+async def reconcile_hot_stock(db: AsyncSession, redis: Redis) -> int:
+    """Write Redis counters for hot products back to the products table.
+
+    Each write is conditional on the stock read before the counter: a seller's edit
+    that lands in between (which also drops the counter) is kept, and the next
+    reservation re-seeds from it.
+    """
+    product_ids = [uuid.UUID(product_id) for product_id in settings.hot_product_ids]
+    if not product_ids:
+        return 0
+    result = await db.execute(select(Product.id, Product.stock).where(Product.id.in_(product_ids)))
+    stored = dict(result.all())
+    reconciled = 0
+    for product_id, stock in stored.items():
+        value = await redis.get(_key(product_id))
+        if value is None:
+            continue
+        result = await db.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.stock == stock)
+            .values(stock=int(value))
+        )
+        reconciled += result.rowcount
+    return reconciled
+
+
+async def _seed_counter(product_id: uuid.UUID, db: AsyncSession, redis: Redis) -> None:
+    result = await db.execute(select(Product.stock).where(Product.id == product_id))
+    stock = result.scalar_one_or_none() or 0
+    # NX: a concurrent request may have seeded (and already decremented) the counter
+    await redis.set(_key(product_id), stock, nx=True)
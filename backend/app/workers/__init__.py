@@ -17,9 +17,9 @@ celery_app.conf.update(
 )
 
 celery_app.conf.beat_schedule = {
-    "sync-bsc-events": {
+    "sync-chain-events": {
         "task": "app.workers.event_listener.sync_events",
-        "schedule": 15.0,  # every 15 seconds
+        "schedule": 15.0,  # every 15 seconds; a no-op per chain while a chain daemon runs it
     },
     "check-timeouts": {
         "task": "app.workers.timeout_checker.check_timeouts",
@@ -29,6 +29,14 @@ celery_app.conf.beat_schedule = {
         "task": "app.workers.maintenance.cleanup_expired_nonces",
         "schedule": crontab(minute="*/5"),
     },
+    "reconcile-hot-stock": {
+        "task": "app.workers.maintenance.reconcile_hot_stock",
+        "schedule": float(settings.stock_reconcile_interval_seconds),
+    },
+    "celery-heartbeat": {
+        "task": "app.workers.maintenance.celery_heartbeat",
+        "schedule": float(settings.celery_heartbeat_interval_seconds),
+    },
     "recalculate-tiers": {
         "task": "app.workers.maintenance.recalculate_tiers",
         "schedule": crontab(hour="*/6", minute="0"),
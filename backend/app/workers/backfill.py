@@ -0,0 +1,195 @@
+"""Historical escrow event backfill.
+
+    python -m app.workers.backfill --chain bsc --from-block 35000000 --to-block 36000000 --concurrency 8
+
+Splits the range into ``--chunk-size`` block windows and keeps up to
+``--concurrency`` ``eth_getLogs`` fetches in flight. Chunks are written in block
+order, one transaction each: their logs are journaled in ``chain_events`` with
+multi-row inserts, and only newly journaled events are projected onto orders.
+Each projection applies only to an order in the event's source status, so ranges
+the live listener already processed (with or without the journal) never move an
+order backwards.
+
+After each commit the highest written block is saved in Redis. Re-running the
+same command resumes after it, and ``--restart`` starts over. Progress and
+throughput are printed as chunks complete. The event sync cursor is not moved.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core import database
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.models.base import ChainType
+from app.services import chain_event_service
+from app.services.blockchain_service import ChainConfig, chain_config, get_escrow_contract, get_web3
+from app.workers.event_listener import fetch_logs
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_PREFIX = "backfill:"
+CHECKPOINT_TTL = 7 * 24 * 3600  # seconds
+
+
+def checkpoint_key(chain: ChainType, from_block: int, to_block: int) -> str:
+    return f"{CHECKPOINT_PREFIX}{chain.value}:{from_block}:{to_block}"
+
+
+@dataclass
+class Progress:
+    total_blocks: int
+    blocks: int = 0
+    logs: int = 0
+    new_events: int = 0
+    started: float = 0.0
+
+    def line(self, last_block: int) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        rate = self.blocks / elapsed
+        eta = (self.total_blocks - self.blocks) / rate if rate else 0.0
+        return (
+            f"block {last_block} {self.blocks}/{self.total_blocks} "
+            f"({100 * self.blocks / max(self.total_blocks, 1):.1f}%) "
+            f"logs={self.logs} new={self.new_events} "
+            f"{rate:,.0f} blocks/s {self.logs / elapsed:,.0f} logs/s eta={eta:,.0f}s"
+        )
+
+
+async def _fetch_with_retry(escrow, start: int, end: int, retries: int, backoff: float) -> list:
+    for attempt in range(retries + 1):
+        try:
+            return await fetch_logs(escrow, start, end)
+        except Exception:
+            if attempt == retries:
+                raise
+            logger.warning(f"eth_getLogs {start}-{end} failed, retry {attempt + 1}/{retries}")
+            await asyncio.sleep(backoff * 2**attempt)
+    raise AssertionError("unreachable")
+
+
+async def backfill(
+    w3,
+    escrow,
+    config: ChainConfig,
+    session_factory: async_sessionmaker[AsyncSession],
+    redis: Redis,
+    from_block: int,
+    to_block: int,
+    concurrency: int = 4,
+    chunk_size: int | None = None,
+    retries: int = 5,
+    retry_backoff: float = 1.0,
+    restart: bool = False,
+    report: Callable[[str], None] = print,
+) -> Progress:
+    """Journal and project every escrow event in ``[from_block, to_block]``."""
+    chunk_size = chunk_size or config.max_block_range
+    key = checkpoint_key(config.chain, from_block, to_block)
+    if restart:
+        await redis.delete(key)
+    saved = await redis.get(key)
+    start = int(saved) + 1 if saved is not None else from_block
+    if start > from_block:
+        report(f"resuming {config.chain.value} backfill at block {start}")
+
+    progress = Progress(total_blocks=to_block - start + 1, started=time.perf_counter())
+    chunks = deque((lo, min(lo + chunk_size - 1, to_block)) for lo in range(start, to_block + 1, chunk_size))
+    in_flight: deque[tuple[int, int, asyncio.Task]] = deque()
+
+    def launch() -> None:
+        lo, hi = chunks.popleft()
+        task = asyncio.create_task(_fetch_with_retry(escrow, lo, hi, retries, retry_backoff))
+        in_flight.append((lo, hi, task))
+
+    try:
+        while chunks and len(in_flight) < concurrency:
+            launch()
+        while in_flight:
+            # Fetches overlap; writes happen strictly in block order
+            lo, hi, task = in_flight.popleft()
+            logs = await task
+            if chunks:
+                launch()
+
+            async with session_factory() as db:
+                rows = chain_event_service.journal_rows(config.chain, logs)
+                new_events = await chain_event_service.record_events(db, rows)
+                await chain_event_service.project_events(db, config.chain, new_events)
+                await db.commit()
+            await redis.set(key, hi, ex=CHECKPOINT_TTL)
+
+            progress.blocks += hi - lo + 1
+            progress.logs += len(logs)
+            progress.new_events += len(new_events)
+            report(progress.line(hi))
+    finally:
+        for _, _, task in in_flight:
+            task.cancel()
+        await asyncio.gather(*(task for _, _, task in in_flight), return_exceptions=True)
+
+    await redis.delete(key)
+    return progress
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chain", choices=[c.value for c in ChainType], default=ChainType.BSC.value)
+    parser.add_argument("--from-block", type=int, required=True)
+    parser.add_argument("--to-block", type=int, help="default: last confirmed block")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, help="blocks per eth_getLogs (default: <CHAIN>_MAX_BLOCK_RANGE)")
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--restart", action="store_true", help="ignore a saved checkpoint")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    config = chain_config(ChainType(args.chain))
+    w3 = get_web3(config.chain)
+    escrow = get_escrow_contract(w3, config.chain)
+    to_block = args.to_block
+    if to_block is None:
+        to_block = await w3.eth.get_block_number() - config.confirmations
+
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        progress = await backfill(
+            w3,
+            escrow,
+            config,
+            database.async_session_factory,
+            redis,
+            args.from_block,
+            to_block,
+            concurrency=args.concurrency,
+            chunk_size=args.chunk_size,
+            retries=args.retries,
+            restart=args.restart,
+            report=lambda line: print(line, flush=True),
+        )
+    finally:
+        await redis.aclose()
+        await database.engine.dispose()
+    print(f"done: {progress.line(to_block)}", flush=True)
+
+
+def main(argv: list[str] | None = None) -> None:
+    configure_logging()
+    try:
+        asyncio.run(_main(_parse_args(argv)))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
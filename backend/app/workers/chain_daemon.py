@@ -0,0 +1,180 @@
+"""Long-running escrow event listener for every enabled chain.
+
+    python -m app.workers.chain_daemon
+
+Reacts to each new chain head instead of waiting for the 15-second
+``sync-chain-events`` beat tick: with ``<CHAIN>_WS_URL`` set it subscribes to
+``newHeads``, otherwise it polls ``eth_blockNumber`` every
+``CHAIN_POLL_INTERVAL_SECONDS``. Blocks are applied as soon as they have the
+chain's ``<CHAIN>_BLOCK_CONFIRMATIONS``. RPC and database errors are retried
+with exponential backoff capped at ``CHAIN_MAX_BACKOFF_SECONDS``.
+
+Each chain runs as its own task with its own head source, lease, sessions and
+backoff, so a stalled RPC on one chain never delays another.
+
+Any number of instances may run; per chain, the one holding the Redis lease
+``event_listener.lease_key(chain)`` syncs and the others wait to take it over.
+The beat task takes the same leases, so it does nothing while a daemon is
+active and resumes syncing if none is.
+"""
+
+import asyncio
+import contextlib
+import logging
+import signal
+import time
+from collections.abc import AsyncIterator
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from web3 import AsyncWeb3, WebSocketProvider
+from web3.middleware import ExtraDataToPOAMiddleware
+
+from app.core import database
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.services.blockchain_service import (
+    ChainConfig,
+    enabled_chains,
+    get_escrow_contract,
+    get_web3,
+)
+from app.workers import event_listener
+from app.workers.lease import RedisLease
+
+logger = logging.getLogger(__name__)
+
+
+class ChainDaemon:
+    def __init__(
+        self,
+        w3,
+        escrow,
+        redis: Redis,
+        session_factory: async_sessionmaker[AsyncSession],
+        config: ChainConfig,
+        poll_interval: float = settings.chain_poll_interval_seconds,
+        max_backoff: float = settings.chain_max_backoff_seconds,
+        lease_ttl: float = settings.chain_lease_ttl_seconds,
+    ):
+        self.w3 = w3
+        self.escrow = escrow
+        self.redis = redis
+        self.session_factory = session_factory
+        self.config = config
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.lease = RedisLease(redis, event_listener.lease_key(config.chain), lease_ttl)
+
+    async def on_head(self, head: int) -> bool:
+        """Sync every block confirmed at ``head``. Returns False while on standby."""
+        if not await self.lease.hold():
+            return False
+        while True:
+            started = time.perf_counter()
+            async with self.session_factory() as db:
+                result = await event_listener.sync_once(
+                    self.w3, self.escrow, db, self.config, head
+                )
+            await event_listener._record_sync(
+                self.redis, self.config.chain, result, time.perf_counter() - started
+            )
+            head = result.head
+            if result.last_block >= head - self.config.confirmations:
+                return True
+            # Catching up in chunks; make sure nobody took over in between
+            if not await self.lease.renew():
+                return False
+
+    async def _poll_heads(self) -> AsyncIterator[int]:
+        last = None
+        while True:
+            head = await self.w3.eth.get_block_number()
+            if head != last:
+                last = head
+                yield head
+            else:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _subscribed_heads(self) -> AsyncIterator[int]:
+        async with AsyncWeb3(WebSocketProvider(self.config.ws_url)) as ws:
+            if self.config.poa:
+                ws.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+            await ws.eth.subscribe("newHeads")
+            # Blocks mined while disconnected are picked up from the cursor
+            yield await self.w3.eth.get_block_number()
+            async for message in ws.socket.process_subscriptions():
+                yield message["result"]["number"]
+
+    def heads(self) -> AsyncIterator[int]:
+        return self._subscribed_heads() if self.config.ws_url else self._poll_heads()
+
+    async def _keep_lease(self) -> None:
+        # Heads can be far apart on a quiet chain; don't let the lease lapse meanwhile
+        while True:
+            await asyncio.sleep(self.lease.ttl_ms / 3000)
+            with contextlib.suppress(Exception):
+                await self.lease.hold()
+
+    async def run(self) -> None:
+        """Follow the chain until cancelled, then release the lease."""
+        keeper = asyncio.create_task(self._keep_lease())
+        backoff = self.poll_interval
+        try:
+            while True:
+                try:
+                    async for head in self.heads():
+                        await self.on_head(head)
+                        backoff = self.poll_interval
+                except Exception:
+                    logger.exception(
+                        f"{self.config.chain.value} sync failed, retrying in {backoff:.1f}s"
+                    )
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.max_backoff)
+        finally:
+            keeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await keeper
+            with contextlib.suppress(Exception):
+                await self.lease.release()
+
+
+async def _main() -> None:
+    chains = enabled_chains()
+    if not chains:
+        logger.error("No chain has both an RPC URL and an escrow address configured")
+        return
+
+    redis = Redis.from_url(settings.redis_url)
+    tasks = []
+    for config in chains:
+        w3 = get_web3(config.chain)
+        escrow = get_escrow_contract(w3, config.chain)
+        daemon = ChainDaemon(w3, escrow, redis, database.async_session_factory, config)
+        tasks.append(asyncio.create_task(daemon.run()))
+
+    def stop() -> None:
+        for task in tasks:
+            task.cancel()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop)
+
+    logger.info(f"Chain daemon started for {', '.join(c.chain.value for c in chains)}")
+    try:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await redis.aclose()
+        await database.engine.dispose()
+    logger.info("Chain daemon stopped")
+
+
+def main() -> None:
+    configure_logging()
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,128 +1,220 @@
 import asyncio
 import logging
+import time
+from dataclasses import dataclass
 
+from eth_utils import to_hex
+
+from redis.asyncio import Redis
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
+from app.core.config import settings
 from app.core.database import async_session_factory
-from app.models.base import ChainType, OrderStatus
+from app.models.base import ChainType
 from app.models.event_sync import EventSyncCursor
-from app.models.order import Order
-from app.services.blockchain_service import get_escrow_contract, get_web3
-from app.workers import celery_app
+from app.services import chain_event_service
+from app.services.blockchain_service import (
+    ChainConfig,
+    enabled_chains,
+    get_escrow_contract,
+    get_web3,
+)
+from app.workers.lease import RedisLease
+from app.workers.runtime import async_task
 
 logger = logging.getLogger(__name__)
 
+LEASE_KEY_PREFIX = "lease:chain_sync:"
+
+
+def lease_key(chain: ChainType) -> str:
+    return f"{LEASE_KEY_PREFIX}{chain.value}"
+
 
-@celery_app.task(name="app.workers.event_listener.sync_events")
-def sync_events():
-    asyncio.get_event_loop().run_until_complete(_sync_events())
+@dataclass
+class SyncResult:
+    head: int
+    last_block: int
+    reorg_depth: int = 0  # blocks rolled back by this call
+
+
+async def _record_sync(redis: Redis, chain: ChainType, result: SyncResult, seconds: float) -> None:
+    label = chain.value
+    lag = result.head - result.last_block
+    await metrics.set_worker_gauge(redis, "event_listener_block_lag", label, lag)
+    await metrics.set_worker_gauge(redis, "event_listener_last_sync_timestamp", label, time.time())
+    await metrics.observe_worker_histogram(redis, "event_listener_sync_seconds", label, seconds)
+    if result.reorg_depth:
+        await metrics.observe_worker_histogram(
+            redis, "event_listener_reorg_depth", label, result.reorg_depth
+        )
+
+
+@async_task(name="app.workers.event_listener.sync_events")
+async def sync_events():
+    await _sync_events()
 
 
 async def _sync_events():
-    w3 = get_web3()
-    escrow = get_escrow_contract(w3)
+    """Beat-driven sync of every enabled chain, concurrently.
+
+    Each chain has its own lease, session and error handling, so a slow or
+    failing RPC only delays its own chain. A chain whose lease is held by a
+    chain daemon is skipped.
+    """
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        await asyncio.gather(*(_sync_chain(config, redis) for config in enabled_chains()))
+    finally:
+        await redis.aclose()
+
+
+async def _sync_chain(config: ChainConfig, redis: Redis) -> None:
+    chain = config.chain.value
+    lease = RedisLease(redis, lease_key(config.chain), settings.chain_lease_ttl_seconds)
+    if not await lease.acquire():
+        logger.debug(f"{chain} event sync lease held elsewhere, skipping")
+        return
+    try:
+        started = time.perf_counter()
+        w3 = get_web3(config.chain)
+        escrow = get_escrow_contract(w3, config.chain)
+        async with async_session_factory() as db:
+            result = await sync_once(w3, escrow, db, config)
+        await _record_sync(redis, config.chain, result, time.perf_counter() - started)
+    except Exception:
+        logger.exception(f"Error syncing {chain} events")
+    finally:
+        await lease.release()
+
+
+async def sync_once(
+    w3,
+    escrow,
+    db: AsyncSession,
+    config: ChainConfig,
+    head: int | None = None,
+) -> SyncResult:
+    """Apply a chain's escrow events from its cursor up to the last confirmed block.
+
+    Processes at most ``config.max_block_range`` blocks per call. The logs are
+    journaled in ``chain_events`` and only newly journaled ones are projected
+    onto orders, in the same transaction as the cursor update. ``last_block < head - config.confirmations``
+    in the result means there is more to catch up on.
+
+    The cursor keeps a ring of ``(block_number, block_hash)`` checkpoints, one
+    per committed batch. Before a batch is applied, the parent hash of its first
+    block must match the newest checkpoint. If it does not, the chain reorged
+    under the cursor: the call rolls the cursor back to the newest checkpoint
+    still on the canonical chain and returns, and the following calls replay
+    from there.
+    """
+    if head is None:
+        head = await w3.eth.get_block_number()
+    confirmed = head - config.confirmations
+
+    result = await db.execute(
+        select(EventSyncCursor).where(EventSyncCursor.chain == config.chain)
+    )
+    cursor = result.scalar_one_or_none()
+    if cursor is None:
+        block = await w3.eth.get_block(confirmed)
+        cursor = EventSyncCursor(
+            chain=config.chain,
+            contract=escrow.address,
+            last_block=confirmed,
+            checkpoints=[[confirmed, to_hex(block["hash"])]],
+        )
+        db.add(cursor)
+        await db.commit()
+        return SyncResult(head, confirmed)
+
+    from_block = cursor.last_block + 1
+    if from_block > confirmed:
+        return SyncResult(head, cursor.last_block)
+
+    # Cap batch size to prevent RPC overload
+    to_block = min(confirmed, from_block + config.max_block_range - 1)
+
+    # Headers are read before the logs so a reorg after this point is caught next call
+    first = await w3.eth.get_block(from_block)
+    if not await _extends_checkpoint(w3, cursor, first):
+        depth = await _roll_back(w3, db, cursor)
+        return SyncResult(head, cursor.last_block, reorg_depth=depth)
+    last = first if to_block == from_block else await w3.eth.get_block(to_block)
+
+    try:
+        logs = await fetch_logs(escrow, from_block, to_block)
+        rows = chain_event_service.journal_rows(config.chain, logs)
+        new_events = await chain_event_service.record_events(db, rows)
+        await chain_event_service.project_events(db, config.chain, new_events)
+        cursor.last_block = to_block
+        checkpoints = [*cursor.checkpoints, [to_block, to_hex(last["hash"])]]
+        cursor.checkpoints = checkpoints[-settings.chain_reorg_checkpoints:]
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return SyncResult(head, to_block)
+
+
+async def _extends_checkpoint(w3, cursor: EventSyncCursor, block) -> bool:
+    """Whether ``block`` builds on the newest checkpoint at or below its parent.
+
+    Normally that checkpoint is the parent itself and its hash is compared with
+    ``parentHash``; an older one costs one header lookup.
+    """
+    parent = block["number"] - 1
+    stored = [checkpoint for checkpoint in cursor.checkpoints if checkpoint[0] <= parent]
+    if not stored:
+        return True  # nothing recorded yet (or lost after a reorg deeper than the ring)
+    number, block_hash = stored[-1]
+    if number == parent:
+        return to_hex(block["parentHash"]) == block_hash
+    return to_hex((await w3.eth.get_block(number))["hash"]) == block_hash
+
+
+async def _roll_back(w3, db: AsyncSession, cursor: EventSyncCursor) -> int:
+    """Move the cursor back to the newest checkpoint still on the canonical chain.
+
+    Checks checkpoints newest first, so the RPC cost grows with the reorg
+    depth, not with the ring size. The journal rows of the abandoned blocks are
+    deleted in the same transaction. Returns the number of blocks rolled back.
+    """
+    previous = cursor.last_block
+    kept = list(cursor.checkpoints)
+    while kept:
+        number, block_hash = kept[-1]
+        block = await w3.eth.get_block(number)
+        if to_hex(block["hash"]) == block_hash:
+            break
+        kept.pop()
+
+    if kept:
+        cursor.last_block = kept[-1][0]
+        logger.warning(
+            f"{cursor.chain.value} reorg: rolled back from block {previous} to {cursor.last_block}"
+        )
+    else:
+        # Deeper than every checkpoint: replay the whole window the ring covered
+        cursor.last_block = cursor.checkpoints[0][0] - 1
+        logger.error(
+            f"{cursor.chain.value} reorg deeper than {len(cursor.checkpoints)} checkpoints: "
+            f"rolled back from block {previous} to {cursor.last_block} unverified"
+        )
+    cursor.checkpoints = kept
+    await chain_event_service.discard_events_after(db, cursor.chain, cursor.last_block)
+    await db.commit()
+    return previous - cursor.last_block
+
 
-    async with async_session_factory() as db:
-        # Get last synced block
-        result = await db.execute(
-            select(EventSyncCursor).where(EventSyncCursor.chain == ChainType.BSC)
+async def fetch_logs(escrow, from_block: int, to_block: int) -> list:
+    batches = await asyncio.gather(
+        *(
+            getattr(escrow.events, name).get_logs(from_block=from_block, to_block=to_block)
+            for name in chain_event_service.ESCROW_EVENTS
         )
-        cursor = result.scalar_one_or_none()
-        if cursor is None:
-            latest = await w3.eth.get_block_number()
-            cursor = EventSyncCursor(
-                chain=ChainType.BSC,
-                contract=escrow.address,
-                last_block=latest,
-            )
-            db.add(cursor)
-            await db.commit()
-            return
-
-        from_block = cursor.last_block + 1
-        to_block = await w3.eth.get_block_number()
-
-        if from_block > to_block:
-            return
-
-        # Cap batch size to prevent RPC overload
-        to_block = min(to_block, from_block + 2000)
-
-        try:
-            # Process OrderCreated events
-            events = await escrow.events.OrderCreated.get_logs(
-                fromBlock=from_block, toBlock=to_block
-            )
-            for event in events:
-                args = event["args"]
-                # Update order with on-chain ID if matched by tx_hash
-                tx_hash = event["transactionHash"].hex()
-                result = await db.execute(
-                    select(Order).where(Order.tx_hash_create == f"0x{tx_hash}")
-                )
-                order = result.scalar_one_or_none()
-                if order:
-                    order.onchain_order_id = args["orderId"]
-
-            # Process SellerConfirmed events
-            events = await escrow.events.SellerConfirmed.get_logs(
-                fromBlock=from_block, toBlock=to_block
-            )
-            for event in events:
-                args = event["args"]
-                result = await db.execute(
-                    select(Order).where(Order.onchain_order_id == args["orderId"])
-                )
-                order = result.scalar_one_or_none()
-                if order and order.status == OrderStatus.CREATED:
-                    order.status = OrderStatus.SELLER_CONFIRMED
-
-            # Process OrderCompleted events
-            events = await escrow.events.OrderCompleted.get_logs(
-                fromBlock=from_block, toBlock=to_block
-            )
-            for event in events:
-                args = event["args"]
-                result = await db.execute(
-                    select(Order).where(Order.onchain_order_id == args["orderId"])
-                )
-                order = result.scalar_one_or_none()
-                if order and order.status == OrderStatus.SELLER_CONFIRMED:
-                    order.status = OrderStatus.COMPLETED
-
-            # Process DisputeOpened events
-            events = await escrow.events.DisputeOpened.get_logs(
-                fromBlock=from_block, toBlock=to_block
-            )
-            for event in events:
-                args = event["args"]
-                result = await db.execute(
-                    select(Order).where(Order.onchain_order_id == args["orderId"])
-                )
-                order = result.scalar_one_or_none()
-                if order:
-                    order.status = OrderStatus.DISPUTED
-
-            # Process DisputeResolved events
-            events = await escrow.events.DisputeResolved.get_logs(
-                fromBlock=from_block, toBlock=to_block
-            )
-            for event in events:
-                args = event["args"]
-                result = await db.execute(
-                    select(Order).where(Order.onchain_order_id == args["orderId"])
-                )
-                order = result.scalar_one_or_none()
-                if order:
-                    order.status = (
-                        OrderStatus.RESOLVED_BUYER if args["favorBuyer"]
-                        else OrderStatus.RESOLVED_SELLER
-                    )
-
-            # Update cursor
-            cursor.last_block = to_block
-            await db.commit()
-
-        except Exception:
-            logger.exception("Error syncing BSC events")
-            await db.rollback()
+    )
+    return [log for batch in batches for log in batch]
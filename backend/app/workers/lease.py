@@ -0,0 +1,59 @@
+"""Redis leases: a TTL'd key naming the single process allowed to do some work.
+
+Unlike the fire-and-forget ``SET NX`` locks around short Celery tasks, a lease is
+held for as long as its owner keeps renewing it, and renew/release only touch
+the key while it still carries the owner's token, so an owner that stalled past
+the TTL cannot extend or delete a lease another process has since taken.
+"""
+
+import uuid
+
+from redis.asyncio import Redis
+
+from app.core.redis_scripts import LuaScript
+
+_RENEW = LuaScript(
+    """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+)
+
+_RELEASE = LuaScript(
+    """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+)
+
+
+class RedisLease:
+    def __init__(self, redis: Redis, key: str, ttl_seconds: float):
+        self.redis = redis
+        self.key = key
+        self.ttl_ms = int(ttl_seconds * 1000)
+        self.token = uuid.uuid4().hex
+        self.held = False
+
+    async def acquire(self) -> bool:
+        self.held = bool(await self.redis.set(self.key, self.token, nx=True, px=self.ttl_ms))
+        return self.held
+
+    async def renew(self) -> bool:
+        self.held = bool(await _RENEW(self.redis, keys=[self.key], args=[self.token, self.ttl_ms]))
+        return self.held
+
+    async def hold(self) -> bool:
+        """Renew if held, otherwise try to take it over. Returns whether it is held now."""
+        if self.held and await self.renew():
+            return True
+        return await self.acquire()
+
+    async def release(self) -> None:
+        if self.held:
+            await _RELEASE(self.redis, keys=[self.key], args=[self.token])
+            self.held = False
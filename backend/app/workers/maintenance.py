@@ -1,5 +1,5 @@
-import asyncio
 import logging
+import time
 
 from redis.asyncio import Redis
 from sqlalchemy import select
@@ -9,7 +9,10 @@ from app.core.config import settings
 from app.core.database import async_session_factory
 from app.models.base import UserTier
 from app.models.user import UserProfile
+from app.services import stock_service
+from app.services.health_service import CELERY_HEARTBEAT_KEY
 from app.workers import celery_app
+from app.workers.runtime import async_task
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +23,28 @@ def cleanup_expired_nonces():
     logger.debug("Nonce cleanup: Redis handles TTL expiry automatically")
 
 
-@celery_app.task(name="app.workers.maintenance.recalculate_tiers")
-def recalculate_tiers():
-    asyncio.get_event_loop().run_until_complete(_recalculate_tiers())
+@async_task(name="app.workers.maintenance.celery_heartbeat")
+async def celery_heartbeat():
+    await _celery_heartbeat()
+
+
+async def _celery_heartbeat():
+    # Expires after three missed beats; the API health check reads it instead of
+    # broadcasting an inspect() to every worker
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        await redis.set(
+            CELERY_HEARTBEAT_KEY,
+            int(time.time()),
+            ex=settings.celery_heartbeat_interval_seconds * 3,
+        )
+    finally:
+        await redis.aclose()
+
+
+@async_task(name="app.workers.maintenance.recalculate_tiers")
+async def recalculate_tiers():
+    await _recalculate_tiers()
 
 
 async def _recalculate_tiers():
@@ -45,3 +67,21 @@ async def _recalculate_tiers():
 
         await db.commit()
         logger.info(f"Tier recalculation: {updated} users updated out of {len(users)}")
+
+
+@async_task(name="app.workers.maintenance.reconcile_hot_stock")
+async def reconcile_hot_stock():
+    if not settings.hot_product_ids:
+        return
+    await _reconcile_hot_stock()
+
+
+async def _reconcile_hot_stock():
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        async with async_session_factory() as db:
+            reconciled = await stock_service.reconcile_hot_stock(db, redis)
+            await db.commit()
+    finally:
+        await redis.aclose()
+    logger.debug(f"Hot stock reconciliation: {reconciled} products written back")
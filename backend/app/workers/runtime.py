@@ -0,0 +1,104 @@
+"""Per-process asyncio runtime for Celery workers.
+
+Each prefork child gets one event loop and one database engine, created after
+the fork in ``worker_process_init``; every task invocation in that process runs
+on the same loop and reuses the same connection pool. Connections inherited
+from the parent are dropped without being closed, so the parent's sockets are
+never shared with a child.
+
+The shared ``async_session_factory`` is rebound to the worker engine in place,
+so services and tasks that import it need no changes. Tasks are declared with
+``async_task``:
+
+    @async_task(name="app.workers.maintenance.recalculate_tiers")
+    async def recalculate_tiers():
+        ...
+"""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Callable, Coroutine
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core import database
+from app.core.config import settings
+from app.workers import celery_app
+
+logger = logging.getLogger(__name__)
+
+_loop: asyncio.AbstractEventLoop | None = None
+_engine: AsyncEngine | None = None
+
+
+def init_process(forked: bool = True) -> None:
+    """Create this process's event loop and engine. Idempotent."""
+    global _loop, _engine
+    if _loop is not None:
+        return
+
+    if forked:
+        # The parent's pool may hold sockets; forget them here without closing
+        database.engine.sync_engine.dispose(close=False)
+
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _engine = database.create_engine(
+        settings.database_url,
+        settings.worker_database_pool_size,
+        settings.worker_database_max_overflow,
+        pool_pre_ping=True,
+    )
+    database.engine = _engine
+    database.async_session_factory.configure(bind=_engine)
+    logger.debug("Worker runtime initialised")
+
+
+def shutdown_process() -> None:
+    global _loop, _engine
+    if _loop is None:
+        return
+    if _engine is not None:
+        _loop.run_until_complete(_engine.dispose())
+    _loop.close()
+    _loop = None
+    _engine = None
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**_) -> None:
+    init_process(forked=True)
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**_) -> None:
+    shutdown_process()
+
+
+def run(coro: Coroutine):
+    """Run a coroutine to completion on this process's loop."""
+    if _loop is None:
+        # Solo/threads pools and eager mode never fork, so no init signal fires
+        init_process(forked=False)
+    return _loop.run_until_complete(coro)
+
+
+def async_task(**options) -> Callable:
+    """Register an ``async def`` as a Celery task that runs on the process loop.
+
+    Options are passed to ``celery_app.task``. The coroutine function stays
+    reachable as ``task.coroutine`` for direct awaiting (tests, other tasks).
+    """
+
+    def decorator(fn: Callable[..., Coroutine]):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return run(fn(*args, **kwargs))
+
+        task = celery_app.task(**options)(wrapper)
+        task.coroutine = fn
+        return task
+
+    return decorator
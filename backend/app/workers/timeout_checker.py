@@ -1,16 +1,18 @@
-import asyncio
 import logging
+from collections import Counter
 from datetime import UTC, datetime, timedelta
 
-from redis import Redis
-from sqlalchemy import select
+from redis.asyncio import Redis
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import metrics
 from app.core.config import settings
 from app.core.database import async_session_factory
 from app.models.base import OrderStatus
 from app.models.order import Order
-from app.workers import celery_app
+from app.services import stock_service
+from app.workers.runtime import async_task
 
 logger = logging.getLogger(__name__)
 
@@ -20,54 +22,73 @@ LOCK_KEY = "lock:timeout_checker"
 LOCK_TTL = 120  # seconds
 
 
-@celery_app.task(name="app.workers.timeout_checker.check_timeouts")
-def check_timeouts():
+@async_task(name="app.workers.timeout_checker.check_timeouts")
+async def check_timeouts():
     redis = Redis.from_url(settings.redis_url)
-    acquired = redis.set(LOCK_KEY, "1", nx=True, ex=LOCK_TTL)
-    if not acquired:
-        logger.info("Timeout checker already running on another worker, skipping")
-        return
     try:
-        asyncio.get_event_loop().run_until_complete(_check_timeouts())
+        acquired = await redis.set(LOCK_KEY, "1", nx=True, ex=LOCK_TTL)
+        if not acquired:
+            logger.info("Timeout checker already running on another worker, skipping")
+            return
+        try:
+            await _check_timeouts()
+        finally:
+            await redis.delete(LOCK_KEY)
     finally:
-        redis.delete(LOCK_KEY)
+        await redis.aclose()
 
 
 async def _check_timeouts():
     now = datetime.now(UTC)
+    redis = Redis.from_url(settings.redis_url)
 
-    async with async_session_factory() as db:
-        # Seller timeout: Created orders older than 24h
-        cutoff_seller = now - SELLER_TIMEOUT
-        result = await db.execute(
-            select(Order).where(
-                Order.status == OrderStatus.CREATED,
-                Order.created_at < cutoff_seller,
+    try:
+        async with async_session_factory() as db:
+            # Seller timeout: Created orders older than 24h. The status check is part of
+            # the UPDATE, so an order the buyer cancelled meanwhile is left alone.
+            cutoff_seller = now - SELLER_TIMEOUT
+            result = await db.execute(
+                update(Order)
+                .where(Order.status == OrderStatus.CREATED, Order.created_at < cutoff_seller)
+                .values(status=OrderStatus.EXPIRED)
+                .returning(Order.id, Order.product_id)
             )
-        )
-        expired_orders = result.scalars().all()
-        for order in expired_orders:
-            order.status = OrderStatus.EXPIRED
-            logger.info(f"Order {order.id} expired (seller timeout)")
+            expired_orders = result.all()
+            for order in expired_orders:
+                logger.info(f"Order {order.id} expired (seller timeout)")
+
+            # Only the orders this UPDATE expired give their stock reservation back
+            released = Counter(order.product_id for order in expired_orders)
+            hot_redis = redis if settings.hot_product_ids else None
+            for product_id, quantity in released.items():
+                await stock_service.release_stock(product_id, db, hot_redis, quantity=quantity)
 
-        # Buyer timeout: SellerConfirmed orders older than 72h
-        cutoff_buyer = now - CONFIRM_WINDOW
-        result = await db.execute(
-            select(Order).where(
-                Order.status == OrderStatus.SELLER_CONFIRMED,
-                Order.seller_confirmed_at < cutoff_buyer,
+            # Buyer timeout: SellerConfirmed orders older than 72h
+            cutoff_buyer = now - CONFIRM_WINDOW
+            result = await db.execute(
+                update(Order)
+                .where(
+                    Order.status == OrderStatus.SELLER_CONFIRMED,
+                    Order.seller_confirmed_at < cutoff_buyer,
+                )
+                .values(status=OrderStatus.COMPLETED, completed_at=now)
+                .returning(Order.id)
             )
-        )
-        auto_release_orders = result.scalars().all()
-        for order in auto_release_orders:
-            order.status = OrderStatus.COMPLETED
-            order.completed_at = now
-            logger.info(f"Order {order.id} auto-released to seller (buyer timeout)")
+            auto_release_orders = result.all()
+            for order in auto_release_orders:
+                logger.info(f"Order {order.id} auto-released to seller (buyer timeout)")
 
-        await db.commit()
+            await db.commit()
 
-        if expired_orders or auto_release_orders:
-            logger.info(
-                f"Timeouts processed: {len(expired_orders)} expired, "
-                f"{len(auto_release_orders)} auto-released"
+        for kind, batch in (("expired", expired_orders), ("auto_released", auto_release_orders)):
+            await metrics.observe_worker_histogram(
+                redis, "timeout_checker_batch_size", kind, len(batch)
             )
+    finally:
+        await redis.aclose()
+
+    if expired_orders or auto_release_orders:
+        logger.info(
+            f"Timeouts processed: {len(expired_orders)} expired, "
+            f"{len(auto_release_orders)} auto-released"
+        )
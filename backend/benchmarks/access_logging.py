@@ -0,0 +1,116 @@
+"""Benchmark: event-loop blocking caused by access logging.
+
+Simulates request handlers emitting one access record each while a probe task
+measures event-loop lag. ``sync`` attaches the stdout handler directly (the old
+``logging.basicConfig`` setup); ``queue`` uses the QueueHandler/QueueListener
+pipeline from ``app.core.logging_config``. The sink sleeps ``--write-latency-ms``
+per write to stand in for a slow stdout pipe (log driver back-pressure). Runs
+without external services:
+
+    cd backend
+    python -m benchmarks.access_logging --requests 20000 --write-latency-ms 0.2
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import queue
+import statistics
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.logging_config import JsonFormatter
+
+
+class SlowSink(io.StringIO):
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def write(self, s: str) -> int:
+        time.sleep(self.latency)
+        return len(s)
+
+
+async def _lag_probe(samples: list[float], stop: asyncio.Event, interval: float = 0.001) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _requests(logger: logging.Logger, count: int, concurrency: int, blocked: list[float]) -> None:
+    async def handler(i: int) -> None:
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        logger.info(
+            "GET /orders/%d 200 3.1ms",
+            i,
+            extra={
+                "request_id": f"req-{i}",
+                "route": "/orders/{order_id}",
+                "status": 200,
+                "duration_ms": 3.1,
+                "db_ms": 1.2,
+            },
+        )
+        blocked.append(time.perf_counter() - started)
+
+    for start in range(0, count, concurrency):
+        await asyncio.gather(*(handler(i) for i in range(start, min(start + concurrency, count))))
+
+
+async def run(mode: str, count: int, concurrency: int, latency: float) -> None:
+    handler = logging.StreamHandler(SlowSink(latency))
+    handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger(f"bench.{mode}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    listener = None
+    if mode == "queue":
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        logger.handlers[:] = [QueueHandler(log_queue)]
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+    else:
+        logger.handlers[:] = [handler]
+
+    lag: list[float] = []
+    blocked: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_lag_probe(lag, stop))
+    started = time.perf_counter()
+    await _requests(logger, count, concurrency, blocked)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    if listener is not None:
+        listener.stop()
+
+    lag.sort()
+    p99 = lag[int(len(lag) * 0.99) - 1] if lag else 0.0
+    print(
+        f"{mode:<5} requests={count} elapsed={elapsed:.2f}s "
+        f"loop_blocked_in_logging={sum(blocked) * 1000:,.0f}ms "
+        f"mean_call={statistics.fmean(blocked) * 1e6:.1f}us "
+        f"loop_lag_p99={p99 * 1000:.2f}ms loop_lag_max={(lag[-1] if lag else 0) * 1000:.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["sync", "queue", "all"], default="all")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--write-latency-ms", type=float, default=0.2)
+    args = parser.parse_args()
+
+    modes = ["sync", "queue"] if args.mode == "all" else [args.mode]
+    for mode in modes:
+        asyncio.run(run(mode, args.requests, args.concurrency, args.write_latency_ms / 1000))
+
+
+if __name__ == "__main__":
+    main()
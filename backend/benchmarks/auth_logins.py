@@ -0,0 +1,99 @@
+"""Load test: sustained nonce issue + verify cycles per second against Redis.
+
+Each simulated login requests a nonce and then consumes it, as ``/auth/nonce``
+followed by ``/auth/verify`` would. ``legacy`` is the previous SET / GETDEL path
+with the age check in Python; ``lua`` uses the EVALSHA scripts in
+``auth_service``. ``--with-signatures`` also signs each message and recovers it
+through the signature pool, which makes the run CPU-bound. Needs the Redis in
+``backend/.env``; no database is touched:
+
+    cd backend
+    python -m benchmarks.auth_logins --concurrency 200 --duration 10
+    python -m benchmarks.auth_logins --mode lua --with-signatures
+"""
+
+import argparse
+import asyncio
+import secrets
+import time
+from datetime import datetime
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.services import auth_service, signature_service
+
+
+async def _login_legacy(redis: Redis, wallet: str) -> str:
+    nonce = secrets.token_hex(16)
+    timestamp = int(datetime.now().timestamp())
+    key = f"{auth_service.NONCE_PREFIX}{wallet}"
+    await redis.set(key, f"{nonce}:{timestamp}", ex=auth_service.NONCE_TTL)
+
+    stored = await redis.getdel(key)
+    nonce, timestamp = stored.decode().split(":")
+    if int(datetime.now().timestamp()) - int(timestamp) > auth_service.NONCE_TTL:
+        raise ValueError("NONCE_EXPIRED")
+    return f"P2P-Auth-{timestamp}-{nonce}"
+
+
+async def _login_lua(redis: Redis, wallet: str) -> str:
+    await auth_service.generate_nonce(wallet, redis)
+    consumed = await auth_service._CONSUME_NONCE(
+        redis, keys=[f"{auth_service.NONCE_PREFIX}{wallet}"], args=[auth_service.NONCE_TTL]
+    )
+    return auth_service._nonce_message(consumed)
+
+
+async def _client(redis: Redis, login, deadline: float, account, with_signatures: bool) -> int:
+    wallet = account.address.lower()
+    done = 0
+    while time.perf_counter() < deadline:
+        message = await login(redis, wallet)
+        if with_signatures:
+            signature = account.sign_message(encode_defunct(text=message)).signature.hex()
+            assert await signature_service.recover(message, signature) == wallet
+        done += 1
+    return done
+
+
+async def run(mode: str, concurrency: int, duration: float, with_signatures: bool) -> None:
+    redis = Redis.from_url(settings.redis_url, max_connections=concurrency)
+    # Each simulated wallet logs in back to back; keep the per-wallet limit out of the way
+    settings.auth_nonce_issue_limit = 1 << 30
+    login = _login_legacy if mode == "legacy" else _login_lua
+    accounts = [Account.create() for _ in range(concurrency)]
+    try:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        counts = await asyncio.gather(
+            *(_client(redis, login, deadline, a, with_signatures) for a in accounts)
+        )
+        elapsed = time.perf_counter() - started
+        total = sum(counts)
+        print(
+            f"{mode:<6} concurrency={concurrency} signatures={with_signatures} "
+            f"logins={total} elapsed={elapsed:.2f}s rate={total / elapsed:,.0f} logins/s"
+        )
+    finally:
+        await redis.aclose()
+        signature_service.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["legacy", "lua", "all"], default="all")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--with-signatures", action="store_true")
+    args = parser.parse_args()
+
+    modes = ["legacy", "lua"] if args.mode == "all" else [args.mode]
+    for mode in modes:
+        asyncio.run(run(mode, args.concurrency, args.duration, args.with_signatures))
+
+
+if __name__ == "__main__":
+    main()
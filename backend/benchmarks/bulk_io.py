@@ -0,0 +1,217 @@
+"""Benchmark: bulk listing import and order export at 100k rows.
+
+Import compares one INSERT + commit per listing (what N calls to ``POST /products``
+cost the database), multi-row INSERTs in ``BULK_BATCH_SIZE`` batches, and the
+``POST /products/bulk`` path (NDJSON parsed and validated as it streams in,
+written with COPY). Export compares paging ``GET /orders`` 100 rows at a time
+with the ``GET /orders/export`` server-side cursor, and reports rows/s and the
+growth of the process's peak RSS. Needs a migrated PostgreSQL database:
+
+    cd backend
+    python -m benchmarks.bulk_io --rows 100000
+    python -m benchmarks.bulk_io --mode export --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import secrets
+import time
+from decimal import Decimal
+
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models.base import OrderStatus, ProductCategory, TokenType
+from app.models.order import Order
+from app.models.product import Product
+from app.models.user import UserProfile
+from app.schemas.order import OrderListParams, OrderResponse
+from app.schemas.product import ProductCreate
+from app.services import order_service, product_service
+
+PRODUCT_HASH = "0x" + "0" * 64
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _report(name: str, rows: int, elapsed: float, rss_before: float | None = None) -> None:
+    line = f"{name:<16} rows={rows} elapsed={elapsed:.2f}s throughput={rows / elapsed:,.0f} rows/s"
+    if rss_before is not None:
+        line += f" peak_rss_growth={_peak_rss_mb() - rss_before:.1f}MB"
+    print(line, flush=True)
+
+
+def _listing(i: int) -> dict:
+    return {
+        "title_preview": f"bench listing {i}",
+        "description_preview": "bulk import benchmark",
+        "category": "tools",
+        "price_usdt": "1.5",
+        "stock": 10,
+        "product_hash": PRODUCT_HASH,
+    }
+
+
+async def _import_per_row(factory, seller: str, rows: int) -> None:
+    for i in range(rows):
+        async with factory() as db:
+            await product_service.create_product(seller, ProductCreate(**_listing(i)), db)
+            await db.commit()
+
+
+async def _import_multi_row(factory, seller: str, rows: int) -> None:
+    async with factory() as db:
+        batch = []
+        for i in range(rows):
+            batch.append(product_service._bulk_row(seller, ProductCreate(**_listing(i))))
+            if len(batch) == product_service.BULK_BATCH_SIZE:
+                await db.execute(insert(Product), batch)
+                batch = []
+        if batch:
+            await db.execute(insert(Product), batch)
+        await db.commit()
+
+
+async def _import_copy(factory, seller: str, rows: int) -> None:
+    async def body():
+        # ~64 KiB network-sized chunks, as the ASGI server would deliver them
+        chunk = []
+        for i in range(rows):
+            chunk.append(json.dumps(_listing(i)))
+            if len(chunk) == 400:
+                yield ("\n".join(chunk) + "\n").encode()
+                chunk = []
+        if chunk:
+            yield "\n".join(chunk).encode()
+
+    async with factory() as db:
+        created, errors = await product_service.bulk_create_products(
+            seller, product_service.parse_ndjson(body()), db, max_rows=rows
+        )
+        assert created == rows and not errors, errors[:1]
+        await db.commit()
+
+
+async def run_import(factory, seller: str, rows: int, per_row_rows: int) -> None:
+    modes = [
+        ("per-row", _import_per_row, min(rows, per_row_rows)),
+        ("multi-row", _import_multi_row, rows),
+        ("copy", _import_copy, rows),
+    ]
+    for name, func, count in modes:
+        started = time.perf_counter()
+        await func(factory, seller, count)
+        _report(f"import {name}", count, time.perf_counter() - started)
+        async with factory() as db:
+            await db.execute(delete(Product).where(Product.seller_wallet == seller))
+            await db.commit()
+
+
+async def _seed_orders(factory, buyer: str, seller: str, rows: int) -> None:
+    async with factory() as db:
+        product = Product(
+            seller_wallet=seller,
+            title_preview="bench",
+            category=ProductCategory.OTHER,
+            price_usdt=Decimal("1"),
+            stock=0,
+            product_hash=PRODUCT_HASH,
+        )
+        db.add(product)
+        await db.flush()
+        for start in range(0, rows, product_service.BULK_BATCH_SIZE):
+            batch = [
+                {
+                    "buyer_wallet": buyer,
+                    "seller_wallet": seller,
+                    "product_id": product.id,
+                    "token": TokenType.USDT,
+                    "amount": Decimal("1"),
+                    "platform_fee": Decimal("0.02"),
+                    "status": OrderStatus.COMPLETED,
+                    "tx_hash_create": "0x" + secrets.token_hex(32),
+                }
+                for _ in range(start, min(start + product_service.BULK_BATCH_SIZE, rows))
+            ]
+            await db.execute(insert(Order), batch)
+        await db.commit()
+
+
+async def _export_paged(factory, buyer: str) -> int:
+    exported = 0
+    page = 1
+    while True:
+        async with factory() as db:
+            params = OrderListParams(page=page, page_size=100, role="buyer")
+            orders, _ = await order_service.list_orders(buyer, params, db)
+        if not orders:
+            return exported
+        body = "".join(OrderResponse.model_validate(o).model_dump_json() + "\n" for o in orders)
+        exported += body.count("\n")
+        page += 1
+
+
+async def _export_stream(factory, buyer: str, batch_size: int) -> int:
+    exported = 0
+    async with factory() as db:
+        async for orders in order_service.export_orders(buyer, db, "buyer", batch_size=batch_size):
+            body = "".join(OrderResponse.model_validate(o).model_dump_json() + "\n" for o in orders)
+            exported += body.count("\n")
+    return exported
+
+
+async def run_export(factory, buyer: str, seller: str, rows: int, batch_size: int) -> None:
+    await _seed_orders(factory, buyer, seller, rows)
+    # Streaming first, so its peak RSS is not masked by the paged run
+    for name, export in (
+        ("stream", lambda: _export_stream(factory, buyer, batch_size)),
+        ("paged", lambda: _export_paged(factory, buyer)),
+    ):
+        rss_before = _peak_rss_mb()
+        started = time.perf_counter()
+        exported = await export()
+        _report(f"export {name}", exported, time.perf_counter() - started, rss_before)
+
+
+async def run(mode: str, rows: int, per_row_rows: int, batch_size: int) -> None:
+    engine = create_async_engine(settings.database_url)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    buyer = "0x" + secrets.token_hex(20)
+    seller = "0x" + secrets.token_hex(20)
+    async with factory() as db:
+        db.add_all([UserProfile(wallet=w, public_key="bench") for w in (buyer, seller)])
+        await db.commit()
+
+    try:
+        if mode in ("import", "all"):
+            await run_import(factory, seller, rows, per_row_rows)
+        if mode in ("export", "all"):
+            await run_export(factory, buyer, seller, rows, batch_size)
+    finally:
+        async with factory() as db:
+            await db.execute(delete(Order).where(Order.seller_wallet == seller))
+            await db.execute(delete(Product).where(Product.seller_wallet == seller))
+            await db.execute(delete(UserProfile).where(UserProfile.wallet.in_([buyer, seller])))
+            await db.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["import", "export", "all"], default="all")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--per-row-rows", type=int, default=5_000, help="rows for the (slow) one-commit-per-row import"
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.export_batch_size)
+    args = parser.parse_args()
+    asyncio.run(run(args.mode, args.rows, args.per_row_rows, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
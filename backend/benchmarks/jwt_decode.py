@@ -0,0 +1,51 @@
+"""Benchmark: JWT decodes per second, with and without the verified-token cache.
+
+``uncached`` runs the full signature check on every call (the pre-cache path);
+``cached`` goes through ``decode_access_token`` with a warm LRU. Runs without any
+external services:
+
+    cd backend
+    python -m benchmarks.jwt_decode --iterations 100000
+    python -m benchmarks.jwt_decode --backend pyjwt --tokens 5000
+"""
+
+import argparse
+import secrets
+import time
+
+from app.core import security
+from app.core.config import settings
+
+
+def _rate(fn, tokens: list[str], iterations: int) -> float:
+    n = len(tokens)
+    started = time.perf_counter()
+    for i in range(iterations):
+        fn(tokens[i % n])
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--tokens", type=int, default=1_000, help="distinct tokens cycled through")
+    parser.add_argument("--backend", choices=["jose", "pyjwt"], default=settings.jwt_backend)
+    args = parser.parse_args()
+
+    security._verify = security._DECODERS[args.backend]
+    tokens = [security.create_access_token("0x" + secrets.token_hex(20))[0] for _ in range(args.tokens)]
+
+    uncached = _rate(security._verify, tokens, args.iterations)
+
+    security.token_cache.clear()
+    for token in tokens:
+        security.decode_access_token(token)
+    cached = _rate(security.decode_access_token, tokens, args.iterations)
+
+    print(f"backend={args.backend} tokens={args.tokens} iterations={args.iterations}")
+    print(f"uncached {uncached:>12,.0f} decodes/s")
+    print(f"cached   {cached:>12,.0f} decodes/s  ({cached / uncached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: encoding a page of 100 ``OrderResponse``s.
+
+Compares the old route body (``OrderResponse.model_validate`` per item into a
+``PaginatedResponse``, then FastAPI's ``response_model`` validation,
+``jsonable_encoder`` and ``JSONResponse``) with ``app.core.responses``. The fast
+path validates once from attributes and dumps straight to bytes. Both run on the
+same transient ``Order`` objects, so no database is needed:
+
+    cd backend
+    python -m benchmarks.response_serialization --iterations 2000
+    python -m benchmarks.response_serialization --page-size 20
+"""
+
+import argparse
+import asyncio
+import secrets
+import time
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import paginated_response
+from app.models import dispute, message, product, review, user  # noqa: F401  (registers mappers)
+from app.models.base import ChainType, OrderStatus, TokenType
+from app.models.order import Order
+from app.schemas.common import PaginatedResponse
+from app.schemas.order import OrderResponse
+
+
+def _orders(count: int) -> list[Order]:
+    now = datetime.now(UTC)
+    return [
+        Order(
+            id=uuid.uuid4(),
+            onchain_order_id=i,
+            chain=ChainType.BSC,
+            buyer_wallet="0x" + secrets.token_hex(20),
+            seller_wallet="0x" + secrets.token_hex(20),
+            arbitrator_wallet=None,
+            product_id=uuid.uuid4(),
+            token=TokenType.USDT,
+            amount=Decimal("125.500000"),
+            platform_fee=Decimal("2.510000"),
+            status=OrderStatus.SELLER_CONFIRMED,
+            product_key_encrypted="k" * 256,
+            tx_hash_create="0x" + secrets.token_hex(32),
+            tx_hash_complete=None,
+            seller_confirmed_at=now,
+            dispute_opened_at=None,
+            dispute_deadline=None,
+            completed_at=None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+async def _fastapi_path(field, orders: list[Order]) -> bytes:
+    page = PaginatedResponse(
+        items=[OrderResponse.model_validate(o) for o in orders],
+        total=len(orders),
+        page=1,
+        page_size=len(orders),
+        total_pages=1,
+    )
+    content = await serialize_response(field=field, response_content=page)
+    return JSONResponse(content).body
+
+
+async def _fast_path(field, orders: list[Order]) -> bytes:
+    return paginated_response(OrderResponse, orders, len(orders), 1, len(orders)).body
+
+
+async def run(iterations: int, page_size: int) -> None:
+    orders = _orders(page_size)
+    field = create_model_field("response", PaginatedResponse[OrderResponse], mode="serialization")
+    for name, encode in (("fastapi", _fastapi_path), ("fast-path", _fast_path)):
+        body = await encode(field, orders)  # warm up caches
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await encode(field, orders)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:<10} page_size={page_size} iterations={iterations} "
+            f"per_page={elapsed / iterations * 1e6:,.0f}us "
+            f"throughput={iterations / elapsed:,.0f} pages/s body={len(body)}B"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.page_size))
+
+
+if __name__ == "__main__":
+    main()
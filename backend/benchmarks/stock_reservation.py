@@ -0,0 +1,120 @@
+"""Benchmark: N concurrent buyers reserving stock on a single product.
+
+Compares the old read-check-write path (``naive``), the atomic conditional UPDATE
+(``atomic``) and the Redis-counted hot-product path (``redis``). Reports throughput
+and whether the product was oversold. Needs a migrated PostgreSQL database (and
+Redis for the ``redis`` mode):
+
+    cd backend
+    python -m benchmarks.stock_reservation --buyers 1000 --stock 100
+    python -m benchmarks.stock_reservation --mode atomic --pool-size 50
+"""
+
+import argparse
+import asyncio
+import secrets
+import time
+from decimal import Decimal
+
+from redis.asyncio import Redis
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models.base import ProductCategory
+from app.models.product import Product
+from app.models.user import UserProfile
+from app.services import stock_service
+
+
+async def _buy_naive(factory, product_id) -> bool:
+    async with factory() as db:
+        product = (await db.execute(select(Product).where(Product.id == product_id))).scalar_one()
+        if product.stock <= 0:
+            return False
+        product.stock -= 1
+        await db.commit()
+        return True
+
+
+async def _buy_atomic(factory, product_id, redis=None) -> bool:
+    async with factory() as db:
+        try:
+            await stock_service.reserve_stock(product_id, db, redis)
+        except ValueError:
+            return False
+        await db.commit()
+        return True
+
+
+async def run(mode: str, buyers: int, stock: int, pool_size: int) -> None:
+    engine = create_async_engine(settings.database_url, pool_size=pool_size, max_overflow=0)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    redis = Redis.from_url(settings.redis_url) if mode == "redis" else None
+
+    seller = "0x" + secrets.token_hex(20)
+    async with factory() as db:
+        db.add(UserProfile(wallet=seller, public_key="bench"))
+        product = Product(
+            seller_wallet=seller,
+            title_preview="bench",
+            category=ProductCategory.OTHER,
+            price_usdt=Decimal("1"),
+            stock=stock,
+            product_hash="0x" + "0" * 64,
+        )
+        db.add(product)
+        await db.commit()
+    product_id = product.id
+    if redis is not None:
+        settings.hot_product_ids = [str(product_id)]
+
+    if mode == "naive":
+        buy = lambda: _buy_naive(factory, product_id)  # noqa: E731
+    else:
+        buy = lambda: _buy_atomic(factory, product_id, redis)  # noqa: E731
+
+    try:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(buy() for _ in range(buyers)))
+        elapsed = time.perf_counter() - started
+
+        if redis is not None:
+            async with factory() as db:
+                await stock_service.reconcile_hot_stock(db, redis)
+                await db.commit()
+        async with factory() as db:
+            final = (await db.execute(select(Product.stock).where(Product.id == product_id))).scalar_one()
+
+        sold = sum(results)
+        print(
+            f"{mode:<7} buyers={buyers} stock={stock} pool={pool_size} "
+            f"elapsed={elapsed:.3f}s throughput={buyers / elapsed:,.0f} req/s "
+            f"sold={sold} final_stock={final} oversold={max(0, sold - stock)}"
+        )
+    finally:
+        async with factory() as db:
+            await db.execute(delete(Product).where(Product.id == product_id))
+            await db.execute(delete(UserProfile).where(UserProfile.wallet == seller))
+            await db.commit()
+        if redis is not None:
+            await redis.delete(f"{stock_service.STOCK_KEY_PREFIX}{product_id}")
+            await redis.aclose()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["naive", "atomic", "redis", "all"], default="all")
+    parser.add_argument("--buyers", type=int, default=1000)
+    parser.add_argument("--stock", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+
+    modes = ["naive", "atomic", "redis"] if args.mode == "all" else [args.mode]
+    for mode in modes:
+        asyncio.run(run(mode, args.buyers, args.stock, args.pool_size))
+
+
+if __name__ == "__main__":
+    main()
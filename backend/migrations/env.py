@@ -9,7 +9,7 @@ from app.core.config import settings
 from app.models.base import Base
 
 # Import all models so Base.metadata has them
-from app.models import arbitrator, blacklist, dispute, event_sync, message, order, product, review, user  # noqa: F401
+from app.models import arbitrator, blacklist, chain_event, dispute, event_sync, message, order, product, review, user  # noqa: F401
 
 config = context.config
 config.set_main_option("sqlalchemy.url", settings.database_url)
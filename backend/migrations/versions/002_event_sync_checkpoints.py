@@ -0,0 +1,29 @@
+"""Block-hash checkpoints on event_sync_cursor for reorg detection.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "event_sync_cursor",
+        sa.Column("checkpoints", postgresql.JSONB, nullable=False, server_default=sa.text("'[]'::jsonb")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("event_sync_cursor", "checkpoints")
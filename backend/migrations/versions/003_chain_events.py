@@ -0,0 +1,40 @@
+"""chain_events: append-only journal of escrow logs.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+chain_type = postgresql.ENUM("bsc", "ethereum", "arbitrum", "base", name="chain_type", create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chain_events",
+        sa.Column("chain", chain_type, primary_key=True),
+        sa.Column("tx_hash", sa.String(66), primary_key=True),
+        sa.Column("log_index", sa.Integer, primary_key=True),
+        sa.Column("block_number", sa.BigInteger, nullable=False),
+        sa.Column("block_hash", sa.String(66), nullable=False),
+        sa.Column("event", sa.String(32), nullable=False),
+        sa.Column("args", postgresql.JSONB, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+    op.create_index("ix_chain_events_chain_block", "chain_events", ["chain", "block_number", "log_index"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chain_events_chain_block", table_name="chain_events")
+    op.drop_table("chain_events")
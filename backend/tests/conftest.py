@@ -1,5 +1,6 @@
 import uuid
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from decimal import Decimal
 
 import fakeredis.aioredis
@@ -18,6 +19,7 @@ from app.models.base import (
     TokenType,
     UserTier,
 )
+from app.models.blacklist import Blacklist  # noqa: F401  (registers the table)
 from app.models.dispute import DisputeEvidence
 from app.models.message import Message
 from app.models.order import Order
@@ -25,6 +27,8 @@ from app.models.product import Product
 from app.models.review import Review
 from app.models.user import UserProfile
 
+pytest_plugins = ["tests.query_budget"]
+
 # --- Constants ---
 BUYER_WALLET = "0x" + "a" * 40
 SELLER_WALLET = "0x" + "b" * 40
@@ -67,12 +71,24 @@ async def redis_client():
     await redis.aclose()
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def blacklist_snapshot(redis_client):
+    """Start every test from an empty blacklist snapshot that matches redis_client."""
+    from app.services.blacklist_service import BLACKLIST_VERSION_KEY
+    from app.services.blacklist_service import blacklist_snapshot as snapshot
+
+    await redis_client.set(BLACKLIST_VERSION_KEY, b"test")
+    snapshot.replace([], b"test")
+    yield snapshot
+    snapshot.invalidate()
+
+
 @pytest_asyncio.fixture
 async def client(
-    db_session: AsyncSession, redis_client
+    db_session: AsyncSession, redis_client, query_budget
 ) -> AsyncGenerator[AsyncClient, None]:
     from app.api.auth import get_redis
-    from app.core.database import get_db
+    from app.core.database import get_db, get_session_factory
     from app.main import app
 
     async def override_get_db():
@@ -81,11 +97,16 @@ async def client(
     async def override_get_redis():
         yield redis_client
 
+    @asynccontextmanager
+    async def shared_session():
+        yield db_session
+
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_redis] = override_get_redis
+    app.dependency_overrides[get_session_factory] = lambda: shared_session
 
     async with AsyncClient(
-        transport=ASGITransport(app=app),
+        transport=ASGITransport(app=query_budget.wrap(app)),
         base_url="http://test",
     ) as ac:
         yield ac
@@ -0,0 +1,44 @@
+import logging
+
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def access_log(caplog):
+    caplog.set_level(logging.INFO, logger="p2p.access")
+    return caplog
+
+
+def _access_records(caplog):
+    return [r for r in caplog.records if r.name == "p2p.access"]
+
+
+async def test_access_record_fields(client, sample_product, access_log):
+    resp = await client.get(f"/products/{sample_product.id}", headers={"X-Request-ID": "req-1"})
+    assert resp.status_code == 200
+
+    [record] = _access_records(access_log)
+    assert record.request_id == "req-1"
+    assert record.route == "/products/{product_id}"
+    assert record.status == 200
+    assert record.duration_ms >= record.db_ms >= 0
+    assert record.db_statements == 1
+
+
+async def test_successful_requests_sampled(client, sample_product, access_log, monkeypatch):
+    monkeypatch.setattr(settings, "access_log_sample_rate", 0.0)
+
+    await client.get(f"/products/{sample_product.id}")
+    assert _access_records(access_log) == []
+
+    # Errors are always logged
+    await client.get("/products/00000000-0000-0000-0000-000000000000")
+    [record] = _access_records(access_log)
+    assert record.status == 404
+
+
+async def test_probes_not_logged(client, access_log):
+    await client.get("/livez")
+    assert _access_records(access_log) == []
@@ -93,3 +93,17 @@ async def test_verify_invalid_signature(client):
     )
     assert resp.status_code == 401
     assert resp.json()["detail"] == "INVALID_SIGNATURE"
+
+
+async def test_revoked_token_rejected(client, buyer_headers, redis_client):
+    from app.core.security import revoke_access_token
+
+    resp = await client.get("/orders", headers=buyer_headers)
+    assert resp.status_code == 200
+
+    token = buyer_headers["Authorization"].removeprefix("Bearer ")
+    await revoke_access_token(token, redis_client)
+
+    resp = await client.get("/orders", headers=buyer_headers)
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "UNAUTHORIZED"
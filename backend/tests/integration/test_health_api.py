@@ -4,3 +4,29 @@ async def test_health_endpoint(client):
     data = resp.json()
     assert data["status"] in ("ok", "degraded")
     assert "checks" in data
+
+
+async def test_livez(client):
+    resp = await client.get("/livez")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+async def test_readyz(client):
+    resp = await client.get("/readyz")
+    assert resp.status_code in (200, 503)
+    data = resp.json()
+    assert set(data["checks"]) == {"api", "database", "redis", "celery"}
+    assert (resp.status_code == 200) == (data["status"] == "ok")
+
+
+async def test_metrics_exposition(client, sample_product):
+    await client.get(f"/products/{sample_product.id}")
+
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'route="/products/{product_id}"' in body
+    assert "p2p_db_pool_checked_out" in body
+    assert "p2p_timeout_checker_batch_size" in body
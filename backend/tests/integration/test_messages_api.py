@@ -1,5 +1,8 @@
 import uuid
+from datetime import UTC, datetime, timedelta
 
+from app.core.config import settings
+from app.models.message import Message
 from tests.conftest import BUYER_WALLET, SELLER_WALLET
 
 
@@ -88,3 +91,49 @@ async def test_send_message_unauthenticated(client, sample_order):
         json={"ciphertext": "text", "nonce": "n"},
     )
     assert resp.status_code == 403
+
+
+async def test_export_messages_streams_whole_chat(
+    client, arbitrator_headers, disputed_order, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "export_batch_size", 40)
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    db_session.add_all(
+        Message(
+            order_id=disputed_order.id,
+            sender_wallet=BUYER_WALLET if i % 2 else SELLER_WALLET,
+            ciphertext=f"ct{i}",
+            nonce="n",
+            created_at=base + timedelta(seconds=i),
+        )
+        for i in range(150)
+    )
+    await db_session.flush()
+
+    resp = await client.get(
+        f"/orders/{disputed_order.id}/messages/export", headers=arbitrator_headers
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert [m["ciphertext"] for m in resp.json()] == [f"ct{i}" for i in range(150)]
+
+    resp = await client.get(
+        f"/orders/{disputed_order.id}/messages/export?format=ndjson", headers=arbitrator_headers
+    )
+    assert len(resp.text.splitlines()) == 150
+
+
+async def test_export_messages_checks_access(
+    client, buyer_headers, arbitrator_headers, sample_order
+):
+    resp = await client.get(f"/orders/{sample_order.id}/messages/export", headers=buyer_headers)
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+    resp = await client.get(
+        f"/orders/{sample_order.id}/messages/export", headers=arbitrator_headers
+    )
+    assert resp.status_code == 403
+
+    resp = await client.get(f"/orders/{uuid.uuid4()}/messages/export", headers=buyer_headers)
+    assert resp.status_code == 404
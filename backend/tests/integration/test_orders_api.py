@@ -1,5 +1,9 @@
+import json
 import uuid
+from decimal import Decimal
 
+from app.models.base import OrderStatus
+from app.models.order import Order
 from tests.conftest import BUYER_WALLET, DEFAULT_TX_HASH, SELLER_WALLET
 
 
@@ -167,3 +171,46 @@ async def test_open_dispute_not_party(client, sample_order):
         json={"evidence_hash": "QmHash", "evidence_type": "other"},
     )
     assert resp.status_code in (401, 403)
+
+
+async def test_export_orders_streams_ndjson(
+    client, buyer_headers, seller_headers, sample_order, db_session
+):
+    second = Order(
+        buyer_wallet=sample_order.buyer_wallet,
+        seller_wallet=sample_order.seller_wallet,
+        product_id=sample_order.product_id,
+        token=sample_order.token,
+        amount=Decimal("5"),
+        platform_fee=Decimal("0.1"),
+        tx_hash_create="0x" + "1" * 64,
+        status=OrderStatus.COMPLETED,
+    )
+    db_session.add(second)
+    await db_session.flush()
+
+    resp = await client.get("/orders/export", headers=buyer_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert {row["id"] for row in rows} == {str(sample_order.id), str(second.id)}
+
+    resp = await client.get("/orders/export?status=completed&role=seller", headers=seller_headers)
+    assert [json.loads(line)["id"] for line in resp.text.splitlines()] == [str(second.id)]
+
+    resp = await client.get("/orders/export?role=seller", headers=buyer_headers)
+    assert resp.text == ""
+
+    resp = await client.get("/orders/export?format=json&status=created", headers=buyer_headers)
+    assert resp.headers["content-type"] == "application/json"
+    assert [row["id"] for row in resp.json()] == [str(sample_order.id)]
+
+
+async def test_list_orders_includes_product_key_on_request(
+    client, buyer_headers, confirmed_order
+):
+    resp = await client.get("/orders", headers=buyer_headers)
+    assert resp.json()["items"][0]["product_key_encrypted"] is None
+
+    resp = await client.get("/orders?include_key=true", headers=buyer_headers)
+    assert resp.json()["items"][0]["product_key_encrypted"] == "encrypted_key_data"
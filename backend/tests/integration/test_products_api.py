@@ -1,5 +1,7 @@
+import json
 import uuid
 
+from app.core.config import settings
 from tests.conftest import DEFAULT_PRODUCT_HASH, SELLER_WALLET
 
 
@@ -145,3 +147,80 @@ async def test_delete_product_not_owner(client, buyer_headers, sample_product):
         headers=buyer_headers,
     )
     assert resp.status_code == 403
+
+
+def _listing(i: int) -> dict:
+    return {
+        "title_preview": f"Listing {i}",
+        "category": "tools",
+        "price_usdt": "1.5",
+        "stock": i,
+        "product_hash": DEFAULT_PRODUCT_HASH,
+    }
+
+
+async def test_bulk_create_products_ndjson(client, seller_headers):
+    body = "\n".join(json.dumps(_listing(i)) for i in range(1, 4)) + "\n\n"
+    resp = await client.post(
+        "/products/bulk",
+        headers={**seller_headers, "Content-Type": "application/x-ndjson"},
+        content=body,
+    )
+    assert resp.status_code == 201
+    assert resp.json() == {"created": 3}
+
+    resp = await client.get("/products?category=tools")
+    items = resp.json()["items"]
+    assert sorted(item["stock"] for item in items) == [1, 2, 3]
+    assert {(item["seller_wallet"], item["status"]) for item in items} == {(SELLER_WALLET, "active")}
+
+
+async def test_bulk_create_products_csv(client, seller_headers):
+    body = (
+        "title_preview,description_preview,category,price_usdt,stock,product_hash\r\n"
+        f'"Multi\nline, quoted",,data,2,5,{DEFAULT_PRODUCT_HASH}\r\n'
+        f'Plain,"Says ""hi""",data,3,1,{DEFAULT_PRODUCT_HASH}\r\n'
+    )
+    resp = await client.post(
+        "/products/bulk",
+        headers={**seller_headers, "Content-Type": "text/csv; charset=utf-8"},
+        content=body.encode(),
+    )
+    assert resp.status_code == 201
+    assert resp.json() == {"created": 2}
+
+    items = {i["title_preview"]: i for i in (await client.get("/products")).json()["items"]}
+    assert items["Multi\nline, quoted"]["description_preview"] is None
+    assert items["Plain"]["description_preview"] == 'Says "hi"'
+
+
+async def test_bulk_create_products_rejects_upload_with_invalid_rows(client, seller_headers):
+    lines = [json.dumps(_listing(1)), json.dumps({**_listing(2), "price_usdt": "0"}), "{not json"]
+    resp = await client.post(
+        "/products/bulk",
+        headers={**seller_headers, "Content-Type": "application/x-ndjson"},
+        content="\n".join(lines),
+    )
+    assert resp.status_code == 422
+    errors = resp.json()["detail"]
+    assert [e["line"] for e in errors] == [2, 3]
+    assert errors[0]["errors"][0]["loc"] == ["price_usdt"]
+
+
+async def test_bulk_create_products_limits(client, seller_headers, monkeypatch):
+    resp = await client.post(
+        "/products/bulk",
+        headers={**seller_headers, "Content-Type": "application/json"},
+        content="[]",
+    )
+    assert resp.status_code == 415
+
+    monkeypatch.setattr(settings, "product_bulk_max_rows", 2)
+    resp = await client.post(
+        "/products/bulk",
+        headers={**seller_headers, "Content-Type": "application/x-ndjson"},
+        content="\n".join(json.dumps(_listing(i)) for i in range(3)),
+    )
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == "TOO_MANY_ROWS"
+
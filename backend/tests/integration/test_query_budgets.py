@@ -0,0 +1,50 @@
+from fastapi.routing import APIRoute, APIWebSocketRoute
+
+from app.core.query_budget import QueryBudget, get_query_budget
+from tests.query_budget import RequestProfile
+
+
+def test_every_route_declares_a_budget():
+    from app.main import app
+
+    missing = [
+        route.path
+        for route in app.routes
+        if isinstance(route, (APIRoute, APIWebSocketRoute))
+        and get_query_budget(route.endpoint) is None
+    ]
+    assert missing == []
+
+
+def test_violation_lists_offending_statements():
+    profile = RequestProfile(
+        method="GET",
+        path="/orders/1",
+        route="/orders/{order_id}",
+        budget=QueryBudget(statements=1),
+        statements=[("SELECT 1", 0.001), ("SELECT\n  2", 0.001)],
+    )
+    message = profile.violation(check_time=True)
+    assert "2 statements (budget 1)" in message
+    assert "SELECT 2" in message
+
+
+def test_within_budget_is_not_a_violation():
+    profile = RequestProfile(
+        method="GET",
+        path="/products",
+        budget=QueryBudget(statements=2, db_time_ms=5),
+        statements=[("SELECT 1", 0.010)],
+    )
+    assert profile.violation(check_time=False) is None
+    assert "DB time" in profile.violation(check_time=True)
+
+
+async def test_requests_are_recorded_per_route(client, buyer_headers, sample_order, query_budget):
+    resp = await client.get(f"/orders/{sample_order.id}", headers=buyer_headers)
+    assert resp.status_code == 200
+
+    profile = query_budget.profiles[-1]
+    assert profile.route == "/orders/{order_id}"
+    assert profile.budget is not None
+    assert profile.count <= profile.budget.statements
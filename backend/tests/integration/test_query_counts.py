@@ -0,0 +1,84 @@
+"""Statement-count regression tests: fail if an endpoint starts issuing extra queries."""
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app.services.order_service import get_order
+from tests.factories import make_message
+
+
+def _non_ddl(statements: list[str]) -> list[str]:
+    return [s for s in statements if not s.lstrip().upper().startswith(("CREATE", "DROP", "PRAGMA"))]
+
+
+async def test_get_order_does_not_load_messages(
+    client, db_session, buyer_headers, sample_order, query_counter
+):
+    db_session.add(make_message(sample_order.id))
+    await db_session.flush()
+    query_counter.clear()
+
+    resp = await client.get(f"/orders/{sample_order.id}", headers=buyer_headers)
+    assert resp.status_code == 200
+
+    statements = _non_ddl(query_counter)
+    # get_current_user + get_order
+    assert len(statements) == 2, statements
+    assert not any("FROM messages" in s for s in statements)
+
+
+async def test_list_orders_statement_count(
+    client, db_session, buyer_headers, sample_order, query_counter
+):
+    db_session.add(make_message(sample_order.id))
+    await db_session.flush()
+    query_counter.clear()
+
+    resp = await client.get("/orders", headers=buyer_headers)
+    assert resp.status_code == 200
+
+    statements = _non_ddl(query_counter)
+    # get_current_user + count + page
+    assert len(statements) == 3, statements
+    assert not any("FROM messages" in s for s in statements)
+
+
+async def test_order_messages_relationship_raises(db_session, sample_order):
+    db_session.expunge_all()
+    order = await get_order(sample_order.id, db_session)
+    with pytest.raises(InvalidRequestError):
+        order.messages
+
+
+async def test_create_product_reads_defaults_via_returning(client, seller_headers, query_counter):
+    resp = await client.post(
+        "/products",
+        headers=seller_headers,
+        json={
+            "title_preview": "Returning",
+            "category": "data",
+            "price_usdt": "10.000000",
+            "stock": 1,
+            "product_hash": "0x" + "1" * 64,
+        },
+    )
+    assert resp.status_code == 201
+    assert resp.json()["created_at"] is not None
+
+    statements = _non_ddl(query_counter)
+    inserts = [s for s in statements if s.startswith("INSERT INTO products")]
+    assert len(inserts) == 1 and "RETURNING" in inserts[0]
+    assert not any(s.startswith("SELECT") and "FROM products" in s for s in statements)
+
+
+async def test_update_product_reads_updated_at_via_returning(
+    client, seller_headers, sample_product, query_counter
+):
+    resp = await client.put(
+        f"/products/{sample_product.id}", headers=seller_headers, json={"stock": 3}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["updated_at"] is not None
+
+    updates = [s for s in _non_ddl(query_counter) if s.startswith("UPDATE products")]
+    assert len(updates) == 1 and "RETURNING" in updates[0]
@@ -19,7 +19,7 @@ async def test_websocket_unauthenticated(client, sample_order):
                 pass
 
 
-async def test_websocket_connect_buyer(client, sample_order):
+async def test_websocket_connect_buyer(client, sample_order, redis_client):
     """Buyer should be able to connect to their order's WebSocket."""
     from starlette.testclient import TestClient
     from app.main import app
@@ -36,27 +36,37 @@ async def test_websocket_connect_buyer(client, sample_order):
     # So we can't easily override it. We verify the auth logic at least.
     from app.api.websocket import authenticate_ws
 
-    wallet = await authenticate_ws(token)
+    wallet = await authenticate_ws(token, redis_client)
     assert wallet == BUYER_WALLET
 
 
-async def test_websocket_auth_invalid_token():
+async def test_websocket_auth_invalid_token(redis_client):
     """Invalid token should return None."""
     from app.api.websocket import authenticate_ws
 
-    wallet = await authenticate_ws("not-a-valid-jwt")
+    wallet = await authenticate_ws("not-a-valid-jwt", redis_client)
     assert wallet is None
 
 
-async def test_websocket_auth_valid_token():
+async def test_websocket_auth_valid_token(redis_client):
     """Valid JWT should return the wallet address."""
     from app.api.websocket import authenticate_ws
 
     token, _ = create_access_token(BUYER_WALLET)
-    wallet = await authenticate_ws(token)
+    wallet = await authenticate_ws(token, redis_client)
     assert wallet == BUYER_WALLET
 
 
+async def test_websocket_auth_revoked_token(redis_client):
+    """A revoked JWT is rejected at the handshake."""
+    from app.api.websocket import authenticate_ws
+    from app.core.security import revoke_access_token
+
+    token, _ = create_access_token(BUYER_WALLET)
+    assert await revoke_access_token(token, redis_client)
+    assert await authenticate_ws(token, redis_client) is None
+
+
 async def test_connection_manager():
     """Test ConnectionManager add/remove/broadcast logic."""
     from app.api.websocket import ConnectionManager
@@ -125,3 +135,105 @@ async def test_connection_manager_handles_send_failure():
     await mgr.broadcast("order-1", {"event": "update"})
     ws_good.send_text.assert_called_once()
     assert len(mgr.active["order-1"]) == 1
+
+
+class _WebSocketSession:
+    """Drives the ASGI app over a websocket scope on the test's own event loop."""
+
+    def __init__(self, app, path: str, token: str):
+        import asyncio
+
+        self.incoming = asyncio.Queue()
+        self.outgoing = asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "server": ("test", 80),
+            "client": ("test", 50000),
+            "root_path": "",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": f"token={token}".encode(),
+            "headers": [],
+            "subprotocols": [],
+        }
+        self.task = asyncio.create_task(app(scope, self.incoming.get, self.outgoing.put))
+
+    async def __aenter__(self):
+        await self.incoming.put({"type": "websocket.connect"})
+        assert (await self._next())["type"] == "websocket.accept"
+        return self
+
+    async def __aexit__(self, *exc):
+        import asyncio
+
+        await self.incoming.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, timeout=5)
+
+    async def _next(self) -> dict:
+        import asyncio
+
+        return await asyncio.wait_for(self.outgoing.get(), timeout=5)
+
+    async def send_json(self, data: dict) -> None:
+        import json
+
+        await self.incoming.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive_json(self) -> dict:
+        import json
+
+        return json.loads((await self._next())["text"])
+
+
+async def test_websocket_message_is_acked_and_broadcast(
+    db_session, sample_order, monkeypatch, query_budget
+):
+    """A chat message is persisted, acked to the sender and broadcast to the other party."""
+    import fakeredis
+    import fakeredis.aioredis
+
+    import app.api.websocket as ws_module
+    from app.main import app
+    from app.models.message import Message
+    from app.services.message_buffer import MessageWriteBuffer
+    from sqlalchemy import select
+    from tests.conftest import TestSessionLocal
+
+    await db_session.commit()
+    buffer = MessageWriteBuffer(session_factory=TestSessionLocal, flush_interval=0.01)
+    monkeypatch.setattr(ws_module, "async_session_factory", TestSessionLocal)
+    monkeypatch.setattr(ws_module, "message_buffer", buffer)
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        ws_module.Redis,
+        "from_url",
+        lambda *a, **kw: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+    )
+
+    path = f"/ws/orders/{sample_order.id}"
+    app = query_budget.wrap(app)
+    buyer_token, _ = create_access_token(BUYER_WALLET)
+    seller_token, _ = create_access_token(SELLER_WALLET)
+    try:
+        async with _WebSocketSession(app, path, seller_token) as seller:
+            async with _WebSocketSession(app, path, buyer_token) as buyer:
+                await buyer.send_json({"ciphertext": "c1", "nonce": "n1", "client_id": "m1"})
+                ack = await buyer.receive_json()
+                assert ack["type"] == "ack"
+                assert ack["client_id"] == "m1"
+
+                event = await seller.receive_json()
+                assert event["type"] == "message"
+                assert event["id"] == ack["id"]
+                assert event["sender"] == BUYER_WALLET
+                assert event["ciphertext"] == "c1"
+    finally:
+        await buffer.stop()
+
+    result = await db_session.execute(select(Message).where(Message.sender_wallet == BUYER_WALLET))
+    message = result.scalar_one()
+    assert str(message.id) == ack["id"]
+    assert message.nonce == "n1"
+    assert [p.route for p in query_budget.profiles] == ["/ws/orders/{order_id}"] * 2
@@ -0,0 +1,185 @@
+"""Pytest plugin enforcing per-route SQL statement and DB time budgets.
+
+Routes declare budgets with ``app.core.query_budget.query_budget``. One recorder
+listens on the test engine (``before_cursor_execute`` / ``after_cursor_execute``)
+and backs both fixtures: ``query_counter`` is every statement of the test, and the
+``client`` fixture attributes each HTTP request's statements to its route. Apps
+wrapped with ``QueryBudgetRecorder.wrap`` get the same check for WebSocket routes,
+whose budget covers the handshake up to accept (or close). A request that exceeds
+its route's budget fails the test and prints the statements it issued.
+
+Options:
+    --query-budget-report   print the worst observed statements/DB time per route
+    --no-query-time-budget  only enforce statement counts (for slow CI machines)
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import pytest
+
+from app.core.query_budget import QueryBudget, get_query_budget
+
+_observed: list["RequestProfile"] = []
+
+
+@dataclass
+class RequestProfile:
+    method: str
+    path: str
+    route: str | None = None
+    budget: QueryBudget | None = None
+    statements: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_time_ms(self) -> float:
+        return sum(elapsed for _, elapsed in self.statements) * 1000
+
+    def violation(self, check_time: bool) -> str | None:
+        if self.budget is None:
+            return None
+        problems = []
+        if self.count > self.budget.statements:
+            problems.append(f"{self.count} statements (budget {self.budget.statements})")
+        if check_time and self.db_time_ms > self.budget.db_time_ms:
+            problems.append(f"{self.db_time_ms:.1f}ms DB time (budget {self.budget.db_time_ms}ms)")
+        if not problems:
+            return None
+        lines = [f"{self.method} {self.route} exceeded its query budget: {', '.join(problems)}"]
+        for i, (statement, elapsed) in enumerate(self.statements, 1):
+            lines.append(f"  {i:>2}. [{elapsed * 1000:.2f}ms] {' '.join(statement.split())}")
+        return "\n".join(lines)
+
+
+class QueryBudgetRecorder:
+    """ASGI wrapper + SQLAlchemy listeners that record an engine's statements.
+
+    ``statements`` holds every statement sent while installed; statements issued
+    during a wrapped HTTP request or WebSocket handshake are also added to its profile.
+    """
+
+    def __init__(self, engine, check_time: bool = True):
+        self.engine = engine.sync_engine
+        self.check_time = check_time
+        self.statements: list[str] = []
+        self.profiles: list[RequestProfile] = []
+        self._current: RequestProfile | None = None
+
+    def install(self) -> None:
+        from sqlalchemy import event
+
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        event.listen(self.engine, "after_cursor_execute", self._after)
+
+    def remove(self) -> None:
+        from sqlalchemy import event
+
+        event.remove(self.engine, "before_cursor_execute", self._before)
+        event.remove(self.engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        conn.info.setdefault("query_budget_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_budget_start"].pop()
+        if self._current is not None:
+            self._current.statements.append((statement, time.perf_counter() - started))
+
+    def wrap(self, app):
+        async def asgi(scope, receive, send):
+            if scope["type"] not in ("http", "websocket"):
+                return await app(scope, receive, send)
+            method = scope.get("method", "WS")
+            profile = RequestProfile(method=method, path=scope["path"])
+            self._current = profile
+
+            async def send_after_handshake(message):
+                # A connection is long-lived; its budget only covers the handshake
+                if message["type"] in ("websocket.accept", "websocket.close"):
+                    if self._current is profile:
+                        self._current = None
+                await send(message)
+
+            try:
+                await app(scope, receive, send_after_handshake)
+            finally:
+                if self._current is profile:
+                    self._current = None
+                # The router stores the matched route in the (shared) scope dict
+                route = scope.get("route")
+                profile.route = getattr(route, "path", scope["path"])
+                profile.budget = get_query_budget(getattr(route, "endpoint", None))
+                self.profiles.append(profile)
+
+        return asgi
+
+    def violations(self) -> list[str]:
+        return [
+            v for p in self.profiles if (v := p.violation(self.check_time)) is not None
+        ]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("query-budget")
+    group.addoption(
+        "--query-budget-report",
+        action="store_true",
+        help="Print observed SQL statement counts and DB time per route.",
+    )
+    group.addoption(
+        "--no-query-time-budget",
+        action="store_true",
+        help="Only enforce statement-count budgets, not DB time.",
+    )
+
+
+@pytest.fixture
+def query_budget(request):
+    from tests.conftest import test_engine
+
+    recorder = QueryBudgetRecorder(
+        test_engine, check_time=not request.config.getoption("--no-query-time-budget")
+    )
+    recorder.install()
+    yield recorder
+    recorder.remove()
+    _observed.extend(recorder.profiles)
+
+
+@pytest.fixture
+def query_counter(query_budget) -> list[str]:
+    """Every SQL statement sent to the test engine during the test."""
+    return query_budget.statements
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+    recorder = getattr(item, "funcargs", {}).get("query_budget")
+    if recorder is not None:
+        failures = recorder.violations()
+        if failures:
+            pytest.fail("\n\n".join(failures), pytrace=False)
+    return result
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.getoption("--query-budget-report") or not _observed:
+        return
+    worst: dict[tuple[str, str], RequestProfile] = {}
+    for p in _observed:
+        key = (p.method, p.route or p.path)
+        if key not in worst or p.count > worst[key].count:
+            worst[key] = p
+    terminalreporter.section("query budgets")
+    for (method, route), p in sorted(worst.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        budget = f"{p.budget.statements}" if p.budget else "-"
+        terminalreporter.write_line(
+            f"{method:<6} {route:<40} max {p.count:>3} statements "
+            f"(budget {budget:>3})  {p.db_time_ms:6.1f}ms"
+        )
@@ -1,10 +1,18 @@
 import pytest
 from eth_account import Account
 from eth_account.messages import encode_defunct
+from sqlalchemy import select
 from web3 import Web3
 
+from app.core.config import settings
 from app.models.user import UserProfile
-from app.services.auth_service import NONCE_PREFIX, generate_nonce, verify_signature
+from app.services.auth_service import (
+    NONCE_PREFIX,
+    generate_nonce,
+    verify_signature,
+    verify_signatures,
+)
+from app.services.signature_service import recover_address
 from tests.conftest import DEFAULT_PUBLIC_KEY
 
 
@@ -123,3 +131,97 @@ async def test_nonce_deleted_after_verify(db_session, redis_client):
     # Nonce should be deleted
     stored = await redis_client.get(f"{NONCE_PREFIX}{wallet.lower()}")
     assert stored is None
+
+
+def _signed_login(account, message):
+    return account.sign_message(encode_defunct(text=message)).signature.hex()
+
+
+def test_recover_address_matches_eth_account():
+    account = Account.create()
+    message = "P2P-Auth-1700000000-abc"
+    signature = _signed_login(account, message)
+
+    assert recover_address(message, signature) == account.address.lower()
+    assert recover_address(message, "0x" + signature.removeprefix("0x")) == account.address.lower()
+
+
+def test_recover_address_malformed_signature():
+    assert recover_address("msg", "0x1234") is None
+    assert recover_address("msg", "zz" * 65) is None
+
+
+async def test_verify_signature_malformed_signature(db_session, redis_client):
+    account = Account.create()
+    await generate_nonce(account.address, redis_client)
+
+    with pytest.raises(ValueError, match="INVALID_SIGNATURE"):
+        await verify_signature(
+            account.address, "0x" + "00" * 65, DEFAULT_PUBLIC_KEY, redis_client, db_session
+        )
+
+
+async def test_verify_signatures_batch(db_session, redis_client):
+    good = [Account.create() for _ in range(3)]
+    impostor, victim, unknown = Account.create(), Account.create(), Account.create()
+
+    logins = []
+    for account in good:
+        _, message = await generate_nonce(account.address, redis_client)
+        logins.append((account.address, _signed_login(account, message), DEFAULT_PUBLIC_KEY))
+    _, message = await generate_nonce(victim.address, redis_client)
+    logins.append((victim.address, _signed_login(impostor, message), DEFAULT_PUBLIC_KEY))
+    logins.append((unknown.address, "0x" + "00" * 65, DEFAULT_PUBLIC_KEY))
+
+    results = await verify_signatures(logins, redis_client, db_session)
+
+    assert all(isinstance(r, tuple) for r in results[:3])
+    assert str(results[3]) == "INVALID_SIGNATURE"
+    assert str(results[4]) == "NONCE_NOT_FOUND"
+
+    rows = await db_session.execute(
+        select(UserProfile.wallet).where(
+            UserProfile.wallet.in_([a.address.lower() for a in good + [victim]])
+        )
+    )
+    assert sorted(rows.scalars()) == sorted(a.address.lower() for a in good)
+
+
+async def test_generate_nonce_per_wallet_limit(redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "auth_nonce_issue_limit", 2)
+    wallet = "0x" + "c" * 40
+
+    await generate_nonce(wallet, redis_client)
+    await generate_nonce(wallet, redis_client)
+    with pytest.raises(ValueError, match="NONCE_RATE_LIMITED"):
+        await generate_nonce(wallet, redis_client)
+
+    # Other wallets are unaffected
+    await generate_nonce("0x" + "d" * 40, redis_client)
+
+
+async def test_verify_signature_expired_nonce(db_session, redis_client):
+    account = Account.create()
+    wallet = account.address.lower()
+    await redis_client.set(f"{NONCE_PREFIX}{wallet}", f"{'ab' * 16}:{1_000_000}")
+
+    with pytest.raises(ValueError, match="NONCE_EXPIRED"):
+        await verify_signature(
+            wallet, "0x" + "00" * 65, DEFAULT_PUBLIC_KEY, redis_client, db_session
+        )
+    # An expired nonce is still consumed
+    assert await redis_client.get(f"{NONCE_PREFIX}{wallet}") is None
+
+
+async def test_nonce_scripts_reload_after_flush(db_session, redis_client):
+    account = Account.create()
+    await generate_nonce(account.address, redis_client)
+    await redis_client.script_flush()
+
+    _, message = await generate_nonce(account.address, redis_client)
+    await redis_client.script_flush()
+    token, _ = await verify_signature(
+        account.address, _signed_login(account, message), DEFAULT_PUBLIC_KEY,
+        redis_client, db_session,
+    )
+    assert token
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.models.base import TokenType
+from app.schemas.order import OrderCreate
+from app.services.blacklist_service import (
+    BloomFilter,
+    add_to_blacklist,
+    is_blacklisted,
+    remove_from_blacklist,
+)
+from app.services.order_service import create_order
+from tests.conftest import ARBITRATOR_WALLET, BUYER_WALLET, DEFAULT_TX_HASH, SELLER_WALLET
+
+
+async def test_snapshot_check_does_not_query_db(db_session, redis_client, query_counter):
+    assert await is_blacklisted(BUYER_WALLET, db_session, redis_client) is False
+    assert query_counter == []
+
+
+async def test_add_and_remove_reload_snapshot(db_session, redis_client, buyer_user):
+    await add_to_blacklist(BUYER_WALLET, "fraud", "manual", ARBITRATOR_WALLET, db_session, redis_client)
+    assert await is_blacklisted(BUYER_WALLET, db_session, redis_client) is True
+    assert await is_blacklisted(SELLER_WALLET, db_session, redis_client) is False
+
+    assert await remove_from_blacklist(BUYER_WALLET, db_session, redis_client) is True
+    assert await is_blacklisted(BUYER_WALLET, db_session, redis_client) is False
+
+
+async def test_without_redis_falls_back_to_db(db_session, redis_client, buyer_user):
+    await add_to_blacklist(BUYER_WALLET, "fraud", "manual", ARBITRATOR_WALLET, db_session, redis_client)
+    assert await is_blacklisted(BUYER_WALLET, db_session) is True
+
+
+async def test_bloom_mode_confirms_hits_in_db(
+    db_session, redis_client, buyer_user, monkeypatch, blacklist_snapshot
+):
+    monkeypatch.setattr(settings, "blacklist_bloom_threshold", 0)
+    await add_to_blacklist(BUYER_WALLET, "fraud", "manual", ARBITRATOR_WALLET, db_session, redis_client)
+
+    assert await is_blacklisted(BUYER_WALLET, db_session, redis_client) is True
+    assert blacklist_snapshot.bloom is not None
+    assert blacklist_snapshot.wallets == frozenset()
+    assert await is_blacklisted(SELLER_WALLET, db_session, redis_client) is False
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000)
+    wallets = [f"0x{i:040x}" for i in range(1000)]
+    for wallet in wallets:
+        bloom.add(wallet)
+    assert all(wallet in bloom for wallet in wallets)
+    false_positives = sum(f"0x{i:040x}" in bloom for i in range(1000, 11000))
+    assert false_positives < 100
+
+
+async def test_create_order_rejects_blacklisted_seller(
+    db_session, redis_client, buyer_user, sample_product
+):
+    await add_to_blacklist(SELLER_WALLET, "scam", "manual", ARBITRATOR_WALLET, db_session, redis_client)
+    data = OrderCreate(
+        product_id=sample_product.id,
+        token=TokenType.USDT,
+        amount=Decimal("100"),
+        tx_hash=DEFAULT_TX_HASH,
+    )
+    with pytest.raises(ValueError, match="SELLER_BLACKLISTED"):
+        await create_order(buyer_user.wallet, data, db_session, redis_client)
+
+
+async def test_blacklisted_wallet_is_forbidden(client, db_session, redis_client, buyer_headers):
+    await add_to_blacklist(BUYER_WALLET, "fraud", "manual", ARBITRATOR_WALLET, db_session, redis_client)
+    resp = await client.get("/orders", headers=buyer_headers)
+    assert resp.status_code == 403
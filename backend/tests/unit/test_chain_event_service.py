@@ -0,0 +1,83 @@
+from sqlalchemy import func, select
+
+from app.models.base import ChainType, OrderStatus
+from app.models.chain_event import ChainEvent
+from app.services import chain_event_service
+from tests.conftest import DEFAULT_TX_HASH
+
+
+def _row(event: str, block: int, log_index: int = 0, tx_hash: str | None = None, chain=ChainType.BSC, **args):
+    return {
+        "chain": chain,
+        "tx_hash": tx_hash or "0x" + f"{block:02x}{log_index:02x}".rjust(64, "0"),
+        "log_index": log_index,
+        "block_number": block,
+        "block_hash": "0x" + f"{block:x}".rjust(64, "a"),
+        "event": event,
+        "args": args,
+    }
+
+
+def _lifecycle() -> list[dict]:
+    return [
+        _row("OrderCreated", 10, tx_hash=DEFAULT_TX_HASH, orderId=1),
+        _row("SellerConfirmed", 11, orderId=1),
+        _row("DisputeOpened", 12, orderId=1),
+        _row("DisputeResolved", 13, orderId=1, favorBuyer=True),
+    ]
+
+
+async def test_record_events_returns_only_new_rows(db_session):
+    rows = _lifecycle()
+    assert await chain_event_service.record_events(db_session, rows[:2]) == rows[:2]
+    assert await chain_event_service.record_events(db_session, rows) == rows[2:]
+    assert await chain_event_service.record_events(db_session, rows) == []
+
+    count = await db_session.scalar(select(func.count()).select_from(ChainEvent))
+    assert count == 4
+
+
+async def test_project_events_applies_whole_lifecycle_in_one_batch(db_session, sample_order, query_counter):
+    query_counter.clear()
+    await chain_event_service.project_events(db_session, ChainType.BSC, list(reversed(_lifecycle())))
+
+    assert sample_order.onchain_order_id == 1
+    assert sample_order.status == OrderStatus.RESOLVED_BUYER
+    # One lookup by tx hash covers every event for an order created in the batch
+    assert len(query_counter) == 1
+
+
+async def test_project_events_is_scoped_to_chain(db_session, sample_order):
+    sample_order.onchain_order_id = 1
+    await db_session.flush()
+
+    await chain_event_service.project_events(
+        db_session, ChainType.ARBITRUM, [_row("DisputeOpened", 5, chain=ChainType.ARBITRUM, orderId=1)]
+    )
+    assert sample_order.status == OrderStatus.CREATED
+
+
+async def test_replayed_range_is_a_no_op(db_session, sample_order):
+    rows = _lifecycle()
+    new = await chain_event_service.record_events(db_session, rows)
+    await chain_event_service.project_events(db_session, ChainType.BSC, new)
+    assert sample_order.status == OrderStatus.RESOLVED_BUYER
+
+    # Replaying the dispute-opening block must not reopen the resolved dispute
+    new = await chain_event_service.record_events(db_session, rows[2:3])
+    await chain_event_service.project_events(db_session, ChainType.BSC, new)
+    assert new == []
+    assert sample_order.status == OrderStatus.RESOLVED_BUYER
+
+
+async def test_replay_journal_rebuilds_orders_without_rpc(db_session, sample_order):
+    await chain_event_service.record_events(db_session, _lifecycle())
+    await db_session.commit()
+
+    applied = await chain_event_service.replay_journal(db_session, ChainType.BSC, to_block=12)
+    assert applied == 3
+    assert sample_order.onchain_order_id == 1
+    assert sample_order.status == OrderStatus.DISPUTED
+
+    assert await chain_event_service.replay_journal(db_session, ChainType.BSC, from_block=13) == 1
+    assert sample_order.status == OrderStatus.RESOLVED_BUYER
@@ -0,0 +1,64 @@
+import fakeredis
+import fakeredis.aioredis
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.services import health_service
+from app.services.health_service import CELERY_HEARTBEAT_KEY, HealthMonitor, is_ready
+from tests.conftest import test_engine
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        health_service.Redis,
+        "from_url",
+        lambda *args, **kwargs: fakeredis.aioredis.FakeRedis(server=server),
+    )
+    return server
+
+
+@pytest.fixture
+def monitor(fake_server):
+    return HealthMonitor(async_sessionmaker(test_engine, class_=AsyncSession))
+
+
+async def test_refresh_reports_missing_celery_heartbeat(monitor):
+    checks = await monitor.refresh()
+
+    assert checks == {"api": "ok", "database": "ok", "redis": "ok", "celery": "error"}
+    # Celery does not gate readiness
+    assert is_ready(checks)
+
+
+async def test_celery_ok_with_heartbeat(monitor, fake_server):
+    redis = fakeredis.aioredis.FakeRedis(server=fake_server)
+    await redis.set(CELERY_HEARTBEAT_KEY, 1)
+
+    checks = await monitor.refresh()
+    assert checks["celery"] == "ok"
+
+
+async def test_redis_down_is_not_ready(monitor, fake_server):
+    fake_server.connected = False
+
+    checks = await monitor.refresh()
+    assert checks["redis"] == "error"
+    assert not is_ready(checks)
+
+
+async def test_current_serves_cached_result(monitor, monkeypatch):
+    await monitor.refresh()
+
+    async def fail():
+        raise AssertionError("current() must not re-check while the result is fresh")
+
+    monkeypatch.setattr(monitor, "refresh", fail)
+    assert (await monitor.current())["database"] == "ok"
+
+
+async def test_background_task_start_stop(monitor):
+    monitor.start()
+    await monitor.stop()
+    assert monitor._task is None
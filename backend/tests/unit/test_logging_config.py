@@ -0,0 +1,35 @@
+import json
+import logging
+
+from app.core.logging_config import JsonFormatter
+
+
+def _record(**extra) -> logging.LogRecord:
+    record = logging.LogRecord("p2p.access", logging.INFO, __file__, 1, "%s %d", ("GET", 200), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_includes_extras():
+    line = JsonFormatter().format(_record(request_id="abc", route="/orders/{order_id}", db_ms=1.5))
+    entry = json.loads(line)
+
+    assert entry["msg"] == "GET 200"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "p2p.access"
+    assert entry["request_id"] == "abc"
+    assert entry["route"] == "/orders/{order_id}"
+    assert entry["db_ms"] == 1.5
+    assert "args" not in entry and "pathname" not in entry
+
+
+def test_json_formatter_exception():
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        import sys
+
+        record = logging.LogRecord("x", logging.ERROR, __file__, 1, "failed", (), sys.exc_info())
+    entry = json.loads(JsonFormatter().format(record))
+    assert "RuntimeError: boom" in entry["exc"]
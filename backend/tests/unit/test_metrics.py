@@ -0,0 +1,51 @@
+from prometheus_client.parser import text_string_to_metric_families
+
+from app.core import metrics
+
+
+def _samples(body: bytes) -> dict:
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(body.decode())
+        for sample in family.samples
+    }
+
+
+async def test_worker_gauge_round_trip(redis_client):
+    await metrics.set_worker_gauge(redis_client, "event_listener_block_lag", "bsc", 42)
+
+    samples = _samples(await metrics.worker_metrics_exposition(redis_client))
+    assert samples[("p2p_event_listener_block_lag", (("chain", "bsc"),))] == 42
+
+
+async def test_worker_histogram_round_trip(redis_client):
+    for size in (0, 3, 3, 700):
+        await metrics.observe_worker_histogram(
+            redis_client, "timeout_checker_batch_size", "expired", size
+        )
+
+    samples = _samples(await metrics.worker_metrics_exposition(redis_client))
+    bucket = "p2p_timeout_checker_batch_size_bucket"
+    assert samples[(bucket, (("kind", "expired"), ("le", "0")))] == 1
+    assert samples[(bucket, (("kind", "expired"), ("le", "5")))] == 3
+    assert samples[(bucket, (("kind", "expired"), ("le", "500")))] == 3
+    assert samples[(bucket, (("kind", "expired"), ("le", "+Inf")))] == 4
+    assert samples[("p2p_timeout_checker_batch_size_count", (("kind", "expired"),))] == 4
+    assert samples[("p2p_timeout_checker_batch_size_sum", (("kind", "expired"),))] == 706
+
+
+async def test_worker_metrics_empty(redis_client):
+    body = await metrics.worker_metrics_exposition(redis_client)
+    assert b"p2p_event_listener_block_lag" in body
+
+
+def test_observe_request_and_runtime_gauges():
+    metrics.observe_request("GET", "/orders/{order_id}", 200, 0.012)
+
+    samples = _samples(metrics.api_exposition())
+    key = (
+        "p2p_http_request_duration_seconds_count",
+        (("method", "GET"), ("route", "/orders/{order_id}"), ("status", "200")),
+    )
+    assert samples[key] >= 1
+    assert ("p2p_websocket_connections", ()) in samples
@@ -78,6 +78,17 @@ async def test_list_orders_all(db_session, sample_order):
     assert orders[0].id == sample_order.id
 
 
+async def test_list_orders_reads_product_key_only_on_request(
+    db_session, confirmed_order, query_counter
+):
+    orders, _ = await list_orders(BUYER_WALLET, OrderListParams(), db_session)
+    assert "product_key_encrypted" not in query_counter[-1]
+    assert "product_key_encrypted" not in orders[0]._fields
+
+    orders, _ = await list_orders(BUYER_WALLET, OrderListParams(include_key=True), db_session)
+    assert orders[0].product_key_encrypted == "encrypted_key_data"
+
+
 async def test_list_orders_by_role_buyer(db_session, sample_order):
     params = OrderListParams(role="buyer")
     orders, total = await list_orders(BUYER_WALLET, params, db_session)
@@ -155,3 +166,34 @@ async def test_open_dispute_from_confirmed(db_session, confirmed_order):
 async def test_open_dispute_wrong_status(db_session, completed_order):
     with pytest.raises(ValueError, match="INVALID_ORDER_STATUS"):
         await open_dispute(completed_order.id, db_session)
+
+
+async def test_seller_confirm_delivery_checks_seller(db_session, sample_order):
+    with pytest.raises(ValueError, match="NOT_SELLER"):
+        await seller_confirm_delivery(sample_order.id, "key", db_session, seller_wallet=BUYER_WALLET)
+
+    order = await seller_confirm_delivery(
+        sample_order.id, "key", db_session, seller_wallet=SELLER_WALLET
+    )
+    assert order.status == OrderStatus.SELLER_CONFIRMED
+
+
+async def test_transition_order_not_found(db_session):
+    with pytest.raises(ValueError, match="NOT_FOUND"):
+        await cancel_order(uuid.uuid4(), db_session, buyer_wallet=BUYER_WALLET)
+
+
+async def test_cancel_order_checks_buyer_and_restores_stock(db_session, sample_order, sample_product):
+    with pytest.raises(ValueError, match="NOT_BUYER"):
+        await cancel_order(sample_order.id, db_session, buyer_wallet=SELLER_WALLET)
+
+    stock_before = sample_product.stock
+    order = await cancel_order(sample_order.id, db_session, buyer_wallet=BUYER_WALLET)
+    assert order.status == OrderStatus.CANCELLED
+    await db_session.refresh(sample_product)
+    assert sample_product.stock == stock_before + 1
+
+
+async def test_open_dispute_rejects_outsider(db_session, sample_order):
+    with pytest.raises(ValueError, match="FORBIDDEN"):
+        await open_dispute(sample_order.id, db_session, wallet="0x" + "d" * 40)
@@ -6,7 +6,9 @@ from app.models.base import ProductCategory, ProductStatus
 from app.models.product import Product
 from app.models.user import UserProfile
 from app.schemas.product import ProductCreate, ProductListParams, ProductUpdate
+from app.services import product_service
 from app.services.product_service import (
+    bulk_create_products,
     create_product,
     get_product,
     list_products,
@@ -167,3 +169,50 @@ async def test_soft_delete_product(db_session, sample_product):
 
     assert deleted.status == ProductStatus.DELETED
     assert deleted.deleted_at is not None
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def test_parsers_handle_records_split_across_chunks():
+    chunks = _chunks(b'{"a":', b' 1}\n\n{"b"', b": 2}")
+    ndjson = [r async for r in product_service.parse_ndjson(chunks)]
+    assert ndjson == [(1, '{"a": 1}'), (3, '{"b": 2}')]
+
+    rows = [
+        r
+        async for r in product_service.parse_csv(
+            _chunks(b"\xef\xbb\xbftitle_preview,stock\r\n\"a\r", b'\nb",1\r\n', b",2")
+        )
+    ]
+    assert rows == [(2, {"title_preview": "a\nb", "stock": "1"}), (4, {"stock": "2"})]
+
+
+async def test_bulk_create_products_writes_in_batches(
+    db_session, seller_user, monkeypatch, query_counter
+):
+    monkeypatch.setattr(product_service, "BULK_BATCH_SIZE", 2)
+    row = {
+        "title_preview": "Bulk",
+        "category": "data",
+        "price_usdt": "1",
+        "stock": "3",
+        "product_hash": DEFAULT_PRODUCT_HASH,
+    }
+
+    async def records():
+        for line in range(1, 6):
+            yield line, row
+
+    created, errors = await bulk_create_products(SELLER_WALLET, records(), db_session, max_rows=10)
+    assert (created, errors) == (5, [])
+    assert len(query_counter) == 3
+
+    products, total = await list_products(ProductListParams(), db_session)
+    assert total == 5
+    assert {p.stock for p in products} == {3}
+
+    with pytest.raises(ValueError, match="TOO_MANY_ROWS"):
+        await bulk_create_products(SELLER_WALLET, records(), db_session, max_rows=4)
@@ -0,0 +1,69 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.replicas import STICKY_KEY_PREFIX, ReplicaSet
+
+WALLET = "0x" + "ab" * 20
+
+
+@pytest_asyncio.fixture
+async def replicas(monkeypatch):
+    engines = [create_async_engine(f"sqlite+aiosqlite:///replica{i}.db") for i in range(3)]
+    replicas = ReplicaSet(engines, max_lag_seconds=5.0, sticky_seconds=10.0)
+    lags = {engine: 0.0 for engine in engines}
+
+    async def fake_lag(engine):
+        lag = lags[engine]
+        if lag is None:
+            raise ConnectionRefusedError
+        return lag
+
+    monkeypatch.setattr(replicas, "_lag", fake_lag)
+    replicas.lags = lags
+    yield replicas
+    await replicas.stop()
+
+
+async def test_reads_go_to_primary_until_checked(replicas, redis_client):
+    assert await replicas.pick(None, redis_client) is None
+
+    await replicas.check()
+    assert await replicas.pick(None, redis_client) is not None
+
+
+async def test_round_robin_across_healthy_replicas(replicas, redis_client):
+    await replicas.check()
+
+    picked = [await replicas.pick(None, redis_client) for _ in range(6)]
+    factories = [replicas._factories[engine] for engine in replicas.engines]
+    assert picked == factories * 2
+
+
+async def test_lagging_and_unreachable_replicas_are_skipped(replicas, redis_client):
+    first, second, third = replicas.engines
+    replicas.lags[first] = 30.0
+    replicas.lags[second] = None
+
+    assert await replicas.check() == [third]
+    assert {await replicas.pick(None, redis_client) for _ in range(3)} == {
+        replicas._factories[third]
+    }
+
+    replicas.lags[third] = 6.0
+    assert await replicas.check() == []
+    assert await replicas.pick(None, redis_client) is None
+
+
+async def test_writer_reads_from_primary_within_window(replicas, redis_client):
+    await replicas.check()
+    await replicas.mark_write(WALLET, redis_client)
+
+    assert await replicas.pick(WALLET, redis_client) is None
+    assert await replicas.pick("0x" + "cd" * 20, redis_client) is not None
+    assert 0 < await redis_client.pttl(f"{STICKY_KEY_PREFIX}{WALLET}") <= 10_000
+
+
+async def test_mark_write_is_noop_without_replicas(redis_client):
+    await ReplicaSet([]).mark_write(WALLET, redis_client)
+
+    assert not await redis_client.exists(f"{STICKY_KEY_PREFIX}{WALLET}")
@@ -0,0 +1,32 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import paginated_response
+from app.schemas.common import PaginatedResponse
+from app.schemas.order import OrderResponse
+
+
+async def test_paginated_response_matches_response_model_encoding(db_session, sample_order):
+    fast = paginated_response(OrderResponse, [sample_order], total=41, page=3, page_size=20)
+
+    page = PaginatedResponse[OrderResponse](
+        items=[OrderResponse.model_validate(sample_order)],
+        total=41,
+        page=3,
+        page_size=20,
+        total_pages=3,
+    )
+    assert fast.media_type == "application/json"
+    assert json.loads(fast.body) == jsonable_encoder(page)
+
+
+def test_paginated_response_empty_page():
+    resp = paginated_response(OrderResponse, [], total=0, page=1, page_size=20)
+    assert json.loads(resp.body) == {
+        "items": [],
+        "total": 0,
+        "page": 1,
+        "page_size": 20,
+        "total_pages": 0,
+    }
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+from jose import jwt
+from pydantic import ValidationError
+
+from app.core import security
+from app.core.config import Settings, settings
+from app.core.security import (
+    REVOKED_KEY_PREFIX,
+    TokenCache,
+    authenticate_access_token,
+    create_access_token,
+    decode_access_token,
+    revoke_access_token,
+    token_cache,
+)
+
+WALLET = "0x" + "ab" * 20
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture
+def verify_calls(monkeypatch):
+    calls = []
+    original = security._verify
+
+    def counting(token):
+        calls.append(token)
+        return original(token)
+
+    monkeypatch.setattr(security, "_verify", counting)
+    return calls
+
+
+def test_decode_is_served_from_cache(verify_calls):
+    token, _ = create_access_token(WALLET)
+
+    assert decode_access_token(token) == WALLET
+    assert decode_access_token(token) == WALLET
+    assert len(verify_calls) == 1
+
+
+def test_invalid_token_is_not_cached(verify_calls):
+    assert decode_access_token("not-a-jwt") is None
+    assert decode_access_token("not-a-jwt") is None
+    assert len(verify_calls) == 2
+    assert len(token_cache) == 0
+
+
+def test_cached_entry_expires_with_token(verify_calls):
+    token, _ = create_access_token(WALLET)
+    decode_access_token(token)
+
+    key = TokenCache.key(token)
+    token_cache.put(key, WALLET, time.time() - 1)
+
+    # A stale entry is never trusted; the token goes back through verification
+    assert decode_access_token(token) == WALLET
+    assert len(verify_calls) == 2
+
+
+def test_expired_token_rejected():
+    payload = {"sub": WALLET, "exp": int(time.time()) - 10}
+    token = jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    assert decode_access_token(token) is None
+
+
+async def test_revoked_token_rejected_on_every_worker(redis_client):
+    token, expires_at = create_access_token(WALLET)
+    assert await authenticate_access_token(token, redis_client) == WALLET
+
+    assert await revoke_access_token(token, redis_client)
+    assert await authenticate_access_token(token, redis_client) is None
+
+    # Another worker with its own (cold or warm) cache sees the Redis marker
+    token_cache.put(TokenCache.key(token), WALLET, expires_at.timestamp())
+    assert await authenticate_access_token(token, redis_client) is None
+    token_cache.clear()
+    assert await authenticate_access_token(token, redis_client) is None
+
+
+async def test_revocation_marker_expires_with_token(redis_client):
+    token, expires_at = create_access_token(WALLET)
+    await revoke_access_token(token, redis_client)
+
+    key = f"{REVOKED_KEY_PREFIX}{TokenCache.key(token).hex()}"
+    assert 0 < await redis_client.ttl(key) <= expires_at.timestamp() - time.time() + 2
+
+
+async def test_revoking_invalid_token_is_noop(redis_client):
+    assert not await revoke_access_token("not-a-jwt", redis_client)
+    assert await redis_client.keys(f"{REVOKED_KEY_PREFIX}*") == []
+
+
+def test_pyjwt_backend_verifies_tokens():
+    token, _ = create_access_token(WALLET)
+
+    assert security._decode_pyjwt(token)["sub"] == WALLET
+    assert security._decode_pyjwt(token + "x") is None
+
+
+def test_unknown_backend_rejected_at_startup():
+    with pytest.raises(ValidationError):
+        Settings(jwt_backend="pyjtw")
+
+
+def test_cache_is_bounded_lru():
+    cache = TokenCache(maxsize=2)
+    exp = time.time() + 60
+    cache.put(b"a", "wa", exp)
+    cache.put(b"b", "wb", exp)
+    cache.get(b"a", time.time())
+    cache.put(b"c", "wc", exp)
+
+    assert len(cache) == 2
+    assert cache.get(b"b", time.time()) is None
+    assert cache.get(b"a", time.time()) == "wa"
+
+
+def test_cache_disabled_with_zero_size():
+    cache = TokenCache(maxsize=0)
+    cache.put(b"a", "wa", time.time() + 60)
+    assert len(cache) == 0
@@ -0,0 +1,170 @@
+import pytest
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.models.base import ChainType, TokenType
+from app.models.product import Product
+from app.schemas.order import OrderCreate
+from app.services import order_service
+from app.services.stock_service import (
+    STOCK_KEY_PREFIX,
+    reconcile_hot_stock,
+    release_stock,
+    reserve_stock,
+    reset_hot_stock,
+)
+
+
+@pytest.fixture
+def hot_product(monkeypatch, sample_product):
+    monkeypatch.setattr(settings, "hot_product_ids", [str(sample_product.id)])
+    return sample_product
+
+
+async def test_reserve_stock_decrements(db_session, sample_product):
+    remaining = await reserve_stock(sample_product.id, db_session)
+    assert remaining == 9
+    await db_session.refresh(sample_product)
+    assert sample_product.stock == 9
+
+
+async def test_reserve_stock_out_of_stock(db_session, sample_product):
+    sample_product.stock = 1
+    await db_session.flush()
+
+    assert await reserve_stock(sample_product.id, db_session) == 0
+    with pytest.raises(ValueError, match="OUT_OF_STOCK"):
+        await reserve_stock(sample_product.id, db_session)
+    await db_session.refresh(sample_product)
+    assert sample_product.stock == 0
+
+
+async def test_release_stock(db_session, sample_product):
+    await release_stock(sample_product.id, db_session, quantity=3)
+    await db_session.refresh(sample_product)
+    assert sample_product.stock == 13
+
+
+async def test_hot_product_reserves_in_redis(db_session, redis_client, hot_product):
+    remaining = await reserve_stock(hot_product.id, db_session, redis_client)
+    assert remaining == 9
+    assert int(await redis_client.get(f"{STOCK_KEY_PREFIX}{hot_product.id}")) == 9
+
+    # The database row is untouched until reconciliation
+    await db_session.refresh(hot_product)
+    assert hot_product.stock == 10
+
+    assert await reconcile_hot_stock(db_session, redis_client) == 1
+    await db_session.refresh(hot_product)
+    assert hot_product.stock == 9
+
+
+async def test_hot_product_sells_out(db_session, redis_client, hot_product):
+    hot_product.stock = 2
+    await db_session.flush()
+
+    await reserve_stock(hot_product.id, db_session, redis_client)
+    await reserve_stock(hot_product.id, db_session, redis_client)
+    with pytest.raises(ValueError, match="OUT_OF_STOCK"):
+        await reserve_stock(hot_product.id, db_session, redis_client)
+
+    await release_stock(hot_product.id, db_session, redis_client)
+    await db_session.commit()
+    assert int(await redis_client.get(f"{STOCK_KEY_PREFIX}{hot_product.id}")) == 1
+
+
+async def test_failed_cancel_keeps_hot_stock_reserved(db_session, redis_client, hot_product):
+    key = f"{STOCK_KEY_PREFIX}{hot_product.id}"
+    await reserve_stock(hot_product.id, db_session, redis_client)
+    await db_session.commit()
+
+    await release_stock(hot_product.id, db_session, redis_client)
+    assert int(await redis_client.get(key)) == 9
+
+    # The cancel's transaction fails: the unit stays reserved
+    await db_session.rollback()
+    assert int(await redis_client.get(key)) == 9
+
+
+async def test_hot_product_release_without_counter_goes_to_db(
+    db_session, redis_client, hot_product
+):
+    await release_stock(hot_product.id, db_session, redis_client)
+    await db_session.refresh(hot_product)
+    assert hot_product.stock == 11
+
+
+async def test_reset_hot_stock_reseeds_from_db(db_session, redis_client, hot_product):
+    await reserve_stock(hot_product.id, db_session, redis_client)
+    await db_session.commit()
+    hot_product.stock = 50
+    await db_session.flush()
+    reset_hot_stock(hot_product.id, db_session, redis_client)
+
+    # Until the edit commits, reservations keep using the existing counter
+    assert int(await redis_client.get(f"{STOCK_KEY_PREFIX}{hot_product.id}")) == 9
+    await db_session.commit()
+
+    assert await reserve_stock(hot_product.id, db_session, redis_client) == 49
+
+
+async def test_rolled_back_stock_edit_keeps_counter(db_session, redis_client, hot_product):
+    key = f"{STOCK_KEY_PREFIX}{hot_product.id}"
+    await reserve_stock(hot_product.id, db_session, redis_client)
+    await db_session.commit()
+    hot_product.stock = 50
+    await db_session.flush()
+    reset_hot_stock(hot_product.id, db_session, redis_client)
+
+    await db_session.rollback()
+    assert int(await redis_client.get(key)) == 9
+
+
+async def test_failed_order_returns_hot_stock(
+    db_session, redis_client, hot_product, buyer_user, monkeypatch
+):
+    async def failing_flush(*args, **kwargs):
+        raise RuntimeError("INSERT failed")
+
+    monkeypatch.setattr(db_session, "flush", failing_flush)
+    data = OrderCreate(
+        product_id=hot_product.id,
+        chain=ChainType.BSC,
+        token=TokenType.USDT,
+        amount="10",
+        tx_hash="0x" + "f" * 64,
+    )
+    with pytest.raises(RuntimeError):
+        await order_service.create_order(buyer_user.wallet, data, db_session, redis_client)
+    assert int(await redis_client.get(f"{STOCK_KEY_PREFIX}{hot_product.id}")) == 9
+
+    # get_db rolls back the failed request
+    await db_session.rollback()
+    assert int(await redis_client.get(f"{STOCK_KEY_PREFIX}{hot_product.id}")) == 10
+
+
+async def test_committed_reservation_is_kept(db_session, redis_client, hot_product):
+    await reserve_stock(hot_product.id, db_session, redis_client)
+    await db_session.commit()
+    await db_session.rollback()
+
+    assert int(await redis_client.get(f"{STOCK_KEY_PREFIX}{hot_product.id}")) == 9
+
+
+async def test_reconcile_keeps_concurrent_seller_edit(
+    db_session, redis_client, hot_product, monkeypatch
+):
+    await reserve_stock(hot_product.id, db_session, redis_client)
+    original_get = redis_client.get
+
+    async def get_during_seller_edit(key):
+        value = await original_get(key)
+        await db_session.execute(
+            update(Product).where(Product.id == hot_product.id).values(stock=50)
+        )
+        return value
+
+    monkeypatch.setattr(redis_client, "get", get_during_seller_edit)
+    assert await reconcile_hot_stock(db_session, redis_client) == 0
+    await db_session.refresh(hot_product)
+    assert hot_product.stock == 50
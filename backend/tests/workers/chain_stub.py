@@ -0,0 +1,121 @@
+"""In-memory stand-in for an Anvil node running the escrow contract.
+
+Exposes the slice of the web3 API the event listener uses: ``eth.get_block_number``,
+``eth.get_block`` (number, hash and parentHash only) and
+``contract.events.<Name>.get_logs(from_block=, to_block=)``. ``reorg`` replaces
+the newest blocks with a competing fork.
+"""
+
+import asyncio
+import hashlib
+
+from hexbytes import HexBytes
+
+ESCROW_ADDRESS = "0x" + "1" * 40
+
+
+class _Event:
+    def __init__(self, chain: "FakeChain", name: str):
+        self.chain = chain
+        self.name = name
+
+    async def get_logs(self, from_block: int, to_block: int) -> list[dict]:
+        chain = self.chain
+        chain.log_requests.append((self.name, from_block, to_block))
+        if chain.log_failures:
+            chain.log_failures -= 1
+            raise ConnectionError("eth_getLogs timed out")
+        chain.logs_in_flight += 1
+        chain.max_logs_in_flight = max(chain.max_logs_in_flight, chain.logs_in_flight)
+        try:
+            await asyncio.sleep(0)
+        finally:
+            chain.logs_in_flight -= 1
+        return [
+            log
+            for log in chain.logs
+            if log["event"] == self.name and from_block <= log["blockNumber"] <= to_block
+        ]
+
+
+class _Events:
+    def __init__(self, chain: "FakeChain"):
+        self.chain = chain
+
+    def __getattr__(self, name: str) -> _Event:
+        return _Event(self.chain, name)
+
+
+class _Contract:
+    def __init__(self, chain: "FakeChain"):
+        self.address = ESCROW_ADDRESS
+        self.events = _Events(chain)
+
+
+class _Eth:
+    def __init__(self, chain: "FakeChain"):
+        self.chain = chain
+
+    async def get_block_number(self) -> int:
+        if self.chain.stalled:
+            await asyncio.Event().wait()
+        if self.chain.failures:
+            self.chain.failures -= 1
+            raise ConnectionError("RPC unavailable")
+        return self.chain.head
+
+    async def get_block(self, number: int) -> dict:
+        self.chain.block_requests.append(number)
+        return {
+            "number": number,
+            "hash": self.chain.block_hash(number),
+            "parentHash": self.chain.block_hash(number - 1),
+        }
+
+
+class FakeChain:
+    def __init__(self, head: int = 100):
+        self.head = head
+        self.logs: list[dict] = []
+        self.log_requests: list[tuple[str, int, int]] = []
+        self.block_requests: list[int] = []
+        self.forks: dict[int, int] = {}  # block number -> fork it was mined on
+        self.failures = 0
+        self.log_failures = 0  # eth_getLogs calls to fail before answering again
+        self.logs_in_flight = 0
+        self.max_logs_in_flight = 0
+        self.stalled = False  # RPC that accepts requests but never answers
+        self.eth = _Eth(self)
+        self.contract = _Contract(self)
+
+    def mine(self, blocks: int = 1) -> int:
+        self.head += blocks
+        return self.head
+
+    def block_hash(self, number: int) -> HexBytes:
+        return HexBytes(hashlib.sha256(f"{number}:{self.forks.get(number, 0)}".encode()).digest())
+
+    def reorg(self, depth: int) -> None:
+        """Replace the newest ``depth`` blocks (and their logs) with a competing fork."""
+        orphaned = range(self.head - depth + 1, self.head + 1)
+        fork = max(self.forks.values(), default=0) + 1
+        for number in orphaned:
+            self.forks[number] = fork
+        self.logs = [log for log in self.logs if log["blockNumber"] not in orphaned]
+
+    def emit(self, event: str, tx_hash: str | None = None, block: int | None = None, **args) -> dict:
+        """Include an event in ``block``, by default a newly mined one."""
+        if block is None:
+            block = self.mine()
+        if tx_hash is None:
+            tx_hash = hashlib.sha256(f"tx:{len(self.logs)}:{block}".encode()).hexdigest()
+        log = {
+            "event": event,
+            "args": args,
+            "blockNumber": block,
+            "blockHash": self.block_hash(block),
+            "logIndex": sum(1 for log in self.logs if log["blockNumber"] == block),
+            "transactionHash": HexBytes(tx_hash),
+        }
+        self.logs.append(log)
+        return log
@@ -0,0 +1,66 @@
+import uuid
+from decimal import Decimal
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models.base import Base, ChainType, TokenType
+from app.models.order import Order
+from app.services.blockchain_service import ChainConfig
+from tests.conftest import BUYER_WALLET, DEFAULT_TX_HASH, SELLER_WALLET
+from tests.workers.chain_stub import ESCROW_ADDRESS
+
+
+def chain_config(
+    chain: ChainType = ChainType.BSC, confirmations: int = 3, max_block_range: int = 2000
+) -> ChainConfig:
+    return ChainConfig(
+        chain=chain,
+        rpc_url="http://anvil:8545",
+        ws_url="",
+        chain_id=31337,
+        escrow_address=ESCROW_ADDRESS,
+        confirmations=confirmations,
+        max_block_range=max_block_range,
+    )
+
+
+async def load_order(sessions, order_id) -> Order:
+    async with sessions() as session:
+        return await session.get(Order, order_id)
+
+
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    # Per-session connections: the shared in-memory test connection cannot carry
+    # several chains' transactions at once
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/chain.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer())
+
+
+@pytest_asyncio.fixture
+async def order(sessions) -> Order:
+    async with sessions() as session:
+        order = Order(
+            buyer_wallet=BUYER_WALLET,
+            seller_wallet=SELLER_WALLET,
+            product_id=uuid.uuid4(),
+            chain=ChainType.BSC,
+            token=TokenType.USDT,
+            amount=Decimal("100"),
+            platform_fee=Decimal("2"),
+            tx_hash_create=DEFAULT_TX_HASH,
+        )
+        session.add(order)
+        await session.commit()
+        return order
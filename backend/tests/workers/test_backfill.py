@@ -0,0 +1,124 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.models.base import ChainType, OrderStatus
+from app.models.chain_event import ChainEvent
+from app.models.order import Order
+from app.workers import backfill as bf
+from tests.conftest import DEFAULT_TX_HASH
+from tests.workers.chain_stub import FakeChain
+from tests.workers.conftest import chain_config, load_order
+
+
+async def _run(chain: FakeChain, sessions, redis, from_block=1, to_block=100, **kwargs):
+    kwargs.setdefault("chunk_size", 10)
+    kwargs.setdefault("report", lambda line: None)
+    return await bf.backfill(
+        chain, chain.contract, chain_config(), sessions, redis, from_block, to_block, **kwargs
+    )
+
+
+async def _journaled(sessions) -> int:
+    async with sessions() as session:
+        return await session.scalar(select(func.count()).select_from(ChainEvent))
+
+
+async def test_backfill_journals_and_projects_range(sessions, order, redis):
+    chain = FakeChain(head=200)
+    chain.emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, block=15, orderId=3)
+    chain.emit("SellerConfirmed", block=48, orderId=3)
+    chain.emit("OrderCompleted", block=91, orderId=3)
+    chain.emit("DisputeOpened", block=150, orderId=3)  # outside the range
+
+    lines = []
+    progress = await _run(chain, sessions, redis, report=lines.append)
+
+    assert (progress.blocks, progress.logs, progress.new_events) == (100, 3, 3)
+    assert len(lines) == 10
+    assert await _journaled(sessions) == 3
+    synced = await load_order(sessions, order.id)
+    assert synced.onchain_order_id == 3
+    assert synced.status == OrderStatus.COMPLETED
+    assert not await redis.exists(bf.checkpoint_key(ChainType.BSC, 1, 100))
+
+
+async def test_backfill_over_synced_range_changes_nothing(sessions, order, redis):
+    chain = FakeChain(head=200)
+    chain.emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, block=15, orderId=3)
+    await _run(chain, sessions, redis)
+
+    progress = await _run(chain, sessions, redis)
+    assert (progress.logs, progress.new_events) == (1, 0)
+    assert await _journaled(sessions) == 1
+
+
+async def test_backfill_never_moves_resolved_order_back(sessions, order, redis):
+    # Resolved by the listener before the journal existed, so nothing is journaled yet
+    async with sessions() as session:
+        synced = await session.get(Order, order.id)
+        synced.onchain_order_id = 3
+        synced.status = OrderStatus.RESOLVED_BUYER
+        await session.commit()
+    chain = FakeChain(head=200)
+    chain.emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, block=15, orderId=3)
+    chain.emit("SellerConfirmed", block=48, orderId=3)
+    chain.emit("DisputeOpened", block=91, orderId=3)
+    chain.emit("DisputeResolved", block=150, orderId=3, favorBuyer=True)  # outside the range
+
+    progress = await _run(chain, sessions, redis)
+
+    assert progress.new_events == 3
+    assert (await load_order(sessions, order.id)).status == OrderStatus.RESOLVED_BUYER
+
+
+async def test_backfill_bounds_fetch_concurrency(sessions, redis):
+    chain = FakeChain(head=200)
+    await _run(chain, sessions, redis, concurrency=3)
+
+    # Each chunk issues one eth_getLogs per escrow event
+    assert chain.max_logs_in_flight == 3 * 5
+    ranges = sorted({(start, end) for _, start, end in chain.log_requests})
+    assert ranges == [(lo, lo + 9) for lo in range(1, 101, 10)]
+
+
+async def test_backfill_retries_failed_fetches(sessions, redis):
+    chain = FakeChain(head=200)
+    chain.emit("OrderCreated", block=55, orderId=1)
+    chain.log_failures = 2
+
+    progress = await _run(chain, sessions, redis, retry_backoff=0)
+    assert progress.logs == 1
+    assert await _journaled(sessions) == 1
+
+
+async def test_backfill_resumes_from_checkpoint(sessions, redis, monkeypatch):
+    chain = FakeChain(head=200)
+    for block in (5, 25, 65):
+        chain.emit("OrderCreated", block=block, orderId=block)
+
+    fetch_logs = bf.fetch_logs
+
+    async def rpc_down_from_block_41(escrow, start, end):
+        if start > 40:
+            raise ConnectionError("eth_getLogs timed out")
+        return await fetch_logs(escrow, start, end)
+
+    monkeypatch.setattr(bf, "fetch_logs", rpc_down_from_block_41)
+    with pytest.raises(ConnectionError):
+        await _run(chain, sessions, redis, concurrency=4, retries=0)
+    assert await _journaled(sessions) == 2
+    assert int(await redis.get(bf.checkpoint_key(ChainType.BSC, 1, 100))) == 40
+
+    monkeypatch.setattr(bf, "fetch_logs", fetch_logs)
+    chain.log_requests.clear()
+    lines = []
+    progress = await _run(chain, sessions, redis, report=lines.append)
+
+    assert lines[0] == "resuming bsc backfill at block 41"
+    assert min(start for _, start, _ in chain.log_requests) == 41
+    assert (progress.blocks, progress.new_events) == (60, 1)
+    assert await _journaled(sessions) == 3
+
+    await redis.set(bf.checkpoint_key(ChainType.BSC, 1, 100), 90)
+    progress = await _run(chain, sessions, redis, restart=True)
+    assert (progress.blocks, progress.new_events) == (100, 0)
@@ -0,0 +1,297 @@
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+from eth_utils import to_hex
+from sqlalchemy import select
+
+import app.workers.event_listener as el
+from app.models.base import ChainType, OrderStatus
+from app.models.chain_event import ChainEvent
+from app.models.event_sync import EventSyncCursor
+from app.services.blockchain_service import ChainConfig
+from app.workers.chain_daemon import ChainDaemon
+from tests.conftest import DEFAULT_TX_HASH
+from tests.workers.chain_stub import FakeChain
+from tests.workers.conftest import chain_config, load_order
+
+
+def _daemon(chain: FakeChain, redis, sessions, config: ChainConfig | None = None) -> ChainDaemon:
+    return ChainDaemon(
+        chain, chain.contract, redis, sessions, config or chain_config(), poll_interval=0.01, max_backoff=0.05
+    )
+
+
+async def _cursor(sessions, chain: ChainType = ChainType.BSC) -> int | None:
+    async with sessions() as session:
+        cursor = await session.get(EventSyncCursor, chain)
+        return cursor.last_block if cursor else None
+
+
+async def _wait_for(predicate) -> None:
+    for _ in range(300):
+        if await predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+def beat_task(monkeypatch, sessions):
+    """Point the beat task at fake chains, a fake Redis server and the test database."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(el.Redis, "from_url", lambda *a, **kw: fakeredis.aioredis.FakeRedis(server=server))
+    monkeypatch.setattr(el, "async_session_factory", sessions)
+    chains: dict[ChainType, FakeChain] = {}
+    monkeypatch.setattr(el, "enabled_chains", lambda: [chain_config(c) for c in chains])
+    monkeypatch.setattr(el, "get_web3", lambda c: chains[c])
+    monkeypatch.setattr(el, "get_escrow_contract", lambda w3, c: w3.contract)
+    return chains, fakeredis.aioredis.FakeRedis(server=server)
+
+
+async def test_first_head_starts_cursor_at_last_confirmed_block(sessions, redis):
+    chain = FakeChain(head=100)
+    assert await _daemon(chain, redis, sessions).on_head(100)
+    assert await _cursor(sessions) == 97
+
+
+async def test_events_applied_only_once_confirmed(sessions, order, redis):
+    chain = FakeChain(head=100)
+    daemon = _daemon(chain, redis, sessions)
+    await daemon.on_head(chain.head)
+
+    chain.emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, orderId=42)  # block 101
+    chain.emit("SellerConfirmed", orderId=42)  # block 102
+    await daemon.on_head(chain.mine(1))  # head 103: only block 100 confirmed
+    assert (await load_order(sessions, order.id)).onchain_order_id is None
+
+    await daemon.on_head(chain.mine(1))  # head 104: block 101 confirmed
+    synced = await load_order(sessions, order.id)
+    assert synced.onchain_order_id == 42
+    assert synced.status == OrderStatus.CREATED
+
+    await daemon.on_head(chain.mine(1))
+    assert (await load_order(sessions, order.id)).status == OrderStatus.SELLER_CONFIRMED
+    assert await _cursor(sessions) == 102
+
+    lag = await redis.hget("metrics:event_listener_block_lag", "bsc")
+    assert float(lag) == 3
+
+
+async def test_catches_up_in_chunks(sessions, redis):
+    chain = FakeChain(head=100)
+    daemon = _daemon(chain, redis, sessions, chain_config(max_block_range=10))
+    await daemon.on_head(chain.head)
+
+    await daemon.on_head(chain.mine(50))
+    assert await _cursor(sessions) == 147
+    ranges = sorted({(start, end) for _, start, end in chain.log_requests})
+    assert ranges[0] == (98, 107)
+    assert all(end - start < 10 for start, end in ranges)
+
+
+async def test_only_lease_holder_syncs(sessions, redis):
+    chain = FakeChain(head=100)
+    active = _daemon(chain, redis, sessions)
+    standby = _daemon(chain, redis, sessions)
+
+    assert await active.on_head(chain.head)
+    assert not await standby.on_head(chain.mine(5))
+    assert await _cursor(sessions) == 97
+
+    await active.lease.release()
+    assert await standby.on_head(chain.head)
+    assert await _cursor(sessions) == 102
+
+
+async def test_beat_task_skips_while_daemon_holds_lease(sessions, beat_task):
+    chains, redis = beat_task
+    chain = chains[ChainType.BSC] = FakeChain(head=100)
+
+    daemon = _daemon(chain, redis, sessions)
+    await daemon.on_head(chain.head)
+    chain.mine(10)
+    await el._sync_events()
+    assert chain.log_requests == []
+
+    await daemon.lease.release()
+    await el._sync_events()
+    assert chain.log_requests
+    assert not await redis.exists(el.lease_key(ChainType.BSC))
+
+
+async def test_beat_task_syncs_chains_independently(sessions, order, beat_task):
+    chains, redis = beat_task
+    chains[ChainType.BSC] = FakeChain(head=100)
+    chains[ChainType.ARBITRUM] = FakeChain(head=5000)
+    chains[ChainType.BASE] = FakeChain(head=300)
+
+    await el._sync_events()
+    assert [await _cursor(sessions, c) for c in chains] == [97, 4997, 297]
+
+    # The order lives on BSC; the same on-chain ID on Arbitrum is a different order
+    chains[ChainType.BSC].emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, orderId=9)
+    chains[ChainType.ARBITRUM].emit("DisputeOpened", orderId=9)
+    chains[ChainType.BASE].failures = 1
+    for chain in chains.values():
+        chain.mine(3)
+    await el._sync_events()
+
+    assert await _cursor(sessions, ChainType.BSC) == 101
+    assert await _cursor(sessions, ChainType.ARBITRUM) == 5001
+    assert await _cursor(sessions, ChainType.BASE) == 297
+    synced = await load_order(sessions, order.id)
+    assert synced.onchain_order_id == 9
+    assert synced.status == OrderStatus.CREATED
+
+    lag = await redis.hgetall("metrics:event_listener_block_lag")
+    assert set(lag) == {b"bsc", b"arbitrum", b"base"}
+    durations = await redis.hgetall("metrics:event_listener_sync_seconds")
+    assert b"arbitrum:+Inf" in durations
+
+
+async def test_stalled_chain_does_not_hold_up_others(sessions, redis):
+    bsc, arbitrum = FakeChain(head=100), FakeChain(head=5000)
+    bsc.stalled = True
+    tasks = [
+        asyncio.create_task(_daemon(bsc, redis, sessions).run()),
+        asyncio.create_task(_daemon(arbitrum, redis, sessions, chain_config(ChainType.ARBITRUM)).run()),
+    ]
+
+    async def arbitrum_synced():
+        if (await _cursor(sessions, ChainType.ARBITRUM) or 0) >= 5007:
+            return True
+        arbitrum.mine()
+        return False
+
+    await _wait_for(arbitrum_synced)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert await _cursor(sessions, ChainType.BSC) is None
+
+
+async def test_run_follows_polled_heads_and_recovers_from_rpc_errors(sessions, order, redis):
+    chain = FakeChain(head=100)
+    task = asyncio.create_task(_daemon(chain, redis, sessions).run())
+
+    async def cursor_exists():
+        return await _cursor(sessions) is not None
+
+    await _wait_for(cursor_exists)
+    chain.failures = 2
+    chain.emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, orderId=7)
+    chain.mine(3)
+
+    async def applied():
+        return (await load_order(sessions, order.id)).onchain_order_id == 7
+
+    await _wait_for(applied)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not await redis.exists(el.lease_key(ChainType.BSC))
+
+
+async def test_reorg_rolls_back_to_common_ancestor_and_replays(sessions, order, redis):
+    chain = FakeChain(head=100)
+    daemon = _daemon(chain, redis, sessions)
+    await daemon.on_head(chain.head)
+    for _ in range(10):
+        await daemon.on_head(chain.mine())
+    assert await _cursor(sessions) == 107
+
+    # Blocks 106-110 are replaced; the new fork carries the order's creation at 106
+    chain.reorg(5)
+    chain.emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, block=106, orderId=5)
+    chain.block_requests.clear()
+    chain.log_requests.clear()
+
+    await daemon.on_head(chain.mine())
+    assert await _cursor(sessions) == 108
+    # Checked 107 and 106 (orphaned) before 105 matched; not the whole ring
+    assert chain.block_requests[:4] == [108, 107, 106, 105]
+    assert min(start for _, start, _ in chain.log_requests) == 106
+    assert (await load_order(sessions, order.id)).onchain_order_id == 5
+
+    depth = await redis.hgetall("metrics:event_listener_reorg_depth")
+    assert float(depth[b"bsc:sum"]) == 2
+
+    async with sessions() as session:
+        cursor = await session.get(EventSyncCursor, ChainType.BSC)
+    assert cursor.checkpoints[-1] == [108, to_hex(chain.block_hash(108))]
+
+
+async def test_reorg_discards_orphaned_journal_rows(sessions, order, redis):
+    confirm_tx = "0x" + "cd" * 32
+    chain = FakeChain(head=100)
+    daemon = _daemon(chain, redis, sessions)
+    await daemon.on_head(chain.head)
+    chain.emit("OrderCreated", tx_hash=DEFAULT_TX_HASH, block=101, orderId=5)
+    chain.emit("SellerConfirmed", tx_hash=confirm_tx, block=106, orderId=5)
+    for _ in range(10):
+        await daemon.on_head(chain.mine())
+    assert await _cursor(sessions) == 107
+
+    # The confirmation is re-mined at 106 behind another log, so its log_index changes
+    chain.reorg(5)
+    chain.emit("SellerConfirmed", block=106, orderId=6)
+    chain.emit("SellerConfirmed", tx_hash=confirm_tx, block=106, orderId=5)
+    await daemon.on_head(chain.mine())
+    assert await _cursor(sessions) == 108
+
+    async with sessions() as session:
+        result = await session.execute(
+            select(ChainEvent.tx_hash, ChainEvent.log_index, ChainEvent.block_hash).where(
+                ChainEvent.block_number >= 106
+            )
+        )
+        rows = set(result.all())
+    new_hash = to_hex(chain.block_hash(106))
+    assert (confirm_tx, 0, new_hash) not in rows
+    assert (confirm_tx, 1, new_hash) in rows
+    assert {block_hash for _, _, block_hash in rows} == {new_hash}
+    assert (await load_order(sessions, order.id)).status == OrderStatus.SELLER_CONFIRMED
+
+
+async def test_checks_nearest_checkpoint_when_cursor_moved_past_ring(sessions, redis):
+    chain = FakeChain(head=100)
+    daemon = _daemon(chain, redis, sessions)
+    await daemon.on_head(chain.head)
+    for _ in range(10):
+        await daemon.on_head(chain.mine())
+    async with sessions() as session:
+        cursor = await session.get(EventSyncCursor, ChainType.BSC)
+        cursor.last_block = 109  # moved on without a checkpoint for 108-109
+        await session.commit()
+
+    chain.reorg(5)
+    chain.log_requests.clear()
+    await daemon.on_head(chain.mine(3))
+
+    # Checkpoint 107 no longer matches, so blocks from 106 on are replayed
+    assert min(start for _, start, _ in chain.log_requests) == 106
+    assert await _cursor(sessions) == 110
+
+
+async def test_reorg_deeper_than_checkpoint_ring(sessions, redis, monkeypatch):
+    monkeypatch.setattr(el.settings, "chain_reorg_checkpoints", 4)
+    chain = FakeChain(head=100)
+    daemon = _daemon(chain, redis, sessions)
+    await daemon.on_head(chain.head)
+    for _ in range(10):
+        await daemon.on_head(chain.mine())
+
+    async with sessions() as session:
+        cursor = await session.get(EventSyncCursor, ChainType.BSC)
+    assert [number for number, _ in cursor.checkpoints] == [104, 105, 106, 107]
+
+    chain.reorg(10)
+    await daemon.on_head(chain.mine())
+
+    # Replayed from before the oldest checkpoint, then re-seeded the ring
+    assert await _cursor(sessions) == 108
+    assert min(start for _, start, _ in chain.log_requests[-10:]) == 104
+    async with sessions() as session:
+        cursor = await session.get(EventSyncCursor, ChainType.BSC)
+    assert cursor.checkpoints[-1][0] == 108
@@ -72,3 +72,22 @@ async def test_recalculate_tiers_new(db_session, buyer_user):
 def test_cleanup_expired_nonces():
     """Cleanup task should run without error (Redis handles TTL)."""
     cleanup_expired_nonces()
+
+
+async def test_celery_heartbeat_sets_expiring_key(monkeypatch):
+    import fakeredis
+    import fakeredis.aioredis
+
+    import app.workers.maintenance as maint
+    from app.services.health_service import CELERY_HEARTBEAT_KEY
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        maint.Redis, "from_url", lambda *a, **kw: fakeredis.aioredis.FakeRedis(server=server)
+    )
+
+    await maint._celery_heartbeat()
+
+    redis = fakeredis.aioredis.FakeRedis(server=server)
+    assert await redis.exists(CELERY_HEARTBEAT_KEY)
+    assert 0 < await redis.ttl(CELERY_HEARTBEAT_KEY) <= maint.settings.celery_heartbeat_interval_seconds * 3
@@ -0,0 +1,66 @@
+import asyncio
+import functools
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core import database
+from app.core.config import settings
+from app.workers import runtime
+
+
+@pytest.fixture
+def worker_runtime(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "database_url", f"sqlite+aiosqlite:///{tmp_path}/worker.db")
+    # aiosqlite defaults to NullPool, which rejects the worker pool sizing arguments
+    monkeypatch.setattr(
+        database,
+        "create_async_engine",
+        functools.partial(create_async_engine, poolclass=AsyncAdaptedQueuePool),
+    )
+    original_engine = database.engine
+    original_bind = database.async_session_factory.kw["bind"]
+    yield runtime
+    runtime.shutdown_process()
+    database.engine = original_engine
+    database.async_session_factory.configure(bind=original_bind)
+    asyncio.set_event_loop(None)
+
+
+async def _probe():
+    async with database.async_session_factory() as db:
+        await db.execute(text("SELECT 1"))
+        return asyncio.get_running_loop(), db.get_bind()
+
+
+def test_tasks_share_loop_and_engine(worker_runtime):
+    loop_a, bind_a = worker_runtime.run(_probe())
+    loop_b, bind_b = worker_runtime.run(_probe())
+
+    assert loop_a is loop_b
+    assert bind_a is bind_b
+    assert database.engine is worker_runtime._engine
+    assert str(database.engine.url).endswith("worker.db")
+
+
+def test_async_task_decorator(worker_runtime):
+    @runtime.async_task(name="tests.workers.add")
+    async def add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    assert add.name == "tests.workers.add"
+    assert add(2, 3) == 5
+    assert add.apply(args=(4, 5)).get() == 9
+    assert asyncio.iscoroutinefunction(add.coroutine)
+
+
+def test_shutdown_disposes_and_allows_reinit(worker_runtime):
+    worker_runtime.run(_probe())
+    worker_runtime.shutdown_process()
+    assert worker_runtime._loop is None
+
+    loop, _ = worker_runtime.run(_probe())
+    assert loop is worker_runtime._loop
@@ -121,3 +121,118 @@ async def test_no_timeout_for_recent_orders(db_session, sample_order):
 
     await db_session.refresh(sample_order)
     assert sample_order.status == OrderStatus.CREATED
+
+
+async def test_expired_order_releases_stock(db_session, buyer_user, sample_product):
+    """Expiring an unconfirmed order should return its reserved stock."""
+    sample_product.stock = 4
+    order = Order(
+        buyer_wallet=BUYER_WALLET,
+        seller_wallet=SELLER_WALLET,
+        product_id=sample_product.id,
+        chain=ChainType.BSC,
+        token=TokenType.USDT,
+        amount=Decimal("100"),
+        platform_fee=Decimal("2"),
+        status=OrderStatus.CREATED,
+        tx_hash_create=DEFAULT_TX_HASH,
+    )
+    db_session.add(order)
+    await db_session.flush()
+
+    from sqlalchemy import update
+
+    await db_session.execute(
+        update(Order)
+        .where(Order.id == order.id)
+        .values(created_at=datetime.now(UTC) - timedelta(hours=25))
+    )
+    await db_session.commit()
+
+    import app.workers.timeout_checker as tc
+
+    original_factory = tc.async_session_factory
+    test_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    tc.async_session_factory = test_factory
+
+    try:
+        await _check_timeouts()
+    finally:
+        tc.async_session_factory = original_factory
+
+    await db_session.refresh(sample_product)
+    assert sample_product.stock == 5
+
+
+async def test_batch_sizes_recorded(db_session, sample_order, monkeypatch):
+    """Each run records how many orders it expired and auto-released."""
+    import fakeredis
+    import fakeredis.aioredis
+
+    import app.workers.timeout_checker as tc
+    from app.core.metrics import WORKER_METRICS_PREFIX
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        tc.Redis, "from_url", lambda *a, **kw: fakeredis.aioredis.FakeRedis(server=server)
+    )
+    test_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(tc, "async_session_factory", test_factory)
+    await db_session.commit()
+
+    await _check_timeouts()
+
+    redis = fakeredis.aioredis.FakeRedis(server=server)
+    recorded = await redis.hgetall(f"{WORKER_METRICS_PREFIX}timeout_checker_batch_size")
+    assert recorded[b"expired:0"] == b"1"
+    assert recorded[b"auto_released:+Inf"] == b"1"
+
+
+async def test_expired_hot_order_releases_redis_stock(
+    db_session, buyer_user, sample_product, monkeypatch
+):
+    """A hot product's counter gets the expired unit back once the checker commits."""
+    import fakeredis
+    import fakeredis.aioredis
+    from sqlalchemy import update
+
+    import app.workers.timeout_checker as tc
+    from app.core.config import settings
+    from app.services.stock_service import STOCK_KEY_PREFIX
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        tc.Redis, "from_url", lambda *a, **kw: fakeredis.aioredis.FakeRedis(server=server)
+    )
+    monkeypatch.setattr(settings, "hot_product_ids", [str(sample_product.id)])
+    test_factory = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(tc, "async_session_factory", test_factory)
+
+    order = Order(
+        buyer_wallet=BUYER_WALLET,
+        seller_wallet=SELLER_WALLET,
+        product_id=sample_product.id,
+        chain=ChainType.BSC,
+        token=TokenType.USDT,
+        amount=Decimal("100"),
+        platform_fee=Decimal("2"),
+        status=OrderStatus.CREATED,
+        tx_hash_create=DEFAULT_TX_HASH,
+    )
+    db_session.add(order)
+    await db_session.flush()
+    await db_session.execute(
+        update(Order)
+        .where(Order.id == order.id)
+        .values(created_at=datetime.now(UTC) - timedelta(hours=25))
+    )
+    await db_session.commit()
+    redis = fakeredis.aioredis.FakeRedis(server=server)
+    key = f"{STOCK_KEY_PREFIX}{sample_product.id}"
+    await redis.set(key, 3)
+
+    await _check_timeouts()
+
+    assert int(await redis.get(key)) == 4
+    await db_session.refresh(sample_product)
+    assert sample_product.stock == 10
@@ -151,9 +151,24 @@ CREATE TABLE event_sync_cursor (
     chain chain_type NOT NULL,
     contract VARCHAR(42) NOT NULL,
     last_block BIGINT NOT NULL DEFAULT 0,
+    checkpoints JSONB NOT NULL DEFAULT '[]',  -- recent [block_number, block_hash] pairs for reorg detection
     updated_at TIMESTAMPTZ DEFAULT NOW(),
     PRIMARY KEY (chain, contract)
 );
 
+-- Chain Events (append-only journal of escrow logs; replays insert with ON CONFLICT DO NOTHING)
+CREATE TABLE chain_events (
+    chain chain_type NOT NULL,
+    tx_hash VARCHAR(66) NOT NULL,
+    log_index INTEGER NOT NULL,
+    block_number BIGINT NOT NULL,
+    block_hash VARCHAR(66) NOT NULL,
+    event VARCHAR(32) NOT NULL,
+    args JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (chain, tx_hash, log_index)
+);
+CREATE INDEX ix_chain_events_chain_block ON chain_events(chain, block_number, log_index);
+
 -- Seed event sync cursor for BSC (placeholder contract address)
 INSERT INTO event_sync_cursor (chain, contract, last_block) VALUES ('BSC', '0x0000000000000000000000000000000000000000', 0);